@@ -36,17 +36,13 @@ async def register_user(
         full_name=user_data.full_name
     )
     
-    # Serialize datetime for MongoDB
     user_dict = user.model_dump()
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
     await db.users.insert_one(user_dict)
     
     # Create user profile
     from models.user_models import UserProfile
     profile = UserProfile(user_id=user.id)
     profile_dict = profile.model_dump()
-    profile_dict['created_at'] = profile_dict['created_at'].isoformat()
-    profile_dict['updated_at'] = profile_dict['updated_at'].isoformat()
     await db.user_profiles.insert_one(profile_dict)
     
     # Generate token
@@ -99,7 +95,7 @@ async def login_user(
     # Update last login
     await db.users.update_one(
         {"email": credentials.email},
-        {"$set": {"last_login": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"last_login": datetime.now(timezone.utc)}}
     )
     
     # Generate token
@@ -232,7 +228,7 @@ async def request_password_reset(
     await db.password_reset_tokens.insert_one({
         "user_id": user["id"],
         "token": reset_token,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": datetime.now(timezone.utc),
         "used": False
     })
     
@@ -11,6 +11,7 @@ import logging
 import json
 import os
 from pydantic import BaseModel
+from core.database import MONGO_CODEC_OPTIONS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -117,7 +118,7 @@ class AuditLogger:
     async def db(self):
         """Lazy initialization of database connection"""
         if self._client is None:
-            self._client = AsyncIOMotorClient(self.mongo_url)
+            self._client = AsyncIOMotorClient(self.mongo_url, **MONGO_CODEC_OPTIONS)
             self._db = self._client[self.db_name]
         return self._db
     
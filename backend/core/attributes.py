@@ -0,0 +1,76 @@
+"""
+Destination search attributes
+Normalized amenity tags and accommodation tiers, derived from the resort data and stored for indexed filtering
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Stored (multikey indexed) fields
+AMENITY_TAGS_FIELD = "amenity_tags"
+ACCOMMODATION_TIER_FIELD = "accommodation_tier"
+
+# Resort amenity fields: boolean flags and counts (tagged when true / non-zero)
+AMENITY_FLAGS = ["spa", "gym", "kids_club", "conference_facilities", "beach_access"]
+AMENITY_COUNTS = ["restaurants", "pools"]
+
+# Accommodation tiers, best first
+ACCOMMODATION_TIERS = ["Luxury", "Mid-range", "Budget"]
+
+# Words in the amenity tags, highlights or course types that place a destination in a tier
+# ("luxury_spa", "Luxury resorts", "Luxury Links"; "Excellent value"); anything else is mid-range
+LUXURY_WORDS = {"luxury", "premium", "exclusive"}
+BUDGET_WORDS = {"value", "budget", "affordable"}
+
+# Fields the derived attributes depend on
+SOURCE_FIELDS = ["amenities", "highlights", "courses.course_type"]
+
+def amenity_tag(name: str) -> str:
+    """Normalize an amenity name to a tag ("Beach access" -> "beach_access")"""
+    return re.sub(r"[^a-z0-9]+", "_", name.strip().lower()).strip("_")
+
+def amenity_tags(amenities: Optional[Dict[str, Any]]) -> List[str]:
+    """Sorted, de-duplicated tags for a ResortAmenities document"""
+    if not isinstance(amenities, dict):
+        return []
+    tags = {flag for flag in AMENITY_FLAGS if amenities.get(flag) is True}
+    tags.update(count for count in AMENITY_COUNTS if (amenities.get(count) or 0) > 0)
+    tags.update(amenity_tag(extra) for extra in amenities.get("additional") or [] if isinstance(extra, str))
+    tags.discard("")
+    return sorted(tags)
+
+def accommodation_tier_name(value: Optional[str]) -> Optional[str]:
+    """Canonical tier for user input ("luxury", "mid range" -> "Mid-range"), None if unknown"""
+    if not value:
+        return None
+    key = amenity_tag(value)
+    for tier in ACCOMMODATION_TIERS:
+        if amenity_tag(tier) == key:
+            return tier
+    return None
+
+def derive_accommodation_tier(tags: Iterable[str]) -> str:
+    """Tier from normalized tags describing the destination (luxury wins over value)"""
+    words = {word for tag in tags for word in tag.split("_")}
+    if words & LUXURY_WORDS:
+        return "Luxury"
+    if words & BUDGET_WORDS:
+        return "Budget"
+    return "Mid-range"
+
+def search_attributes(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """The derived fields of a destination document (needs SOURCE_FIELDS)"""
+    tags = amenity_tags(doc.get("amenities"))
+    descriptors = tags + [amenity_tag(highlight) for highlight in doc.get("highlights") or [] if isinstance(highlight, str)]
+    descriptors += [
+        amenity_tag(course.get("course_type") or "")
+        for course in doc.get("courses") or [] if isinstance(course, dict)
+    ]
+    return {
+        AMENITY_TAGS_FIELD: tags,
+        ACCOMMODATION_TIER_FIELD: derive_accommodation_tier(descriptors),
+    }
+
+def with_search_attributes(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Add amenity_tags and accommodation_tier to a full destination document"""
+    doc.update(search_attributes(doc))
+    return doc
@@ -0,0 +1,237 @@
+"""
+In-process catalog cache
+Read-through cache for public catalog reads, invalidated by per-collection version counters
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Sequence, Tuple
+import logging
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CatalogCache:
+    """
+    Versioned read-through cache for catalog collections
+
+    Every cached entry is stamped with the version of its collection at load time.
+    Writers call bump() after changing a collection, which makes all entries for
+    that collection stale without having to know which keys they were stored under.
+    The TTL is a safety net for writes made by other worker processes.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.cache.cache_ttl,
+        enabled: bool = settings.cache.enable_caching,
+        max_entries: int = 1000
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._versions: Dict[str, int] = {}
+        self._entries: Dict[Tuple[str, Hashable], Tuple[int, float, Any]] = {}
+        # In-flight loads, shared by concurrent misses for the same key
+        self._loads: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, collection: str) -> int:
+        """Get the current content version of a collection"""
+        return self._versions.get(collection, 0)
+
+    def versions(self, *collections: str) -> Tuple[int, ...]:
+        """Get the combined content version of several collections"""
+        return tuple(self.version(collection) for collection in collections)
+
+    def bump(self, collection: str) -> int:
+        """Invalidate all cached entries for a collection"""
+        new_version = self.version(collection) + 1
+        self._versions[collection] = new_version
+
+        # Drop stale entries eagerly so memory does not grow with every write
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if key[0] != collection
+        }
+
+        logger.info(f"Catalog version bumped: {collection} -> {new_version}")
+        return new_version
+
+    def get(self, collection: str, key: Hashable) -> Optional[Any]:
+        """Get a cached value if it is still current"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get((collection, key))
+        if entry is None:
+            return None
+
+        version, stored_at, value = entry
+        if version != self.version(collection) or time.monotonic() - stored_at > self.ttl_seconds:
+            self._entries.pop((collection, key), None)
+            return None
+
+        return value
+
+    def set(self, collection: str, key: Hashable, value: Any, version: Optional[int] = None):
+        """Store a value under the given (or current) collection version"""
+        if not self.enabled:
+            return
+
+        if version is None:
+            version = self.version(collection)
+
+        # A write raced with the load - don't cache data from the old version
+        if version != self.version(collection):
+            return
+
+        # Keys include client-supplied cursors, so bound the size (oldest entries go first)
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+        self._entries[(collection, key)] = (version, time.monotonic(), value)
+
+    async def get_or_load(
+        self,
+        collection: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value or load, cache and return it
+
+        Concurrent misses for the same key share one load (and its result or
+        error). None results are not cached.
+        """
+        value = self.get(collection, key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        cache_key = (collection, key)
+        load = self._loads.get(cache_key)
+        if load is None:
+            self.misses += 1
+            load = asyncio.ensure_future(self._load(collection, key, loader))
+            self._loads[cache_key] = load
+            load.add_done_callback(lambda _: self._loads.pop(cache_key, None))
+        else:
+            self.hits += 1
+
+        # Shielded so a cancelled caller doesn't cancel the load the others wait on
+        return await asyncio.shield(load)
+
+    async def _load(self, collection: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        version = self.version(collection)
+        value = await loader()
+        if value is not None:
+            self.set(collection, key, value, version)
+        return value
+
+    def clear(self):
+        """Drop every cached entry"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "versions": dict(self._versions)
+        }
+
+# Global catalog cache instance
+catalog_cache = CatalogCache()
+
+class VersionedLRUCache:
+    """
+    Size-bounded LRU cache with a TTL, tied to catalog collection versions
+
+    For derived results (e.g. search pages) that depend on several collections.
+    Any bump of those collections empties the cache; entries also expire after
+    ttl_seconds and the least recently used entry goes first when full.
+    """
+
+    def __init__(
+        self,
+        collections: Sequence[str],
+        max_entries: int = 500,
+        ttl_seconds: int = 300,
+        enabled: bool = settings.cache.enable_caching
+    ):
+        self.collections = tuple(collections)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._version: Tuple[int, ...] = catalog_cache.versions(*self.collections)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def current_version(self) -> Tuple[int, ...]:
+        """Combined content version of the collections this cache depends on"""
+        return catalog_cache.versions(*self.collections)
+
+    def _check_version(self):
+        version = self.current_version()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value (and mark it recently used), counting hits and misses"""
+        if not self.enabled:
+            return None
+
+        self._check_version()
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Optional[Tuple[int, ...]] = None):
+        """Store a value, evicting the least recently used entries when full"""
+        if not self.enabled:
+            return
+
+        self._check_version()
+        # A write raced with the load - don't cache data from the old version
+        if version is not None and version != self._version:
+            return
+
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop one cached entry"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every cached entry"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,98 @@
+"""
+Catalog state shared across workers
+Content validators derived from stored state, synced in the background so writes from other workers and scripts are seen
+"""
+import asyncio
+import time
+import uuid
+from typing import Dict, Optional
+import logging
+from core.cache import CatalogCache, catalog_cache
+from core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Collections served with conditional GETs and cached by catalog_cache
+CATALOG_COLLECTIONS = ["destinations", "articles", "hero_carousel", "testimonials", "partners"]
+
+# How stale a worker's view of the stored state may get (it syncs at most this often, when asked for validators)
+SYNC_INTERVAL_SECONDS = 5
+
+# Validators of collections written in this process since the last sync are process-local
+_EPOCH = uuid.uuid4().hex
+
+class CatalogState:
+    """
+    Stored state of the catalog collections, as content validators
+
+    A collection's state is its write counter in catalog_versions (bumped for
+    writes made through the API), its document count and its latest
+    updated_at (set by the API and the maintenance scripts alike), so every
+    worker derives the same validator for the same content. A worker that
+    sees the state change bumps its catalog_cache version, which drops the
+    cached entries loaded before the write.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache):
+        self.cache = cache
+        self._stored: Dict[str, str] = {}
+        # catalog_cache version each stored state was read at
+        self._synced_versions: Dict[str, int] = {}
+        self._last_sync = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def validator(self, collection: str) -> str:
+        """Validator of a collection's content (process-local until the next sync after a local write)"""
+        self._schedule_sync()
+        stored = self._stored.get(collection)
+        version = self.cache.version(collection)
+        if stored is None or version != self._synced_versions.get(collection, 0):
+            return f"local:{_EPOCH}:{version}"
+        return stored
+
+    async def sync(self, db):
+        """Publish local writes and adopt writes made elsewhere"""
+        for collection in CATALOG_COLLECTIONS:
+            version = self.cache.version(collection)
+            if version != self._synced_versions.get(collection, 0):
+                await db.catalog_versions.update_one({"_id": collection}, {"$inc": {"version": 1}}, upsert=True)
+
+            state = await self._read_state(db, collection)
+            previous = self._stored.get(collection)
+            if previous is not None and state != previous and version == self.cache.version(collection):
+                # Written by another worker or a script
+                version = self.cache.bump(collection)
+
+            self._stored[collection] = state
+            # A local write during the read stays unsynced until the next round
+            self._synced_versions[collection] = version
+        self._last_sync = time.monotonic()
+
+    async def _read_state(self, db, collection: str) -> str:
+        counter = await db.catalog_versions.find_one({"_id": collection})
+        count = await db[collection].estimated_document_count()
+        latest = await db[collection].find_one({}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)])
+        updated_at = (latest or {}).get("updated_at")
+        return f"{(counter or {}).get('version', 0)}:{count}:{updated_at or ''}"
+
+    def _schedule_sync(self):
+        if time.monotonic() - self._last_sync < SYNC_INTERVAL_SECONDS:
+            return
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_sync = time.monotonic()
+        self._sync_task = loop.create_task(self._sync_in_background())
+
+    async def _sync_in_background(self):
+        try:
+            db = await get_database()
+            await self.sync(db)
+        except Exception as e:
+            logger.error(f"Error syncing catalog state: {str(e)}")
+
+# Global catalog state
+catalog_state = CatalogState()
@@ -6,11 +6,35 @@ import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from typing import Optional, Dict, Any
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timezone, date, time
+from bson.codec_options import TypeEncoder, TypeRegistry
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+class DateEncoder(TypeEncoder):
+    """Store calendar dates (e.g. booking item dates) as YYYY-MM-DD strings"""
+    python_type = date
+    
+    def transform_python(self, value: date) -> str:
+        return value.isoformat()
+
+class TimeEncoder(TypeEncoder):
+    """Store times of day (e.g. tee times) as HH:MM:SS strings"""
+    python_type = time
+    
+    def transform_python(self, value: time) -> str:
+        return value.strftime('%H:%M:%S')
+
+# Codec settings shared by every Mongo client: datetimes are stored as native BSON
+# dates and decoded as timezone-aware UTC, so handlers don't convert them by hand.
+# datetime is a date subclass but is encoded natively before the registry is consulted.
+MONGO_CODEC_OPTIONS = {
+    "tz_aware": True,
+    "tzinfo": timezone.utc,
+    "type_registry": TypeRegistry([DateEncoder(), TimeEncoder()])
+}
+
 class DatabaseManager:
     """
     Centralized database management with connection pooling and health monitoring
@@ -37,7 +61,8 @@ class DatabaseManager:
                     connectTimeoutMS=self._connection_timeout,
                     socketTimeoutMS=self._connection_timeout,
                     retryWrites=True,
-                    w='majority'  # Write concern for data durability
+                    w='majority',  # Write concern for data durability
+                    **MONGO_CODEC_OPTIONS
                 )
                 
                 # Test the connection
@@ -78,23 +103,45 @@ class DatabaseManager:
             
             # Destinations indexes
             await db.destinations.create_index("slug", unique=True)
+            await db.destinations.create_index("id")
             await db.destinations.create_index("country")
             await db.destinations.create_index("featured")
             await db.destinations.create_index("published")
             await db.destinations.create_index([("name", "text"), ("short_desc", "text"), ("long_desc", "text")])
+            await db.destinations.create_index([("published", 1), ("created_at", 1), ("id", 1)])
+            await db.destinations.create_index([("location", "2dsphere")])
+            await db.destinations.create_index("amenity_tags")  # Multikey
+            await db.destinations.create_index("accommodation_tier")
+            await db.destinations.create_index("updated_at")  # Catalog state (latest write)
             
             # Articles indexes
             await db.articles.create_index("slug", unique=True)
+            await db.articles.create_index("id")
             await db.articles.create_index("category")
             await db.articles.create_index("published")
             await db.articles.create_index("publish_date")
             await db.articles.create_index([("title", "text"), ("content", "text")])
+            await db.articles.create_index([("published", 1), ("publish_date", -1), ("id", -1)])
+            await db.articles.create_index("updated_at")  # Catalog state (latest write)
+            await db.articles.create_index("featured_until")
             
             # Inquiries indexes
             await db.inquiries.create_index("email")
             await db.inquiries.create_index("status")
             await db.inquiries.create_index("created_at")
             await db.inquiries.create_index("destination_id")
+            await db.inquiries.create_index([("created_at", -1), ("id", -1)])
+            await db.inquiries.create_index([("email", 1), ("created_at", -1), ("id", -1)])
+            
+            # Bookings and payment transactions indexes (keyset pagination per user)
+            await db.bookings.create_index([("user_id", 1), ("created_at", -1), ("id", -1)])
+            await db.payment_transactions.create_index([("user_id", 1), ("created_at", -1), ("id", -1)])
+            
+            # Tee-time inventory (documents are read by _id; per-destination date ranges for calendars)
+            await db.tee_time_inventory.create_index([("destination_id", 1), ("course_name", 1), ("date", 1)])
+            
+            # Idempotency keys (read by _id, expire with TTL)
+            await db.idempotency_keys.create_index("expires_at", expireAfterSeconds=0)  # TTL index
             
             # Audit logs indexes with TTL
             await db.audit_logs.create_index("user_id")
@@ -111,11 +158,13 @@ class DatabaseManager:
             await db.testimonials.create_index("destination_id")
             await db.testimonials.create_index("published")
             await db.testimonials.create_index("rating")
+            await db.testimonials.create_index([("published", 1), ("created_at", -1), ("id", -1)])
             
             # Partners indexes
             await db.partners.create_index("type")
             await db.partners.create_index("active")
             await db.partners.create_index("order")
+            await db.partners.create_index([("active", 1), ("order", 1), ("id", 1)])
             
             # GDPR-related indexes
             await db.consent_records.create_index("user_id")
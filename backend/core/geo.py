@@ -0,0 +1,28 @@
+"""
+Geospatial helpers
+GeoJSON points for destination coordinates, stored next to the API's {lat, lng} field for 2dsphere queries
+"""
+from typing import Any, Dict, Optional
+
+# Stored GeoJSON field (2dsphere indexed); location_coordinates stays the API-facing field
+GEO_FIELD = "location"
+
+def geo_point(coordinates: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert {lat, lng} to a GeoJSON Point ([lng, lat] order), or None if missing/invalid"""
+    if not isinstance(coordinates, dict):
+        return None
+    try:
+        lat = float(coordinates["lat"])
+        lng = float(coordinates["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+def with_geo_point(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the GeoJSON field to a destination document (or $set payload) carrying location_coordinates"""
+    point = geo_point(doc.get("location_coordinates"))
+    if point:
+        doc[GEO_FIELD] = point
+    return doc
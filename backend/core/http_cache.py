@@ -0,0 +1,165 @@
+"""
+HTTP caching for public catalog endpoints
+Strong ETags from per-collection content versions, 304 handling, Cache-Control policies
+and pre-encoded (optionally compressed) response bodies
+"""
+import gzip
+import hashlib
+import orjson
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from core.catalog_state import catalog_state
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional - gzip is always available
+    brotli = None
+
+# Cache-Control policy per public route
+CACHE_POLICIES: Dict[str, str] = {
+    "home": "public, max-age=60, stale-while-revalidate=600",
+    "destinations": "public, max-age=60, stale-while-revalidate=600",
+    "articles": "public, max-age=300, stale-while-revalidate=3600",
+    "hero": "public, max-age=300, stale-while-revalidate=3600",
+    "testimonials": "public, max-age=600, stale-while-revalidate=3600",
+    "partners": "public, max-age=3600, stale-while-revalidate=86400",
+    "translations": "public, max-age=3600, stale-while-revalidate=86400",
+    "sitemap": "public, max-age=3600, stale-while-revalidate=86400",
+}
+
+def compute_etag(route: str, collections: List[str], variant: str = "") -> str:
+    """Build a strong ETag from the stored state of the collections the response depends on"""
+    states = ",".join(f"{name}:{catalog_state.validator(name)}" for name in collections)
+    digest = hashlib.sha1(f"{route}|{states}|{variant}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = [strip_encoding_suffix(tag.strip().removeprefix("W/")) for tag in if_none_match.split(",")]
+    return any(tag == etag for tag in candidates)
+
+class ConditionalGet:
+    """Validator for one conditional GET request"""
+
+    def __init__(self, request: Request, policy: str, collections: List[str], variant: str = ""):
+        # Responses vary by query string (filters, pages, fieldsets) and any route-specific variant
+        query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+        self.etag = compute_etag(request.url.path, collections, f"{query}|{variant}")
+        self.cache_control = CACHE_POLICIES[policy]
+        self.not_modified = etag_matches(request.headers.get("if-none-match"), self.etag)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Caching headers to attach to the response"""
+        return {"ETag": self.etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+    def not_modified_response(self) -> Response:
+        """Empty 304 response carrying the validators"""
+        return Response(status_code=304, headers=self.headers)
+
+def conditional_get(policy: str, *collections: str, variant: Optional[Callable[[], Awaitable[str]]] = None):
+    """
+    FastAPI dependency factory for conditional GETs
+
+    Sets ETag and Cache-Control on the route's response. Routes return
+    validator.not_modified_response() when validator.not_modified is set, and
+    merge validator.headers into any Response object they build themselves.
+    variant() adds state the response depends on besides the collections
+    (e.g. the clock).
+    """
+    async def dependency(request: Request, response: Response) -> ConditionalGet:
+        validator = ConditionalGet(request, policy, list(collections), await variant() if variant else "")
+        response.headers.update(validator.headers)
+        return validator
+
+    return dependency
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# Preferred order when the client accepts several encodings
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+def strip_encoding_suffix(etag: str) -> str:
+    """Map an encoding-specific ETag ("abc-gzip") back to the base ETag ("abc")"""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported Content-Encoding for an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+class EncodedPayload:
+    """
+    A response body (normally JSON) encoded once, with its compressed variants
+
+    Cached in place of the Python payload so hits skip model validation, JSON
+    encoding and compression entirely.
+    """
+    __slots__ = ("identity", "encoded")
+
+    def __init__(self, body: bytes):
+        self.identity = body
+        self.encoded: Dict[str, bytes] = {}
+
+        if len(self.identity) >= MIN_COMPRESS_SIZE:
+            self.encoded["gzip"] = gzip.compress(self.identity, compresslevel=6)
+            if brotli:
+                self.encoded["br"] = brotli.compress(self.identity, quality=5)
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedPayload":
+        """Encode JSON-compatible content"""
+        return cls(orjson.dumps(content))
+
+    def body_for(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Get the body and Content-Encoding to send for an Accept-Encoding header"""
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding in self.encoded:
+            return self.encoded[encoding], encoding
+        return self.identity, None
+
+def payload_response(
+    request: Request,
+    payload: EncodedPayload,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = "application/json"
+) -> Response:
+    """Serve a pre-encoded payload in the best encoding the client accepts"""
+    body, encoding = payload.body_for(request.headers.get("accept-encoding"))
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept-Encoding"
+
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+        # Each encoding is a different representation, so give it its own strong validator
+        if "ETag" in response_headers:
+            response_headers["ETag"] = response_headers["ETag"][:-1] + f'-{encoding}"'
+
+    return Response(content=body, media_type=media_type, headers=response_headers)
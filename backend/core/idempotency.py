@@ -0,0 +1,155 @@
+"""
+Idempotent POST requests
+Idempotency-Key handling: the first request with a key runs, retries replay its stored response
+"""
+import asyncio
+import hashlib
+import orjson
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Stored responses expire (TTL index on expires_at) after a day
+KEY_TTL_SECONDS = 24 * 60 * 60
+
+# A claim older than this belongs to a request that died; a retry may take it over
+PROCESSING_TIMEOUT_SECONDS = 60
+
+# How often a duplicate waiting on another worker checks for the stored response
+POLL_INTERVAL_SECONDS = 0.1
+
+def request_fingerprint(payload: Any) -> str:
+    """
+    Hash of a request payload, to reject a key reused for a different request
+
+    Models are hashed as sent (exclude_unset): generated defaults such as
+    uuid4 ids differ on every parse and would make retries look different.
+    """
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json", exclude_unset=True)
+    return hashlib.sha256(orjson.dumps(jsonable_encoder(payload), option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class IdempotencyStore:
+    """
+    Responses of keyed POST requests in idempotency_keys
+
+    The first request with a key inserts a "processing" claim (the unique _id
+    decides the winner across workers), runs, and stores its response.
+    Duplicates in the same worker queue on a lock; duplicates elsewhere poll
+    the claim until the response is stored, then replay it. A failed request
+    drops its claim so the client can retry it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiters: Dict[str, int] = {}
+
+    async def run(
+        self,
+        db,
+        scope: str,
+        key: Optional[str],
+        owner: Optional[str],
+        payload: Any,
+        operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run operation() once per (scope, owner, key); without a key it just runs"""
+        if key is None:
+            return await operation()
+
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+
+        record_id = f"{scope}|{owner or ''}|{key}"
+        fingerprint = request_fingerprint(payload)
+
+        lock = self._locks.setdefault(record_id, asyncio.Lock())
+        self._waiters[record_id] = self._waiters.get(record_id, 0) + 1
+        try:
+            async with lock:
+                return await self._run_once(db, record_id, fingerprint, operation)
+        finally:
+            self._waiters[record_id] -= 1
+            if not self._waiters[record_id]:
+                del self._waiters[record_id]
+                del self._locks[record_id]
+
+    async def _run_once(
+        self,
+        db,
+        record_id: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        claimed_at = await self._claim(db, record_id, fingerprint)
+        if isinstance(claimed_at, Response):
+            return claimed_at
+
+        try:
+            result = await operation()
+        except Exception:
+            await db.idempotency_keys.delete_one({"_id": record_id, "locked_at": claimed_at})
+            raise
+
+        await db.idempotency_keys.update_one(
+            {"_id": record_id, "locked_at": claimed_at},
+            {"$set": {
+                "status": "completed",
+                "response": orjson.dumps(jsonable_encoder(result)),
+                "completed_at": datetime.now(timezone.utc)
+            }}
+        )
+        return result
+
+    async def _claim(self, db, record_id: str, fingerprint: str):
+        """Claim a key (returns the claim time), or the stored response once another request completes it"""
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await db.idempotency_keys.insert_one({
+                    "_id": record_id,
+                    "fingerprint": fingerprint,
+                    "status": "processing",
+                    "locked_at": now,
+                    "expires_at": now + timedelta(seconds=KEY_TTL_SECONDS)
+                })
+                return now
+            except DuplicateKeyError:
+                record = await db.idempotency_keys.find_one({"_id": record_id})
+
+            if record is None:
+                continue  # Dropped or expired in between
+
+            if record["fingerprint"] != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+                )
+
+            if record["status"] == "completed":
+                return Response(
+                    content=record["response"],
+                    media_type="application/json",
+                    headers={REPLAYED_HEADER: "true"}
+                )
+
+            if record["locked_at"] < now - timedelta(seconds=PROCESSING_TIMEOUT_SECONDS):
+                taken = await db.idempotency_keys.find_one_and_update(
+                    {"_id": record_id, "status": "processing", "locked_at": record["locked_at"]},
+                    {"$set": {"locked_at": now}}
+                )
+                if taken:
+                    return now
+
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+# Global idempotency store
+idempotency_store = IdempotencyStore()
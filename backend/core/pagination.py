@@ -0,0 +1,105 @@
+"""
+Keyset (cursor) pagination helpers
+Pages through collections on stable sort keys instead of loading whole result sets
+"""
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from bson import json_util
+from fastapi import HTTPException
+
+# Page size limits shared by all list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Response header carrying the cursor for list-shaped endpoints
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortSpec = Sequence[Tuple[str, int]]
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    """Encode the sort key values of the last document in a page as an opaque cursor"""
+    values = [doc.get(field) for field, _ in sort]
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """Decode an opaque cursor back into sort key values"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+def past_value(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """
+    Condition for a sort key strictly past a value, None if nothing can be
+
+    Missing and null keys sort before every value, and range operators never
+    match them, so they are handled explicitly: ascending they come before any
+    value, descending after it.
+    """
+    if direction == 1:
+        return {field: {"$ne": None}} if value is None else {field: {"$gt": value}}
+    if value is None:
+        return None
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+def keyset_filter(sort: SortSpec, values: List[Any]) -> Dict[str, Any]:
+    """
+    Build the filter selecting documents strictly after the cursor position
+
+    For sort keys (k1, k2) this is: k1 past v1 OR (k1 == v1 AND k2 past v2).
+    Equality on a null value also matches a missing key, like the sort does.
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        past = past_value(field, direction, values[i])
+        if past is None:
+            continue
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause.update(past)
+        clauses.append(clause)
+
+    if not clauses:
+        return {"_id": {"$in": []}}
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+async def paginate(
+    collection,
+    query: Dict[str, Any],
+    sort: SortSpec,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch one page of documents and the cursor for the next page
+
+    The last sort key must be unique (normally "id") so pages never overlap.
+    Projections must include every sort key. Returns (documents, next_cursor),
+    where next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    page_query = query
+    if cursor:
+        after_cursor = keyset_filter(sort, decode_cursor(cursor, sort))
+        page_query = {"$and": [query, after_cursor]} if query else after_cursor
+
+    if projection is None:
+        projection = {"_id": 0}
+
+    # Fetch one extra document to learn whether another page exists
+    docs = await collection.find(page_query, projection).sort(list(sort)).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort)
+
+    return docs, next_cursor
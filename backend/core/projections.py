@@ -0,0 +1,83 @@
+"""
+Sparse fieldsets for list and detail views
+Resolves the `fields` query parameter into a Mongo projection and a matching partial response model
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Named projection -> field list; None means every field of the model
+ProjectionTable = Dict[str, Optional[List[str]]]
+
+def resolve_fields(
+    fields: Optional[str],
+    model: Type[BaseModel],
+    named_projections: ProjectionTable
+) -> Optional[List[str]]:
+    """
+    Resolve a `fields` parameter into a list of model fields
+
+    Accepts a named projection ("card", "detail") or a comma-separated list of
+    field names. Returns None when every field is wanted.
+    """
+    if not fields:
+        return None
+
+    if fields in named_projections:
+        return named_projections[fields]
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Use a field list or one of: {', '.join(named_projections)}"
+        )
+
+    # Always return the id so clients can key and link rows
+    if "id" in model.model_fields and "id" not in requested:
+        requested.insert(0, "id")
+
+    return requested
+
+def build_projection(
+    field_list: Optional[List[str]],
+    extra_fields: Iterable[str] = (),
+    slices: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    Build a Mongo projection for the given fields
+
+    extra_fields are fetched but not returned (e.g. pagination sort keys);
+    slices limits array fields to their first N elements.
+    """
+    projection: Dict[str, Any] = {"_id": 0}
+    if field_list is None:
+        return projection
+
+    for field in list(field_list) + list(extra_fields):
+        projection[field] = 1
+
+    for field, count in (slices or {}).items():
+        if field in field_list:
+            projection[field] = {"$slice": count}
+
+    return projection
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Build (once) a variant of the model where every field is optional"""
+    field_definitions = {
+        name: (Optional[field.annotation], None)
+        for name, field in model.model_fields.items()
+    }
+    return create_model(
+        f"Partial{model.__name__}",
+        __config__=ConfigDict(extra="ignore"),
+        **field_definitions
+    )
+
+def dump_fields(doc: Dict[str, Any], model: Type[BaseModel], field_list: List[str]) -> Dict[str, Any]:
+    """Validate a projected document and dump only the requested fields"""
+    return partial_model(model)(**doc).model_dump(mode="json", include=set(field_list))
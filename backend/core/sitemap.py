@@ -0,0 +1,106 @@
+"""
+XML sitemap building
+Splits URL entries into protocol-sized child sitemaps and renders them (and their index) as bytes
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# sitemaps.org protocol limits per file
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = b'</urlset>'
+INDEX_OPEN = b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = b'</sitemapindex>'
+
+# Bytes every urlset spends on its wrapper
+URLSET_OVERHEAD = len(XML_HEADER) + len(URLSET_OPEN) + len(URLSET_CLOSE)
+
+def format_lastmod(value: Any) -> Optional[str]:
+    """Format a timestamp as a W3C datetime for <lastmod>"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+def url_entry(loc: str, priority: Optional[str] = None, lastmod: Optional[str] = None) -> bytes:
+    """Render one <url> element"""
+    parts = [f"<url><loc>{escape(loc)}</loc>"]
+    if lastmod:
+        parts.append(f"<lastmod>{lastmod}</lastmod>")
+    if priority:
+        parts.append(f"<priority>{priority}</priority>")
+    parts.append("</url>\n")
+    return "".join(parts).encode("utf-8")
+
+class SitemapChunk:
+    """Rendered entries of one child sitemap and the newest lastmod among them"""
+    __slots__ = ("entries", "size", "lastmod")
+
+    def __init__(self):
+        self.entries: List[bytes] = []
+        self.size = URLSET_OVERHEAD
+        self.lastmod: Optional[str] = None
+
+    def fits(self, entry: bytes) -> bool:
+        return len(self.entries) < SITEMAP_MAX_URLS and self.size + len(entry) <= SITEMAP_MAX_BYTES
+
+    def add(self, entry: bytes, lastmod: Optional[str] = None):
+        self.entries.append(entry)
+        self.size += len(entry)
+        # W3C datetimes in the same zone sort lexically
+        if lastmod and (self.lastmod is None or lastmod > self.lastmod):
+            self.lastmod = lastmod
+
+    def render(self) -> bytes:
+        return XML_HEADER + URLSET_OPEN + b"".join(self.entries) + URLSET_CLOSE
+
+class SitemapBuilder:
+    """Accumulates URL entries into as many protocol-sized chunks as needed"""
+
+    def __init__(self):
+        self.chunks: List[SitemapChunk] = [SitemapChunk()]
+
+    def add(self, loc: str, priority: Optional[str] = None, lastmod: Optional[str] = None):
+        entry = url_entry(loc, priority, lastmod)
+        if not self.chunks[-1].fits(entry):
+            self.chunks.append(SitemapChunk())
+        self.chunks[-1].add(entry, lastmod)
+
+    @property
+    def url_count(self) -> int:
+        return sum(len(chunk.entries) for chunk in self.chunks)
+
+def render_sitemap_index(children: List[Tuple[str, Optional[str]]]) -> bytes:
+    """Render a <sitemapindex> for (loc, lastmod) child sitemaps"""
+    parts = [XML_HEADER, INDEX_OPEN]
+    for loc, lastmod in children:
+        entry = f"<sitemap><loc>{escape(loc)}</loc>"
+        if lastmod:
+            entry += f"<lastmod>{lastmod}</lastmod>"
+        parts.append(f"{entry}</sitemap>\n".encode("utf-8"))
+    parts.append(INDEX_CLOSE)
+    return b"".join(parts)
+
+def merge_chunks(sections: Dict[str, List[SitemapChunk]]) -> Optional[SitemapChunk]:
+    """Combine every section into one urlset if the result stays within the protocol limits"""
+    merged = SitemapChunk()
+    for chunks in sections.values():
+        for chunk in chunks:
+            for entry in chunk.entries:
+                if not merged.fits(entry):
+                    return None
+                merged.entries.append(entry)
+                merged.size += len(entry)
+            if chunk.lastmod and (merged.lastmod is None or chunk.lastmod > merged.lastmod):
+                merged.lastmod = chunk.lastmod
+    return merged
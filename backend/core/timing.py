@@ -0,0 +1,107 @@
+"""
+Request timing
+Per-stage timers for one request and latency histograms aggregated across requests
+"""
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Histogram bucket upper bounds in milliseconds (roughly 1-2.5-5 steps; the last bucket is open-ended)
+LATENCY_BUCKETS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+class StageTimer:
+    """
+    Wall-clock durations of the named stages of one request
+
+    A stage entered several times accumulates. Stages run concurrently would
+    each report their own duration, so they can add up to more than the total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations and the total so far, in milliseconds"""
+        timings = {name: round(ms, 2) for name, ms in self.stages.items()}
+        timings["total"] = round(self.total_ms, 2)
+        return timings
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (https://www.w3.org/TR/server-timing/)"""
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.as_dict().items())
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of observations (max for the open bucket)"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else round(self.max_ms, 2)
+        return round(self.max_ms, 2)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1]
+            }
+        }
+
+class StageLatency:
+    """Latency histograms per stage of one endpoint (plus its total)"""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def observe(self, timer: StageTimer):
+        for name, ms in timer.as_dict().items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(ms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: histogram.stats() for name, histogram in self.histograms.items()}
+
+    def reset(self):
+        self.histograms.clear()
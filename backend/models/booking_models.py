@@ -137,6 +137,7 @@ class AvailabilityRequest(BaseModel):
     date: date
     players: int = 1
     preferred_times: Optional[List[time]] = None
+    course_name: Optional[str] = None  # Destination's main course if not given
 
 class AvailabilityResponse(BaseModel):
     """Available time slots response"""
@@ -148,6 +149,23 @@ class AvailabilityResponse(BaseModel):
     weather_info: Optional[Dict] = None
     special_offers: List[str] = []
 
+class CalendarDay(BaseModel):
+    """Availability summary of one day in a month calendar"""
+    date: date
+    open_slots: int                          # Tee times with room left
+    cheapest_price: Optional[int] = None     # Lowest price per player among them
+    weekend: bool = False                    # Weekend rates apply
+    peak: bool = False                       # Only peak-hour tee times left
+
+class AvailabilityCalendar(BaseModel):
+    """Month view of availability and prices"""
+    destination_id: str
+    destination_name: str
+    course_name: str
+    month: str  # YYYY-MM
+    currency: str = "SEK"
+    days: List[CalendarDay]
+
 # Booking Analytics Models
 class BookingStats(BaseModel):
     """Booking statistics for analytics"""
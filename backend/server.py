@@ -1,14 +1,15 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends, Header, UploadFile, File, Form, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends, Header, UploadFile, File, Form, Request, Response
 from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 from datetime import datetime, timezone, timedelta
 import io
@@ -17,6 +18,19 @@ from auth_service import auth_service
 from ai_service import ai_service
 from s3_service import s3_service
 from audit_service import audit_logger, AuditActionType
+from core.database import MONGO_CODEC_OPTIONS
+from core.cache import catalog_cache
+from core.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from core.projections import resolve_fields, build_projection, dump_fields
+from core.http_cache import conditional_get, ConditionalGet, EncodedPayload, payload_response
+from core.geo import with_geo_point
+from core.attributes import SOURCE_FIELDS, search_attributes, with_search_attributes
+from core.timing import StageTimer
+from core.idempotency import IDEMPOTENCY_HEADER, idempotency_store
+from core.sitemap import SitemapBuilder, SitemapChunk, format_lastmod, merge_chunks, render_sitemap_index
+from core.serialization import (
+    FastJSONResponse, construct_trusted, dump_json_list, dump_trusted, dump_trusted_list, trusted_list_response
+)
 
 # Rate limiting middleware
 class RateLimiter:
@@ -51,11 +65,11 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, **MONGO_CODEC_OPTIONS)
 db = client[os.environ.get('DB_NAME', 'golftrip')]
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -545,6 +559,15 @@ class PresignedUrlResponse(BaseModel):
     presigned_url: str
     expires_in: int
 
+# Batch Lookup Models
+class DestinationBatchResponse(BaseModel):
+    items: List[Destination]
+    missing: List[str] = []
+
+class ArticleBatchResponse(BaseModel):
+    items: List[Article]
+    missing: List[str] = []
+
 
 # ===== Helper Functions =====
 
@@ -594,30 +617,70 @@ def calculate_user_tier(profile: UserProfile) -> int:
     else:
         return 3
 
-def serialize_datetime(doc: dict) -> dict:
-    """Convert datetime objects to ISO strings for MongoDB storage"""
-    if not doc:
-        return doc
-    for key, value in doc.items():
-        if isinstance(value, datetime):
-            doc[key] = value.isoformat()
-        elif isinstance(value, list):
-            doc[key] = [serialize_datetime(item) if isinstance(item, dict) else item for item in value]
-        elif isinstance(value, dict):
-            doc[key] = serialize_datetime(value)
-    return doc
-
-def deserialize_datetime(doc: dict, fields: List[str]) -> dict:
-    """Convert ISO string timestamps back to datetime objects"""
-    if not doc:
-        return doc
-    for field in fields:
-        if field in doc and isinstance(doc[field], str):
-            try:
-                doc[field] = datetime.fromisoformat(doc[field])
-            except:
-                pass
-    return doc
+def next_cursor_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    """Build response headers advertising the next page cursor"""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+# Stable keyset sort orders for paginated list endpoints (last key must be unique)
+DESTINATION_SORT = [("created_at", 1), ("id", 1)]
+ARTICLE_SORT = [("publish_date", -1), ("id", -1)]
+TESTIMONIAL_SORT = [("created_at", -1), ("id", -1)]
+PARTNER_SORT = [("order", 1), ("id", 1)]
+INQUIRY_SORT = [("created_at", -1), ("id", -1)]
+
+# Named sparse fieldsets for the `fields` query parameter (None = every field)
+DESTINATION_PROJECTIONS = {
+    "card": [
+        "id", "name", "slug", "country", "region", "short_desc", "highlights",
+        "price_from", "price_to", "currency", "images", "featured"
+    ],
+    "detail": None
+}
+ARTICLE_PROJECTIONS = {
+    "card": ["id", "title", "slug", "excerpt", "category", "author", "image", "publish_date", "featured_until"],
+    "detail": None
+}
+
+# Card views only show the first image
+CARD_SLICES = {"images": 1}
+
+# Most keys a single batch lookup may ask for
+BATCH_MAX_KEYS = 100
+
+# Best-matching destinations handed to the AI recommender
+RECOMMENDATION_CANDIDATES = 20
+
+def parse_batch_keys(slugs: Optional[str], ids: Optional[str]) -> Tuple[str, List[str]]:
+    """Resolve the slugs/ids query parameters of a batch lookup into (field, keys)"""
+    if bool(slugs) == bool(ids):
+        raise HTTPException(status_code=400, detail="Provide either slugs or ids")
+    
+    key_field = "slug" if slugs else "id"
+    # Drop blanks and duplicates, keeping the requested order
+    keys = list(dict.fromkeys(key.strip() for key in (slugs or ids).split(",") if key.strip()))
+    if not keys:
+        raise HTTPException(status_code=400, detail=f"No {key_field}s given")
+    if len(keys) > BATCH_MAX_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_KEYS} keys per request")
+    
+    return key_field, keys
+
+async def fetch_batch(
+    collection,
+    key_field: str,
+    keys: List[str],
+    projection: Dict[str, Any]
+) -> Tuple[List[Dict], List[str]]:
+    """Fetch documents for several keys in one $in query, returns (docs in key order, missing keys)"""
+    docs = await collection.find({key_field: {"$in": keys}}, projection).to_list(len(keys))
+    by_key = {doc[key_field]: doc for doc in docs}
+    return [by_key[key] for key in keys if key in by_key], [key for key in keys if key not in by_key]
+
+def dump_batch(model, docs: List[Dict], field_list: Optional[List[str]]) -> List[Dict]:
+    """Serialize batch lookup results, either sparse or as trusted full models"""
+    if field_list is not None:
+        return [dump_fields(doc, model, field_list) for doc in docs]
+    return [construct_trusted(model, doc).model_dump(mode="json", warnings=False) for doc in docs]
 
 
 # ===== Authentication Dependency =====
@@ -641,7 +704,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
-    deserialize_datetime(user, ["created_at", "last_login"])
     return user
 
 
@@ -675,13 +737,11 @@ async def register(user_data: UserCreate, request: Request = None):
     )
     
     user_dict = user.model_dump()
-    user_dict = serialize_datetime(user_dict)
     await db.users.insert_one(user_dict)
     
     # Create user profile
     profile = UserProfile(user_id=user.id)
     profile_dict = profile.model_dump()
-    profile_dict = serialize_datetime(profile_dict)
     await db.user_profiles.insert_one(profile_dict)
     
     # Generate token
@@ -715,7 +775,7 @@ async def login(credentials: UserLogin, request: Request = None):
     # Update last login
     await db.users.update_one(
         {"id": user["id"]},
-        {"$set": {"last_login": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"last_login": datetime.now(timezone.utc)}}
     )
     
     # Generate token
@@ -751,11 +811,9 @@ async def get_user_profile(current_user: dict = Depends(get_current_user)):
         # Create profile if doesn't exist
         profile = UserProfile(user_id=current_user["id"])
         profile_dict = profile.model_dump()
-        profile_dict = serialize_datetime(profile_dict)
         await db.user_profiles.insert_one(profile_dict)
         return profile
     
-    deserialize_datetime(profile, ["created_at", "updated_at"])
     return profile
 
 @api_router.put("/profile", response_model=UserProfile)
@@ -766,7 +824,6 @@ async def update_user_profile(
     """Update user profile and preferences"""
     update_data = {k: v for k, v in profile_update.model_dump().items() if v is not None}
     update_data["updated_at"] = datetime.now(timezone.utc)
-    update_data = serialize_datetime(update_data)
     
     await db.user_profiles.update_one(
         {"user_id": current_user["id"]},
@@ -774,7 +831,6 @@ async def update_user_profile(
     )
     
     profile = await db.user_profiles.find_one({"user_id": current_user["id"]}, {"_id": 0})
-    deserialize_datetime(profile, ["created_at", "updated_at"])
     return profile
 
 @api_router.post("/profile/complete-kyc")
@@ -853,7 +909,6 @@ async def get_privacy_settings(current_user: dict = Depends(get_current_user)):
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
     
-    deserialize_datetime(settings, ["updated_at"])
     return settings
 
 @api_router.put("/privacy/settings")
@@ -867,7 +922,7 @@ async def update_privacy_settings(
     
     await db.privacy_settings.update_one(
         {"user_id": current_user["id"]},
-        {"$set": serialize_datetime(settings.model_dump())},
+        {"$set": settings.model_dump()},
         upsert=True
     )
     
@@ -876,9 +931,9 @@ async def update_privacy_settings(
         "id": str(uuid.uuid4()),
         "user_id": current_user["id"],
         "settings_update": settings.model_dump(),
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
-    await db.consent_logs.insert_one(serialize_datetime(consent_log))
+    await db.consent_logs.insert_one(consent_log)
     
     return {"message": "Privacy settings updated successfully"}
 
@@ -904,7 +959,7 @@ async def request_data_export(current_user: dict = Depends(get_current_user)):
         completed_at=datetime.now(timezone.utc)
     )
     
-    await db.data_export_requests.insert_one(serialize_datetime(export_request.model_dump()))
+    await db.data_export_requests.insert_one(export_request.model_dump())
     
     return {
         "message": "Data export completed",
@@ -927,7 +982,7 @@ async def request_account_deletion(
         status="pending"
     )
     
-    await db.data_deletion_requests.insert_one(serialize_datetime(deletion_request.model_dump()))
+    await db.data_deletion_requests.insert_one(deletion_request.model_dump())
     
     return {
         "message": "Account deletion request received. We will process this within 30 days as required by GDPR.",
@@ -962,7 +1017,7 @@ async def confirm_account_deletion(
             "$set": {
                 "email": anonymized_email,
                 "full_name": "Deleted User",
-                "deleted_at": datetime.now(timezone.utc).isoformat()
+                "deleted_at": datetime.now(timezone.utc)
             }
         }
     )
@@ -988,7 +1043,7 @@ async def confirm_account_deletion(
         {
             "$set": {
                 "status": "completed",
-                "completed_at": datetime.now(timezone.utc).isoformat()
+                "completed_at": datetime.now(timezone.utc)
             }
         }
     )
@@ -1079,14 +1134,20 @@ async def get_ai_recommendations(current_user: dict = Depends(get_current_user))
             "is_kyc_prompt": True
         }])
     
-    # Get all destinations
-    destinations = await db.destinations.find({"published": True}, {"_id": 0}).to_list(1000)
+    # Best preference matches across the whole catalog (the AI sees the first 20)
+    await catalog_matrix.refresh(db)
+    top_ids = catalog_matrix.recommend(profile.get("preferences", {}), RECOMMENDATION_CANDIDATES)
+    by_id = {
+        dest["id"]: dest
+        async for dest in db.destinations.find({"id": {"$in": top_ids}, "published": True}, {"_id": 0})
+    }
+    destinations = [by_id[dest_id] for dest_id in top_ids if dest_id in by_id]
     
     # Get recent additions (last 30 days)
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
     recent = await db.destinations.find({
         "published": True,
-        "created_at": {"$gte": thirty_days_ago.isoformat()}
+        "created_at": {"$gte": thirty_days_ago}
     }, {"_id": 0}).to_list(100)
     
     # Generate recommendations with tier context
@@ -1399,10 +1460,26 @@ async def generate_destination_content(
 # Destinations
 @api_router.get("/destinations", response_model=List[Destination])
 async def get_destinations(
+    request: Request,
     country: Optional[str] = None,
     featured: Optional[bool] = None,
-    published: Optional[bool] = True
+    published: Optional[bool] = True,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("destinations", "destinations"))
 ):
+    """List destinations, one page at a time (next page cursor in X-Next-Cursor)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    field_list = resolve_fields(fields, Destination, DESTINATION_PROJECTIONS)
+    projection = build_projection(
+        field_list,
+        extra_fields=[key for key, _ in DESTINATION_SORT],
+        slices=CARD_SLICES if fields == "card" else None
+    )
+    
     query = {}
     if country:
         query["country"] = country
@@ -1411,32 +1488,93 @@ async def get_destinations(
     if published is not None:
         query["published"] = published
     
-    destinations = await db.destinations.find(query, {"_id": 0}).to_list(1000)
-    for dest in destinations:
-        deserialize_datetime(dest, ["created_at", "updated_at"])
-    return destinations
+    async def load_destinations():
+        destinations, next_cursor = await paginate(
+            db.destinations, query, DESTINATION_SORT, limit=limit, cursor=cursor, projection=projection
+        )
+        if field_list is not None:
+            return EncodedPayload.from_content([dump_fields(dest, Destination, field_list) for dest in destinations]), next_cursor
+        return EncodedPayload(dump_trusted_list(Destination, destinations)), next_cursor
+    
+    # Cached bodies are already validated and encoded, so skip response_model revalidation
+    cache_key = ("list", country, featured, published, limit, cursor, fields)
+    payload, next_cursor = await catalog_cache.get_or_load("destinations", cache_key, load_destinations)
+    return payload_response(request, payload, {**next_cursor_headers(next_cursor), **validator.headers})
+
+@api_router.get("/destinations/batch", response_model=DestinationBatchResponse)
+async def get_destinations_batch(
+    slugs: Optional[str] = Query(None, description="Comma-separated slugs"),
+    ids: Optional[str] = Query(None, description="Comma-separated ids"),
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("destinations", "destinations"))
+):
+    """Look up several destinations in one query, in request order (unknown keys listed in `missing`)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    key_field, keys = parse_batch_keys(slugs, ids)
+    field_list = resolve_fields(fields, Destination, DESTINATION_PROJECTIONS)
+    projection = build_projection(
+        field_list,
+        extra_fields=[key_field],
+        slices=CARD_SLICES if fields == "card" else None
+    )
+    
+    destinations, missing = await fetch_batch(db.destinations, key_field, keys, projection)
+    return FastJSONResponse(
+        content={"items": dump_batch(Destination, destinations, field_list), "missing": missing},
+        headers=validator.headers
+    )
 
 @api_router.get("/destinations/{slug}", response_model=Destination)
-async def get_destination(slug: str):
-    dest = await db.destinations.find_one({"slug": slug}, {"_id": 0})
-    if not dest:
+async def get_destination(
+    request: Request,
+    slug: str,
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("destinations", "destinations"))
+):
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    field_list = resolve_fields(fields, Destination, DESTINATION_PROJECTIONS)
+    projection = build_projection(field_list, slices=CARD_SLICES if fields == "card" else None)
+    
+    async def load_destination():
+        dest = await db.destinations.find_one({"slug": slug}, projection)
+        if not dest:
+            return None
+        if field_list is not None:
+            return EncodedPayload.from_content(dump_fields(dest, Destination, field_list))
+        return EncodedPayload(dump_trusted(Destination, dest))
+    
+    payload = await catalog_cache.get_or_load("destinations", ("slug", slug, fields), load_destination)
+    if not payload:
         raise HTTPException(status_code=404, detail="Destination not found")
-    deserialize_datetime(dest, ["created_at", "updated_at"])
-    return dest
+    # Card fetches render listings and revalidations (304) aren't fresh reads; only detail reads count as views
+    if fields != "card":
+        search_analytics.record_view(slug)
+    return payload_response(request, payload, validator.headers)
 
 @api_router.post("/destinations", response_model=Destination)
 async def create_destination(destination: DestinationCreate):
     dest_obj = Destination(**destination.model_dump())
-    doc = dest_obj.model_dump()
-    doc = serialize_datetime(doc)
+    doc = with_search_attributes(with_geo_point(dest_obj.model_dump()))
     await db.destinations.insert_one(doc)
+    catalog_cache.bump("destinations")
+    await search_facet_summary.rebuild(db)
     return dest_obj
 
 @api_router.put("/destinations/{dest_id}", response_model=Destination)
 async def update_destination(dest_id: str, destination: DestinationUpdate):
-    update_data = {k: v for k, v in destination.model_dump().items() if v is not None}
+    update_data = with_geo_point({k: v for k, v in destination.model_dump().items() if v is not None})
     update_data["updated_at"] = datetime.now(timezone.utc)
-    update_data = serialize_datetime(update_data)
+    
+    # Re-derive the search attributes from the stored document with the changes applied
+    if any(field.split(".")[0] in update_data for field in SOURCE_FIELDS):
+        current = await db.destinations.find_one({"id": dest_id}, {"_id": 0, **{field: 1 for field in SOURCE_FIELDS}})
+        if not current:
+            raise HTTPException(status_code=404, detail="Destination not found")
+        update_data.update(search_attributes({**current, **update_data}))
     
     result = await db.destinations.update_one(
         {"id": dest_id},
@@ -1445,9 +1583,10 @@ async def update_destination(dest_id: str, destination: DestinationUpdate):
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Destination not found")
+    catalog_cache.bump("destinations")
+    await search_facet_summary.rebuild(db)
     
     dest = await db.destinations.find_one({"id": dest_id}, {"_id": 0})
-    deserialize_datetime(dest, ["created_at", "updated_at"])
     return dest
 
 @api_router.delete("/destinations/{dest_id}")
@@ -1455,15 +1594,47 @@ async def delete_destination(dest_id: str):
     result = await db.destinations.delete_one({"id": dest_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Destination not found")
+    catalog_cache.bump("destinations")
+    await search_facet_summary.rebuild(db)
     return {"message": "Destination deleted"}
 
 # Articles
+# Earliest featured_until still ahead (per articles version): featured lists change on their own when it passes
+_featured_expiry: Dict[str, Any] = {"version": None, "until": None}
+
+async def featured_articles_window() -> str:
+    """The next featured_until expiry, for cache keys and ETags of featured article lists"""
+    now = datetime.now(timezone.utc)
+    version = catalog_cache.version("articles")
+    until = _featured_expiry["until"]
+    if _featured_expiry["version"] != version or (until is not None and until <= now):
+        article = await db.articles.find_one(
+            {"published": True, "featured_until": {"$gt": now}},
+            {"_id": 0, "featured_until": 1},
+            sort=[("featured_until", 1)]
+        )
+        until = article["featured_until"] if article else None
+        _featured_expiry.update(version=version, until=until)
+    return until.isoformat() if until else ""
+
 @api_router.get("/articles", response_model=List[Article])
 async def get_articles(
+    request: Request,
     category: Optional[str] = None,
     published: Optional[bool] = True,
-    featured: Optional[bool] = None
+    featured: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("articles", "articles", variant=featured_articles_window))
 ):
+    """List articles, newest first (next page cursor in X-Next-Cursor)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    field_list = resolve_fields(fields, Article, ARTICLE_PROJECTIONS)
+    projection = build_projection(field_list, extra_fields=[key for key, _ in ARTICLE_SORT])
+    
     query = {}
     if category:
         query["category"] = category
@@ -1471,34 +1642,81 @@ async def get_articles(
         query["published"] = published
     if featured:
         # Featured articles have featured_until date in the future
-        query["featured_until"] = {"$gt": datetime.now(timezone.utc).isoformat()}
+        query["featured_until"] = {"$gt": datetime.now(timezone.utc)}
     
-    articles = await db.articles.find(query, {"_id": 0}).sort("publish_date", -1).to_list(1000)
-    for article in articles:
-        deserialize_datetime(article, ["publish_date", "featured_until", "created_at", "updated_at"])
-    return articles
+    async def load_articles():
+        articles, next_cursor = await paginate(
+            db.articles, query, ARTICLE_SORT, limit=limit, cursor=cursor, projection=projection
+        )
+        # Sparse rows don't satisfy the full Article model, so serialize them directly
+        if field_list is not None:
+            return EncodedPayload.from_content([dump_fields(article, Article, field_list) for article in articles]), next_cursor
+        return EncodedPayload(dump_trusted_list(Article, articles)), next_cursor
+    
+    # The featured filter depends on the clock, so those pages are keyed on the next expiry
+    window = await featured_articles_window() if featured else None
+    cache_key = ("list", category, published, featured, window, limit, cursor, fields)
+    payload, next_cursor = await catalog_cache.get_or_load("articles", cache_key, load_articles)
+    return payload_response(request, payload, {**next_cursor_headers(next_cursor), **validator.headers})
+
+@api_router.get("/articles/batch", response_model=ArticleBatchResponse)
+async def get_articles_batch(
+    slugs: Optional[str] = Query(None, description="Comma-separated slugs"),
+    ids: Optional[str] = Query(None, description="Comma-separated ids"),
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("articles", "articles"))
+):
+    """Look up several articles in one query, in request order (unknown keys listed in `missing`)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    key_field, keys = parse_batch_keys(slugs, ids)
+    field_list = resolve_fields(fields, Article, ARTICLE_PROJECTIONS)
+    projection = build_projection(field_list, extra_fields=[key_field])
+    
+    articles, missing = await fetch_batch(db.articles, key_field, keys, projection)
+    return FastJSONResponse(
+        content={"items": dump_batch(Article, articles, field_list), "missing": missing},
+        headers=validator.headers
+    )
 
 @api_router.get("/articles/{slug}", response_model=Article)
-async def get_article(slug: str):
-    article = await db.articles.find_one({"slug": slug}, {"_id": 0})
-    if not article:
+async def get_article(
+    request: Request,
+    slug: str,
+    fields: Optional[str] = Query(None, description="'card', 'detail' or comma-separated field names"),
+    validator: ConditionalGet = Depends(conditional_get("articles", "articles"))
+):
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    field_list = resolve_fields(fields, Article, ARTICLE_PROJECTIONS)
+    
+    async def load_article():
+        article = await db.articles.find_one({"slug": slug}, build_projection(field_list))
+        if not article:
+            return None
+        if field_list is not None:
+            return EncodedPayload.from_content(dump_fields(article, Article, field_list))
+        return EncodedPayload(dump_trusted(Article, article))
+    
+    payload = await catalog_cache.get_or_load("articles", ("slug", slug, fields), load_article)
+    if not payload:
         raise HTTPException(status_code=404, detail="Article not found")
-    deserialize_datetime(article, ["publish_date", "featured_until", "created_at", "updated_at"])
-    return article
+    return payload_response(request, payload, validator.headers)
 
 @api_router.post("/articles", response_model=Article)
 async def create_article(article: ArticleCreate):
     article_obj = Article(**article.model_dump())
     doc = article_obj.model_dump()
-    doc = serialize_datetime(doc)
     await db.articles.insert_one(doc)
+    catalog_cache.bump("articles")
     return article_obj
 
 @api_router.put("/articles/{article_id}", response_model=Article)
 async def update_article(article_id: str, article: ArticleUpdate):
     update_data = {k: v for k, v in article.model_dump().items() if v is not None}
     update_data["updated_at"] = datetime.now(timezone.utc)
-    update_data = serialize_datetime(update_data)
     
     result = await db.articles.update_one(
         {"id": article_id},
@@ -1507,9 +1725,9 @@ async def update_article(article_id: str, article: ArticleUpdate):
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Article not found")
+    catalog_cache.bump("articles")
     
     article = await db.articles.find_one({"id": article_id}, {"_id": 0})
-    deserialize_datetime(article, ["publish_date", "featured_until", "created_at", "updated_at"])
     return article
 
 @api_router.delete("/articles/{article_id}")
@@ -1517,32 +1735,36 @@ async def delete_article(article_id: str):
     result = await db.articles.delete_one({"id": article_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Article not found")
+    catalog_cache.bump("articles")
     return {"message": "Article deleted"}
 
 # Hero Carousel
 @api_router.get("/hero", response_model=List[HeroCarousel])
-async def get_hero_slides(active: Optional[bool] = True):
+async def get_hero_slides(
+    active: Optional[bool] = True,
+    validator: ConditionalGet = Depends(conditional_get("hero", "hero_carousel"))
+):
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
     query = {}
     if active is not None:
         query["active"] = active
     
     slides = await db.hero_carousel.find(query, {"_id": 0}).sort("order", 1).to_list(100)
-    for slide in slides:
-        deserialize_datetime(slide, ["created_at"])
     return slides
 
 @api_router.post("/hero", response_model=HeroCarousel)
 async def create_hero_slide(slide: HeroCarouselCreate):
     slide_obj = HeroCarousel(**slide.model_dump())
     doc = slide_obj.model_dump()
-    doc = serialize_datetime(doc)
     await db.hero_carousel.insert_one(doc)
+    catalog_cache.bump("hero_carousel")
     return slide_obj
 
 @api_router.put("/hero/{slide_id}", response_model=HeroCarousel)
 async def update_hero_slide(slide_id: str, slide: HeroCarouselUpdate):
     update_data = {k: v for k, v in slide.model_dump().items() if v is not None}
-    update_data = serialize_datetime(update_data)
     
     result = await db.hero_carousel.update_one(
         {"id": slide_id},
@@ -1551,9 +1773,9 @@ async def update_hero_slide(slide_id: str, slide: HeroCarouselUpdate):
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Hero slide not found")
+    catalog_cache.bump("hero_carousel")
     
     slide = await db.hero_carousel.find_one({"id": slide_id}, {"_id": 0})
-    deserialize_datetime(slide, ["created_at"])
     return slide
 
 @api_router.delete("/hero/{slide_id}")
@@ -1561,32 +1783,41 @@ async def delete_hero_slide(slide_id: str):
     result = await db.hero_carousel.delete_one({"id": slide_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Hero slide not found")
+    catalog_cache.bump("hero_carousel")
     return {"message": "Hero slide deleted"}
 
 # Testimonials
 @api_router.get("/testimonials", response_model=List[Testimonial])
-async def get_testimonials(published: Optional[bool] = True):
+async def get_testimonials(
+    response: Response,
+    published: Optional[bool] = True,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    validator: ConditionalGet = Depends(conditional_get("testimonials", "testimonials"))
+):
+    """List testimonials, newest first (next page cursor in X-Next-Cursor)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
     query = {}
     if published is not None:
         query["published"] = published
     
-    testimonials = await db.testimonials.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    for testimonial in testimonials:
-        deserialize_datetime(testimonial, ["created_at"])
+    testimonials, next_cursor = await paginate(db.testimonials, query, TESTIMONIAL_SORT, limit=limit, cursor=cursor)
+    response.headers.update(next_cursor_headers(next_cursor))
     return testimonials
 
 @api_router.post("/testimonials", response_model=Testimonial)
 async def create_testimonial(testimonial: TestimonialCreate):
     testimonial_obj = Testimonial(**testimonial.model_dump())
     doc = testimonial_obj.model_dump()
-    doc = serialize_datetime(doc)
     await db.testimonials.insert_one(doc)
+    catalog_cache.bump("testimonials")
     return testimonial_obj
 
 @api_router.put("/testimonials/{testimonial_id}", response_model=Testimonial)
 async def update_testimonial(testimonial_id: str, testimonial: TestimonialUpdate):
     update_data = {k: v for k, v in testimonial.model_dump().items() if v is not None}
-    update_data = serialize_datetime(update_data)
     
     result = await db.testimonials.update_one(
         {"id": testimonial_id},
@@ -1595,9 +1826,9 @@ async def update_testimonial(testimonial_id: str, testimonial: TestimonialUpdate
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    catalog_cache.bump("testimonials")
     
     testimonial = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
-    deserialize_datetime(testimonial, ["created_at"])
     return testimonial
 
 @api_router.delete("/testimonials/{testimonial_id}")
@@ -1605,16 +1836,28 @@ async def delete_testimonial(testimonial_id: str):
     result = await db.testimonials.delete_one({"id": testimonial_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    catalog_cache.bump("testimonials")
     return {"message": "Testimonial deleted"}
 
 # Partners
 @api_router.get("/partners", response_model=List[Partner])
-async def get_partners(active: Optional[bool] = True):
+async def get_partners(
+    response: Response,
+    active: Optional[bool] = True,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    validator: ConditionalGet = Depends(conditional_get("partners", "partners"))
+):
+    """List partners in display order (next page cursor in X-Next-Cursor)"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
     query = {}
     if active is not None:
         query["active"] = active
     
-    partners = await db.partners.find(query, {"_id": 0}).sort("order", 1).to_list(1000)
+    partners, next_cursor = await paginate(db.partners, query, PARTNER_SORT, limit=limit, cursor=cursor)
+    response.headers.update(next_cursor_headers(next_cursor))
     return partners
 
 @api_router.post("/partners", response_model=Partner)
@@ -1622,6 +1865,7 @@ async def create_partner(partner: PartnerCreate):
     partner_obj = Partner(**partner.model_dump())
     doc = partner_obj.model_dump()
     await db.partners.insert_one(doc)
+    catalog_cache.bump("partners")
     return partner_obj
 
 @api_router.put("/partners/{partner_id}", response_model=Partner)
@@ -1635,6 +1879,7 @@ async def update_partner(partner_id: str, partner: PartnerUpdate):
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Partner not found")
+    catalog_cache.bump("partners")
     
     partner = await db.partners.find_one({"id": partner_id}, {"_id": 0})
     return partner
@@ -1644,15 +1889,63 @@ async def delete_partner(partner_id: str):
     result = await db.partners.delete_one({"id": partner_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Partner not found")
+    catalog_cache.bump("partners")
     return {"message": "Partner deleted"}
 
+# Home page
+HOME_COLLECTIONS = ("hero_carousel", "destinations", "articles", "testimonials", "partners")
+
+@api_router.get("/home")
+async def get_home(
+    request: Request,
+    validator: ConditionalGet = Depends(conditional_get("home", *HOME_COLLECTIONS, variant=featured_articles_window))
+):
+    """Everything the home page renders, fetched concurrently and cached as one payload"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    async def load_home():
+        now = datetime.now(timezone.utc)
+        hero, destinations, articles, testimonials, partners = await asyncio.gather(
+            db.hero_carousel.find({"active": True}, {"_id": 0}).sort("order", 1).to_list(100),
+            db.destinations.find(
+                {"featured": True, "published": True},
+                build_projection(DESTINATION_PROJECTIONS["card"], slices=CARD_SLICES)
+            ).sort(DESTINATION_SORT).limit(4).to_list(4),
+            db.articles.find(
+                {"published": True, "featured_until": {"$gt": now}},
+                build_projection(ARTICLE_PROJECTIONS["card"])
+            ).sort(ARTICLE_SORT).limit(3).to_list(3),
+            db.testimonials.find({"published": True}, {"_id": 0}).sort(TESTIMONIAL_SORT).limit(3).to_list(3),
+            db.partners.find({"active": True}, {"_id": 0}).sort(PARTNER_SORT).to_list(100)
+        )
+        
+        return EncodedPayload.from_content({
+            "hero": [HeroCarousel(**slide).model_dump(mode="json") for slide in hero],
+            "featured_destinations": [
+                dump_fields(dest, Destination, DESTINATION_PROJECTIONS["card"]) for dest in destinations
+            ],
+            "featured_articles": [
+                dump_fields(article, Article, ARTICLE_PROJECTIONS["card"]) for article in articles
+            ],
+            "testimonials": [Testimonial(**testimonial).model_dump(mode="json") for testimonial in testimonials],
+            "partners": [Partner(**partner).model_dump(mode="json") for partner in partners]
+        })
+    
+    # Keyed on every collection version the payload depends on, and on when a featured article next expires
+    cache_key = (catalog_cache.versions(*HOME_COLLECTIONS), await featured_articles_window())
+    payload = await catalog_cache.get_or_load("home", cache_key, load_home)
+    return payload_response(request, payload, validator.headers)
+
 # Inquiries
 @api_router.get("/inquiries", response_model=List[Inquiry])
 async def get_inquiries(
     status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get user's own inquiries or all inquiries if admin"""
+    """Get user's own inquiries or all inquiries if admin, newest first (next page cursor in X-Next-Cursor)"""
     query = {}
     
     # Non-admin users can only see their own inquiries
@@ -1662,38 +1955,33 @@ async def get_inquiries(
     if status:
         query["status"] = status
     
-    inquiries = await db.inquiries.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    for inquiry in inquiries:
-        deserialize_datetime(inquiry, ["created_at", "updated_at"])
-        for note in inquiry.get("notes", []):
-            if isinstance(note, dict) and "created_at" in note:
-                deserialize_datetime(note, ["created_at"])
-    return inquiries
+    inquiries, next_cursor = await paginate(db.inquiries, query, INQUIRY_SORT, limit=limit, cursor=cursor)
+    return trusted_list_response(Inquiry, inquiries, next_cursor_headers(next_cursor))
 
 @api_router.get("/inquiries/{inquiry_id}", response_model=Inquiry)
 async def get_inquiry(inquiry_id: str):
     inquiry = await db.inquiries.find_one({"id": inquiry_id}, {"_id": 0})
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
-    deserialize_datetime(inquiry, ["created_at", "updated_at"])
-    for note in inquiry.get("notes", []):
-        if isinstance(note, dict) and "created_at" in note:
-            deserialize_datetime(note, ["created_at"])
     return inquiry
 
 @api_router.post("/inquiries", response_model=Inquiry)
-async def create_inquiry(inquiry: InquiryCreate):
-    inquiry_obj = Inquiry(**inquiry.model_dump())
-    doc = inquiry_obj.model_dump()
-    doc = serialize_datetime(doc)
-    await db.inquiries.insert_one(doc)
-    return inquiry_obj
+async def create_inquiry(
+    inquiry: InquiryCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
+):
+    async def create():
+        inquiry_obj = Inquiry(**inquiry.model_dump())
+        doc = inquiry_obj.model_dump()
+        await db.inquiries.insert_one(doc)
+        return inquiry_obj
+    
+    return await idempotency_store.run(db, "inquiries", idempotency_key, None, inquiry, create)
 
 @api_router.put("/inquiries/{inquiry_id}", response_model=Inquiry)
 async def update_inquiry_status(inquiry_id: str, inquiry: InquiryUpdate):
     update_data = {k: v for k, v in inquiry.model_dump().items() if v is not None}
     update_data["updated_at"] = datetime.now(timezone.utc)
-    update_data = serialize_datetime(update_data)
     
     result = await db.inquiries.update_one(
         {"id": inquiry_id},
@@ -1704,23 +1992,18 @@ async def update_inquiry_status(inquiry_id: str, inquiry: InquiryUpdate):
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
     inquiry = await db.inquiries.find_one({"id": inquiry_id}, {"_id": 0})
-    deserialize_datetime(inquiry, ["created_at", "updated_at"])
-    for note in inquiry.get("notes", []):
-        if isinstance(note, dict) and "created_at" in note:
-            deserialize_datetime(note, ["created_at"])
     return inquiry
 
 @api_router.post("/inquiries/{inquiry_id}/notes", response_model=Inquiry)
 async def add_inquiry_note(inquiry_id: str, note_data: InquiryAddNote):
     note = InquiryNote(text=note_data.text)
     note_dict = note.model_dump()
-    note_dict = serialize_datetime(note_dict)
     
     result = await db.inquiries.update_one(
         {"id": inquiry_id},
         {
             "$push": {"notes": note_dict},
-            "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+            "$set": {"updated_at": datetime.now(timezone.utc)}
         }
     )
     
@@ -1728,10 +2011,6 @@ async def add_inquiry_note(inquiry_id: str, note_data: InquiryAddNote):
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
     inquiry = await db.inquiries.find_one({"id": inquiry_id}, {"_id": 0})
-    deserialize_datetime(inquiry, ["created_at", "updated_at"])
-    for note in inquiry.get("notes", []):
-        if isinstance(note, dict) and "created_at" in note:
-            deserialize_datetime(note, ["created_at"])
     return inquiry
 
 @api_router.get("/inquiries/export/csv")
@@ -1757,7 +2036,7 @@ async def export_inquiries_csv():
             "budget": inquiry.get("budget", ""),
             "message": inquiry.get("message", ""),
             "status": inquiry.get("status", ""),
-            "created_at": inquiry.get("created_at", "")
+            "created_at": inquiry["created_at"].isoformat() if inquiry.get("created_at") else ""
         })
     
     output.seek(0)
@@ -1815,35 +2094,91 @@ async def update_setting(key: str, setting: SettingUpdate):
     return setting
 
 # SEO - Sitemap
-@api_router.get("/sitemap.xml", response_class=PlainTextResponse)
-async def get_sitemap():
-    base_url = "https://golf-travel-app.preview.emergentagent.com"
-    
-    # Static pages
-    urls = [
-        f"<url><loc>{base_url}/</loc><priority>1.0</priority></url>",
-        f"<url><loc>{base_url}/destinations</loc><priority>0.9</priority></url>",
-        f"<url><loc>{base_url}/articles</loc><priority>0.9</priority></url>",
-        f"<url><loc>{base_url}/about</loc><priority>0.7</priority></url>",
-        f"<url><loc>{base_url}/contact</loc><priority>0.8</priority></url>",
-    ]
-    
-    # Dynamic destination pages
-    destinations = await db.destinations.find({"published": True}, {"_id": 0, "slug": 1}).to_list(1000)
-    for dest in destinations:
-        urls.append(f"<url><loc>{base_url}/destinations/{dest['slug']}</loc><priority>0.8</priority></url>")
-    
-    # Dynamic article pages
-    articles = await db.articles.find({"published": True}, {"_id": 0, "slug": 1}).to_list(1000)
-    for article in articles:
-        urls.append(f"<url><loc>{base_url}/articles/{article['slug']}</loc><priority>0.7</priority></url>")
+SITEMAP_BASE_URL = "https://golf-travel-app.preview.emergentagent.com"
+SITEMAP_STATIC_PAGES = [
+    ("/", "1.0"),
+    ("/destinations", "0.9"),
+    ("/articles", "0.9"),
+    ("/about", "0.7"),
+    ("/contact", "0.8"),
+]
+
+async def build_sitemap_section(collection, path_prefix: str, priority: str) -> List[SitemapChunk]:
+    """Stream every published slug of a collection into protocol-sized sitemap chunks"""
+    builder = SitemapBuilder()
+    cursor = collection.find({"published": True}, {"_id": 0, "slug": 1, "updated_at": 1}).sort("slug", 1)
+    async for doc in cursor:
+        if doc.get("slug"):
+            builder.add(f"{SITEMAP_BASE_URL}{path_prefix}/{doc['slug']}", priority, format_lastmod(doc.get("updated_at")))
+    return builder.chunks
+
+async def load_sitemap_files() -> Dict[str, EncodedPayload]:
+    """
+    Render the sitemap as bytes, keyed by file name ("sitemap" is the entry point)
+    
+    Small catalogs get a single urlset; past the protocol limits "sitemap" becomes
+    an index over per-type child sitemaps. Each section is cached against its own
+    collection version, so an article edit doesn't re-read destinations.
+    """
+    static = SitemapBuilder()
+    for path, priority in SITEMAP_STATIC_PAGES:
+        static.add(f"{SITEMAP_BASE_URL}{path}", priority)
+    
+    sections = {
+        "pages": static.chunks,
+        "destinations": await catalog_cache.get_or_load(
+            "destinations", ("sitemap",), lambda: build_sitemap_section(db.destinations, "/destinations", "0.8")
+        ),
+        "articles": await catalog_cache.get_or_load(
+            "articles", ("sitemap",), lambda: build_sitemap_section(db.articles, "/articles", "0.7")
+        ),
+    }
     
-    sitemap = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{"".join(urls)}
-</urlset>"""
+    merged = merge_chunks(sections)
+    if merged is not None:
+        return {"sitemap": EncodedPayload(merged.render())}
+    
+    files = {}
+    children = []
+    for section, chunks in sections.items():
+        for number, chunk in enumerate(chunk for chunk in chunks if chunk.entries):
+            name = f"{section}-{number + 1}"
+            files[name] = EncodedPayload(chunk.render())
+            children.append((f"{SITEMAP_BASE_URL}/api/sitemaps/{name}.xml", chunk.lastmod))
+    files["sitemap"] = EncodedPayload(render_sitemap_index(children))
+    return files
+
+async def get_sitemap_files() -> Dict[str, EncodedPayload]:
+    """Rendered sitemap files for the current catalog content"""
+    cache_key = catalog_cache.versions("destinations", "articles")
+    return await catalog_cache.get_or_load("sitemap", cache_key, load_sitemap_files)
+
+@api_router.get("/sitemap.xml")
+async def get_sitemap(
+    request: Request,
+    validator: ConditionalGet = Depends(conditional_get("sitemap", "destinations", "articles"))
+):
+    """Sitemap (or sitemap index once the catalog outgrows one file), served from cache"""
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
+    files = await get_sitemap_files()
+    return payload_response(request, files["sitemap"], validator.headers, media_type="application/xml")
+
+@api_router.get("/sitemaps/{name}.xml")
+async def get_child_sitemap(
+    name: str,
+    request: Request,
+    validator: ConditionalGet = Depends(conditional_get("sitemap", "destinations", "articles"))
+):
+    """Child sitemap listed in the sitemap index"""
+    if validator.not_modified:
+        return validator.not_modified_response()
     
-    return sitemap
+    files = await get_sitemap_files()
+    if name == "sitemap" or name not in files:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return payload_response(request, files[name], validator.headers, media_type="application/xml")
 
 # SEO - Robots
 @api_router.get("/robots.txt", response_class=PlainTextResponse)
@@ -2057,9 +2392,10 @@ async def seed_database():
     
     for dest_data in destinations_data:
         dest_obj = Destination(**dest_data)
-        doc = dest_obj.model_dump()
-        doc = serialize_datetime(doc)
+        doc = with_search_attributes(with_geo_point(dest_obj.model_dump()))
         await db.destinations.insert_one(doc)
+    catalog_cache.bump("destinations")
+    await search_facet_summary.rebuild(db)
     
     # Seed Articles
     articles_data = [
@@ -2138,8 +2474,8 @@ async def seed_database():
     for article_data in articles_data:
         article_obj = Article(**article_data)
         doc = article_obj.model_dump()
-        doc = serialize_datetime(doc)
         await db.articles.insert_one(doc)
+    catalog_cache.bump("articles")
     
     # Seed Hero Carousel
     hero_data = [
@@ -2214,8 +2550,8 @@ async def seed_database():
     for hero in hero_data:
         hero_obj = HeroCarousel(**hero)
         doc = hero_obj.model_dump()
-        doc = serialize_datetime(doc)
         await db.hero_carousel.insert_one(doc)
+    catalog_cache.bump("hero_carousel")
     
     # Seed Partners
     partners_data = [
@@ -2252,6 +2588,7 @@ async def seed_database():
         partner_obj = Partner(**partner_data)
         doc = partner_obj.model_dump()
         await db.partners.insert_one(doc)
+    catalog_cache.bump("partners")
     
     # Seed Testimonials
     testimonials_data = [
@@ -2284,8 +2621,8 @@ async def seed_database():
     for testimonial_data in testimonials_data:
         testimonial_obj = Testimonial(**testimonial_data)
         doc = testimonial_obj.model_dump()
-        doc = serialize_datetime(doc)
         await db.testimonials.insert_one(doc)
+    catalog_cache.bump("testimonials")
     
     return {
         "message": "Database seeded successfully",
@@ -2397,7 +2734,6 @@ async def seed_mock_users():
         )
         
         user_dict = user.model_dump()
-        user_dict = serialize_datetime(user_dict)
         await db.users.insert_one(user_dict)
         
         # Create user profile
@@ -2408,7 +2744,6 @@ async def seed_mock_users():
         )
         
         profile_dict = profile.model_dump()
-        profile_dict = serialize_datetime(profile_dict)
         await db.user_profiles.insert_one(profile_dict)
         
         created_users.append({
@@ -2428,10 +2763,14 @@ async def seed_mock_users():
 
 from services.booking_service import booking_service
 from models.booking_models import (
-    BookingCreate, BookingUpdate, AvailabilityRequest, AvailabilityResponse,
+    BookingCreate, BookingUpdate, AvailabilityRequest, AvailabilityResponse, AvailabilityCalendar,
     Booking, BookingStatus, PaymentStatus, PlayerInfo, BookingItem, TimeSlot
 )
-from services.search_service import search_service, SearchRequest
+from services.search_service import search_service, SearchRequest, SEARCH_SORTS
+from services.search_facets import search_facet_summary
+from services.search_analytics import search_analytics
+from services.suggest_index import destination_suggest_index
+from services.personalization import catalog_matrix
 from services.payment_service import payment_service
 from services.translation_service import translation_service, Language
 from services.dgolf_populator import dgolf_populator
@@ -2460,51 +2799,91 @@ async def check_availability(
         )
         
         return availability
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Availability check failed: {str(e)}")
 
-@api_router.post("/bookings", response_model=Booking)
-async def create_booking(
-    booking_data: BookingCreate,
+@api_router.get("/bookings/calendar", response_model=AvailabilityCalendar)
+async def get_availability_calendar(
+    destination_id: str = Query(..., description="Destination ID"),
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month (YYYY-MM)"),
+    course_name: Optional[str] = Query(None, description="Course (defaults to the destination's main course)"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Create a new golf booking"""
+    """Open tee times, cheapest price and weekend/peak flags for every day of a month"""
+    year, month_number = (int(part) for part in month.split("-"))
     try:
-        booking = await booking_service.create_booking(
-            booking_data=booking_data,
-            user_id=current_user["id"]
-        )
+        calendar = await booking_service.get_availability_calendar(destination_id, year, month_number, course_name)
         
-        # Log booking creation
+        # Log availability check
         await audit_logger.log_action(
-            action_type=AuditActionType.DATA_CREATE,
+            action_type=AuditActionType.DATA_READ,
             user_id=current_user["id"],
             user_email=current_user["email"],
-            resource_type="booking",
-            resource_id=booking.id,
-            metadata={
-                "booking_reference": booking.booking_reference,
-                "total_amount": booking.total_amount,
-                "items": len(booking.items)
-            },
+            resource_type="availability",
+            resource_id=destination_id,
+            metadata={"month": month},
             legal_basis="Contract performance"
         )
         
-        return booking
+        return calendar
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Booking creation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Availability calendar failed: {str(e)}")
+
+@api_router.post("/bookings", response_model=Booking)
+async def create_booking(
+    booking_data: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    current_user: dict = Depends(get_current_user)
+):
+    """Create a new golf booking (retries with the same Idempotency-Key replay the first response)"""
+    
+    async def create():
+        try:
+            booking = await booking_service.create_booking(
+                booking_data=booking_data,
+                user_id=current_user["id"]
+            )
+            
+            # Log booking creation
+            await audit_logger.log_action(
+                action_type=AuditActionType.DATA_CREATE,
+                user_id=current_user["id"],
+                user_email=current_user["email"],
+                resource_type="booking",
+                resource_id=booking.id,
+                metadata={
+                    "booking_reference": booking.booking_reference,
+                    "total_amount": booking.total_amount,
+                    "items": len(booking.items)
+                },
+                legal_basis="Contract performance"
+            )
+            
+            return booking
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Booking creation failed: {str(e)}")
+    
+    return await idempotency_store.run(db, "bookings", idempotency_key, current_user["id"], booking_data, create)
 
 @api_router.get("/bookings/my", response_model=List[Booking])
 async def get_my_bookings(
     status: Optional[str] = Query(None, description="Filter by booking status"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Bookings per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get user's bookings"""
+    """Get user's bookings, newest first"""
     try:
         booking_status = BookingStatus(status) if status else None
-        bookings = await booking_service.get_user_bookings(
+        bookings, next_cursor = await booking_service.get_user_bookings(
             user_id=current_user["id"],
-            status=booking_status
+            status=booking_status,
+            limit=limit,
+            cursor=cursor
         )
         
         # Log booking access
@@ -2518,7 +2897,13 @@ async def get_my_bookings(
             legal_basis="Contract performance"
         )
         
-        return bookings
+        return Response(
+            content=dump_json_list(Booking, bookings),
+            media_type="application/json",
+            headers=next_cursor_headers(next_cursor)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get bookings: {str(e)}")
 
@@ -2595,6 +2980,7 @@ async def cancel_booking(
 
 @api_router.get("/search/destinations")
 async def search_destinations(
+    response: Response,
     q: Optional[str] = Query(None, description="Search query"),
     countries: Optional[str] = Query(None, description="Comma-separated countries"),
     price_min: Optional[int] = Query(None, description="Minimum price"),
@@ -2613,10 +2999,12 @@ async def search_destinations(
     lat: Optional[float] = Query(None, description="Latitude for location search"),
     lng: Optional[float] = Query(None, description="Longitude for location search"),
     radius_km: Optional[int] = Query(None, description="Search radius in kilometers"),
+    debug: bool = Query(False, description="Include per-stage timings in search_stats"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Advanced destination search with filtering and AI insights"""
+    """Advanced destination search with filtering and AI insights (stage timings in the Server-Timing header)"""
     
+    timer = StageTimer()
     try:
         # Parse date parameters
         check_in_date = None
@@ -2634,6 +3022,11 @@ async def search_destinations(
             except:
                 raise HTTPException(status_code=400, detail="Invalid check_out date format")
         
+        if sort_by not in SEARCH_SORTS:
+            raise HTTPException(status_code=400, detail=f"Invalid sort_by (one of: {', '.join(SEARCH_SORTS)})")
+        if sort_by == 'distance' and (lat is None or lng is None):
+            raise HTTPException(status_code=400, detail="sort_by=distance requires lat and lng")
+        
         # Parse list parameters
         countries_list = countries.split(',') if countries else []
         accommodation_list = accommodation.split(',') if accommodation else []
@@ -2666,30 +3059,38 @@ async def search_destinations(
         # Get user profile for personalized results
         user_profile = None
         if current_user:
-            profile_data = await db.user_profiles.find_one(
-                {"user_id": current_user["id"]}, 
-                {"_id": 0}
-            )
+            with timer.stage("profile"):
+                profile_data = await db.user_profiles.find_one(
+                    {"user_id": current_user["id"]}, 
+                    {"_id": 0}
+                )
             if profile_data:
                 user_profile = profile_data
         
         # Execute search
-        results = await search_service.search_destinations(search_request, user_profile)
+        results = await search_service.search_destinations(search_request, user_profile, timer)
+        if page == 1:
+            search_analytics.record_search(q)
         
         # Log search action
-        await audit_logger.log_action(
-            action_type=AuditActionType.DATA_READ,
-            user_id=current_user["id"],
-            user_email=current_user["email"],
-            resource_type="destination_search",
-            metadata={
-                "query": q,
-                "filters": search_request._get_applied_filters() if hasattr(search_request, '_get_applied_filters') else {},
-                "result_count": results.get('total_count', 0)
-            },
-            legal_basis="Legitimate interest"
-        )
+        with timer.stage("audit"):
+            await audit_logger.log_action(
+                action_type=AuditActionType.DATA_READ,
+                user_id=current_user["id"],
+                user_email=current_user["email"],
+                resource_type="destination_search",
+                metadata={
+                    "query": q,
+                    "filters": search_request._get_applied_filters() if hasattr(search_request, '_get_applied_filters') else {},
+                    "result_count": results.get('total_count', 0)
+                },
+                legal_basis="Legitimate interest"
+            )
         
+        search_service.stage_latency.observe(timer)
+        response.headers["Server-Timing"] = timer.server_timing()
+        if debug:
+            results["search_stats"]["timings"] = timer.as_dict()
         return results
         
     except HTTPException:
@@ -2697,6 +3098,19 @@ async def search_destinations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+@api_router.get("/search/suggest")
+async def suggest_search(
+    q: str = Query(..., min_length=1, max_length=100, description="Partially typed query"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions")
+):
+    """Typo-tolerant search-as-you-type suggestions"""
+    
+    await destination_suggest_index.refresh(db)
+    return {
+        "query": q,
+        "suggestions": destination_suggest_index.suggest(q, limit)
+    }
+
 @api_router.get("/search/filters")
 async def get_search_filters():
     """Get available filter options with statistics"""
@@ -2707,6 +3121,24 @@ async def get_search_filters():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get filter data: {str(e)}")
 
+@api_router.get("/search/cache-stats")
+async def get_search_cache_stats(current_user: dict = Depends(get_current_user)):
+    """Get search cache hit/miss statistics (Admin only)"""
+    
+    if not current_user.get("is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return search_service.cache_stats()
+
+@api_router.get("/search/latency-stats")
+async def get_search_latency_stats(current_user: dict = Depends(get_current_user)):
+    """Get per-stage search latency histograms since startup (Admin only)"""
+    
+    if not current_user.get("is_admin", False):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return search_service.stage_latency.stats()
+
 @api_router.get("/search/popular")
 async def get_popular_searches():
     """Get popular search terms and trending destinations"""
@@ -2745,35 +3177,45 @@ async def create_payment_session(
     origin_url: str = Form(...),
     quantity: int = Form(1),
     booking_id: Optional[str] = Form(None),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
     current_user: dict = Depends(get_current_user)
 ):
-    """Create Stripe checkout session for golf package payment"""
+    """Create Stripe checkout session for golf package payment (one session per Idempotency-Key)"""
     
-    try:
-        # Validate quantity
-        if quantity < 1 or quantity > 10:
-            raise HTTPException(status_code=400, detail="Invalid quantity (1-10 allowed)")
-        
-        # Create checkout session
-        session = await payment_service.create_checkout_session(
-            package_id=package_id,
-            origin_url=origin_url,
-            user_id=current_user["id"],
-            user_email=current_user["email"],
-            booking_id=booking_id,
-            quantity=quantity,
-            metadata={
-                "user_name": current_user.get("full_name", ""),
-                "platform": "golf_guy_platform"
-            }
-        )
-        
-        return session
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Payment session creation failed: {str(e)}")
+    async def create():
+        try:
+            # Validate quantity
+            if quantity < 1 or quantity > 10:
+                raise HTTPException(status_code=400, detail="Invalid quantity (1-10 allowed)")
+            
+            # Create checkout session
+            session = await payment_service.create_checkout_session(
+                package_id=package_id,
+                origin_url=origin_url,
+                user_id=current_user["id"],
+                user_email=current_user["email"],
+                booking_id=booking_id,
+                quantity=quantity,
+                metadata={
+                    "user_name": current_user.get("full_name", ""),
+                    "platform": "golf_guy_platform"
+                }
+            )
+            
+            return session
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Payment session creation failed: {str(e)}")
+    
+    form = {
+        "package_id": package_id,
+        "origin_url": origin_url,
+        "quantity": quantity,
+        "booking_id": booking_id
+    }
+    return await idempotency_store.run(db, "payments", idempotency_key, current_user["id"], form, create)
 
 @api_router.get("/payments/checkout/status/{session_id}")
 async def get_payment_status(
@@ -2844,16 +3286,22 @@ async def stripe_webhook(request: Request):
 
 @api_router.get("/payments/my-transactions")
 async def get_my_transactions(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by payment status"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Transactions per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get user's payment transactions"""
+    """Get user's payment transactions, newest first (totals and summary on the first page only)"""
     
     try:
-        transactions = await payment_service.get_user_transactions(
+        transactions, next_cursor = await payment_service.get_user_transactions(
             user_id=current_user["id"],
-            status=status
+            status=status,
+            limit=limit,
+            cursor=cursor
         )
+        response.headers.update(next_cursor_headers(next_cursor))
         
         # Log transaction access
         await audit_logger.log_action(
@@ -2866,24 +3314,41 @@ async def get_my_transactions(
             legal_basis="Contract performance"
         )
         
+        if cursor:
+            return {"transactions": transactions}
+        
+        # Totals span every page, so they are aggregated for the first page only
+        summary = await payment_service.get_user_transaction_summary(current_user["id"], status)
         return {
             "transactions": transactions,
-            "total_count": len(transactions),
+            "total_count": summary["total_count"],
             "summary": {
-                "total_paid": sum(t.get("amount", 0) for t in transactions if t.get("payment_status") == "paid"),
-                "pending_payments": len([t for t in transactions if t.get("payment_status") == "pending"])
+                "total_paid": summary["total_paid"],
+                "pending_payments": summary["pending_payments"]
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get transactions: {str(e)}")
 
 # ===== INTERNATIONALIZATION ROUTES =====
 
+async def translations_version() -> str:
+    """Content hash of the translation tables, for ETags of translation responses"""
+    return translation_service.content_hash
+
 @api_router.get("/i18n/translations/{language}")
-async def get_translations(language: str = "en"):
+async def get_translations(
+    language: str = "en",
+    validator: ConditionalGet = Depends(conditional_get("translations", variant=translations_version))
+):
     """Get all translations for specified language"""
     
+    if validator.not_modified:
+        return validator.not_modified_response()
+    
     try:
         lang = Language.SWEDISH if language == "sv" else Language.ENGLISH
         translations = translation_service.get_all_translations(lang)
@@ -3007,6 +3472,7 @@ async def cors_middleware(request: Request, call_next):
         response.headers["Access-Control-Allow-Credentials"] = "true"
         response.headers["Access-Control-Allow-Methods"] = "*"
         response.headers["Access-Control-Allow-Headers"] = "*"
+        response.headers["Access-Control-Expose-Headers"] = f"{NEXT_CURSOR_HEADER}, ETag"
         return response
     
     return await call_next(request)
@@ -3017,6 +3483,7 @@ app.add_middleware(
     allow_origins=get_allowed_origins(),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Configure logging
@@ -3028,4 +3495,5 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await search_analytics.flush(db)
     client.close()
\ No newline at end of file
@@ -115,12 +115,6 @@ class AuthenticationService:
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        # Deserialize datetime fields
-        if user.get("created_at") and isinstance(user["created_at"], str):
-            user["created_at"] = datetime.fromisoformat(user["created_at"])
-        if user.get("last_login") and isinstance(user["last_login"], str):
-            user["last_login"] = datetime.fromisoformat(user["last_login"])
-        
         return user
     
     async def get_current_admin(
@@ -171,14 +165,7 @@ class AuthenticationService:
     
     async def get_user_by_id(self, user_id: str, db) -> Optional[dict]:
         """Get user by ID"""
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
-        if user:
-            # Deserialize datetime fields
-            if user.get("created_at") and isinstance(user["created_at"], str):
-                user["created_at"] = datetime.fromisoformat(user["created_at"])
-            if user.get("last_login") and isinstance(user["last_login"], str):
-                user["last_login"] = datetime.fromisoformat(user["last_login"])
-        return user
+        return await db.users.find_one({"id": user_id}, {"_id": 0})
     
     def generate_user_token_data(self, user: dict) -> dict:
         """Generate token data for a user"""
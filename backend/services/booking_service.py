@@ -3,25 +3,67 @@ Booking Service
 Handles golf course booking logic, availability checking, and reservation management
 """
 import asyncio
-from typing import List, Optional, Dict, Any
+import calendar
+import time as time_module
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone, date, time, timedelta
 import logging
+import numpy as np
+from core.cache import VersionedLRUCache
 from core.database import get_database
+from core.pagination import paginate, DEFAULT_PAGE_SIZE
+from core.serialization import construct_many
 from models.booking_models import (
     Booking, BookingCreate, BookingUpdate, BookingStatus, PaymentStatus,
     TimeSlot, AvailabilityRequest, AvailabilityResponse, BookingStats,
-    ExternalBookingProvider, BookingItem
+    ExternalBookingProvider, BookingItem, AvailabilityCalendar, CalendarDay
 )
 from services.audit_service import audit_logger, AuditActionType
+from services.tee_time_inventory import (
+    COURSES_PROJECTION, HOLDING_STATUSES, SLOT_CAPACITY, SLOT_COUNT,
+    default_course_name, resolve_course_name, slot_time, tee_time_inventory
+)
 
 logger = logging.getLogger(__name__)
 
+# Dynamic tee-time pricing: multipliers of the destination's base price
+PEAK_HOURS = range(10, 16)       # 10:00-15:59
+OFF_PEAK_HOURS_BEFORE = 9        # Tee times before 09:00...
+OFF_PEAK_HOURS_AFTER = 16        # ...and from 17:00
+PEAK_MULTIPLIER = 1.3
+OFF_PEAK_MULTIPLIER = 0.8
+WEEKEND_MULTIPLIER = 1.2
+
+def hour_price_multiplier(hour: int) -> float:
+    """Time-of-day price multiplier"""
+    if hour in PEAK_HOURS:
+        return PEAK_MULTIPLIER
+    if hour < OFF_PEAK_HOURS_BEFORE or hour > OFF_PEAK_HOURS_AFTER:
+        return OFF_PEAK_MULTIPLIER
+    return 1.0
+
+# Per-slot multipliers and peak flags of the tee sheet, for whole-month pricing
+SLOT_HOUR_MULTIPLIERS = np.array([hour_price_multiplier(slot_time(index).hour) for index in range(SLOT_COUNT)])
+SLOT_IS_PEAK = np.array([slot_time(index).hour in PEAK_HOURS for index in range(SLOT_COUNT)])
+
+# Availability responses are cached briefly; bookings in this process invalidate them at once,
+# the TTL bounds staleness from other workers (reservations stay exact either way)
+AVAILABILITY_CACHE_TTL_SECONDS = 30
+
+# Times update_booking re-reads a booking whose status changed under it
+STATUS_UPDATE_ATTEMPTS = 3
+
 class BookingService:
     """Service for managing golf bookings and availability"""
     
     def __init__(self):
         self.booking_providers = {}  # External booking provider integrations
-        self.availability_cache = {}  # Cache for availability data
+        # AvailabilityResponse per course for each (destination, date); destination edits empty it
+        self.availability_cache = VersionedLRUCache(
+            ["destinations"], max_entries=2000, ttl_seconds=AVAILABILITY_CACHE_TTL_SECONDS
+        )
+        # When each (destination, date) was last invalidated, so a load that started earlier isn't cached
+        self._availability_invalidated: Dict[Tuple[str, str], float] = {}
         
     async def check_availability(
         self, 
@@ -34,6 +76,13 @@ class BookingService:
         if not db:
             db = await get_database()
         
+        cache_key = (request.destination_id, request.date.isoformat())
+        cached = self.availability_cache.get(cache_key) or {}
+        if request.course_name in cached:
+            return cached[request.course_name]
+        load_started = time_module.monotonic()
+        version = self.availability_cache.current_version()
+        
         try:
             # Get destination info
             destination = await db.destinations.find_one(
@@ -44,161 +93,162 @@ class BookingService:
             if not destination:
                 raise ValueError(f"Destination {request.destination_id} not found")
             
-            # Generate available time slots (in real implementation, this would
-            # integrate with golf course booking systems)
-            available_slots = await self._generate_available_slots(
+            # Remaining capacity per tee time: one point read of the day's inventory
+            course_name = resolve_course_name(destination, request.course_name)
+            inventory = await tee_time_inventory.get_or_create(db, request.destination_id, course_name, request.date)
+            
+            available_slots, fully_booked_times = self._build_slots(
                 request.destination_id,
                 request.date,
-                request.players,
+                course_name,
+                inventory["remaining"],
                 destination
             )
             
-            # Check existing bookings to reduce availability
-            booked_slots = await self._get_booked_slots(
-                request.destination_id, 
-                request.date,
-                db
-            )
-            
-            # Update availability based on existing bookings
-            updated_slots = self._update_slot_availability(available_slots, booked_slots)
-            
             # Get weather information (mock for now)
             weather_info = await self._get_weather_forecast(
                 destination.get('location_coordinates'),
                 request.date
             )
             
-            return AvailabilityResponse(
+            availability = AvailabilityResponse(
                 destination_id=request.destination_id,
                 destination_name=destination['name'],
                 date=request.date,
-                available_slots=updated_slots,
+                available_slots=available_slots,
+                fully_booked_times=fully_booked_times,
                 weather_info=weather_info,
                 special_offers=self._get_special_offers(destination, request.date)
             )
             
+            # Skip caching if a booking changed this day while we were reading it
+            if self._availability_invalidated.get(cache_key, 0.0) < load_started:
+                self.availability_cache.set(cache_key, {**cached, request.course_name: availability}, version)
+            return availability
+            
         except Exception as e:
             logger.error(f"Error checking availability: {str(e)}")
             raise
     
-    async def _generate_available_slots(
+    def invalidate_availability(self, items: List[Any]):
+        """Drop cached availability for the days of booking items (BookingItem or stored dicts)"""
+        now = time_module.monotonic()
+        for item in items:
+            if isinstance(item, dict):
+                destination_id, day = item['destination_id'], str(item['date'])
+            else:
+                destination_id, day = item.destination_id, item.date.isoformat()
+            self._availability_invalidated[(destination_id, day)] = now
+            self.availability_cache.invalidate((destination_id, day))
+        
+        # Markers only matter to loads in flight; forget the old ones
+        if len(self._availability_invalidated) > self.availability_cache.max_entries:
+            cutoff = now - AVAILABILITY_CACHE_TTL_SECONDS
+            self._availability_invalidated = {
+                key: invalidated for key, invalidated in self._availability_invalidated.items() if invalidated >= cutoff
+            }
+    
+    def _build_slots(
         self, 
         destination_id: str, 
         booking_date: date,
-        players: int,
+        course_name: str,
+        remaining: List[int],
         destination: Dict
-    ) -> List[TimeSlot]:
-        """Generate available time slots for a destination"""
-        
-        slots = []
-        
-        # Standard golf course hours (7:00 AM to 6:00 PM)
-        start_hour = 7
-        end_hour = 18
-        slot_interval = 15  # 15-minute intervals
+    ) -> Tuple[List[TimeSlot], List[time]]:
+        """Time slots with room left, and the tee times that are fully booked"""
         
         # Base price calculation based on destination
         base_price = destination.get('price_from', 500)  # SEK
         
-        # Course information
-        courses = destination.get('courses', [])
-        course_name = courses[0].get('course_name', 'Main Course') if courses else 'Golf Course'
-        
-        current_time = time(start_hour, 0)
-        end_time = time(end_hour, 0)
-        
-        while current_time < end_time:
-            # Calculate dynamic pricing (peak hours cost more)
-            price_multiplier = 1.0
-            if 10 <= current_time.hour <= 15:  # Peak hours
-                price_multiplier = 1.3
-            elif current_time.hour < 9 or current_time.hour > 16:  # Off-peak
-                price_multiplier = 0.8
-            
-            # Weekend pricing
-            if booking_date.weekday() >= 5:  # Saturday/Sunday
-                price_multiplier *= 1.2
-            
-            slot_price = int(base_price * price_multiplier)
-            
-            # Available slots (in real system, this would come from course management system)
-            available_spots = 4  # Standard foursome
+        slots = []
+        fully_booked = []
+        for index, available_spots in enumerate(remaining):
+            current_time = slot_time(index)
+            if available_spots <= 0:
+                fully_booked.append(current_time)
+                continue
             
-            slot = TimeSlot(
+            slots.append(TimeSlot(
                 destination_id=destination_id,
                 date=booking_date,
                 time=current_time,
                 available_slots=available_spots,
-                total_slots=available_spots,
-                price_per_player=slot_price,
+                total_slots=SLOT_CAPACITY,
+                price_per_player=self._slot_price(base_price, current_time, booking_date),
                 currency="SEK",
                 course_name=course_name,
                 special_conditions=self._get_slot_conditions(current_time, booking_date)
-            )
-            
-            slots.append(slot)
-            
-            # Move to next slot
-            current_datetime = datetime.combine(booking_date, current_time)
-            next_datetime = current_datetime + timedelta(minutes=slot_interval)
-            current_time = next_datetime.time()
+            ))
         
-        return slots
+        return slots, fully_booked
     
-    async def _get_booked_slots(
-        self, 
-        destination_id: str, 
-        booking_date: date,
-        db
-    ) -> List[Dict]:
-        """Get existing bookings for a destination and date"""
-        
-        bookings = await db.bookings.find({
-            "items.destination_id": destination_id,
-            "items.date": booking_date.isoformat(),
-            "status": {"$in": [BookingStatus.CONFIRMED, BookingStatus.PENDING]}
-        }, {"_id": 0}).to_list(None)
-        
-        booked_slots = []
-        for booking in bookings:
-            for item in booking.get('items', []):
-                if item['destination_id'] == destination_id:
-                    booked_slots.append({
-                        'time': item['time'],
-                        'players': len(item.get('players', []))
-                    })
-        
-        return booked_slots
+    def _slot_price(self, base_price: int, slot_time: time, booking_date: date) -> int:
+        """Dynamic price per player (peak hours and weekends cost more)"""
+        price_multiplier = hour_price_multiplier(slot_time.hour)
+        
+        # Weekend pricing
+        if booking_date.weekday() >= 5:  # Saturday/Sunday
+            price_multiplier *= WEEKEND_MULTIPLIER
+        
+        return int(base_price * price_multiplier)
     
-    def _update_slot_availability(
-        self, 
-        available_slots: List[TimeSlot], 
-        booked_slots: List[Dict]
-    ) -> List[TimeSlot]:
-        """Update slot availability based on existing bookings"""
-        
-        # Create a mapping of booked times
-        booked_by_time = {}
-        for booking in booked_slots:
-            time_str = booking['time']
-            players = booking['players']
-            if time_str not in booked_by_time:
-                booked_by_time[time_str] = 0
-            booked_by_time[time_str] += players
-        
-        # Update available slots
-        updated_slots = []
-        for slot in available_slots:
-            time_str = slot.time.strftime('%H:%M:%S')
-            booked_players = booked_by_time.get(time_str, 0)
-            slot.available_slots = max(0, slot.total_slots - booked_players)
-            
-            # Only include slots with availability
-            if slot.available_slots > 0:
-                updated_slots.append(slot)
+    async def get_availability_calendar(
+        self,
+        destination_id: str,
+        year: int,
+        month: int,
+        course_name: Optional[str] = None,
+        db = None
+    ) -> AvailabilityCalendar:
+        """
+        Open tee times and the cheapest price for every day of a month
         
-        return updated_slots
+        Remaining capacity comes from one range read of the inventory, and the
+        whole month is priced as one (days x tee times) array.
+        """
+        if not db:
+            db = await get_database()
+        
+        destination = await db.destinations.find_one(
+            {"id": destination_id},
+            {"_id": 0, "name": 1, "price_from": 1, **COURSES_PROJECTION}
+        )
+        if not destination:
+            raise ValueError(f"Destination {destination_id} not found")
+        
+        course_name = resolve_course_name(destination, course_name)
+        first_day = date(year, month, 1)
+        days = [first_day + timedelta(days=offset) for offset in range(calendar.monthrange(year, month)[1])]
+        by_day = await tee_time_inventory.remaining_by_day(db, destination_id, course_name, days[0], days[-1])
+        
+        remaining = np.array([by_day[day.isoformat()] for day in days])
+        open_slots = remaining > 0
+        weekend = np.array([day.weekday() >= 5 for day in days])
+        
+        # Same arithmetic as _slot_price: int(base * hour multiplier * weekend multiplier)
+        multipliers = SLOT_HOUR_MULTIPLIERS[np.newaxis, :] * np.where(weekend, WEEKEND_MULTIPLIER, 1.0)[:, np.newaxis]
+        prices = np.floor(destination.get('price_from', 500) * multipliers)
+        cheapest = np.where(open_slots, prices, np.inf).min(axis=1)
+        open_counts = open_slots.sum(axis=1)
+        peak_only = open_slots.any(axis=1) & ~(open_slots & ~SLOT_IS_PEAK).any(axis=1)
+        
+        return AvailabilityCalendar(
+            destination_id=destination_id,
+            destination_name=destination['name'],
+            course_name=course_name,
+            month=f"{year:04d}-{month:02d}",
+            days=[
+                CalendarDay(
+                    date=day,
+                    open_slots=int(open_counts[row]),
+                    cheapest_price=int(cheapest[row]) if open_counts[row] else None,
+                    weekend=bool(weekend[row]),
+                    peak=bool(peak_only[row])
+                )
+                for row, day in enumerate(days)
+            ]
+        )
     
     def _get_slot_conditions(self, slot_time: time, booking_date: date) -> List[str]:
         """Get special conditions for a time slot"""
@@ -265,27 +315,14 @@ class BookingService:
             db = await get_database()
         
         try:
-            # Validate availability for all items
-            for item in booking_data.items:
-                availability = await self.check_availability(
-                    AvailabilityRequest(
-                        destination_id=item.destination_id,
-                        date=item.date,
-                        players=len(item.players)
-                    ),
-                    db
-                )
-                
-                # Check if requested time is available
-                requested_time = item.time
-                available_slot = None
-                for slot in availability.available_slots:
-                    if slot.time == requested_time and slot.available_slots >= len(item.players):
-                        available_slot = slot
-                        break
-                
-                if not available_slot:
-                    raise ValueError(f"Requested time {requested_time} not available for {item.destination_name}")
+            # Take the tee times first (all or nothing): each is an atomic conditional
+            # decrement, so concurrent bookings can't both get the last places
+            reservations = await self._reservations(booking_data.items, db)
+            failed = await tee_time_inventory.reserve_all(db, reservations)
+            if failed is not None:
+                item = booking_data.items[failed]
+                raise ValueError(f"Requested time {item.time} not available for {item.destination_name}")
+            self.invalidate_availability(booking_data.items)
             
             # Calculate total amount
             total_amount = sum(item.total_price for item in booking_data.items)
@@ -304,19 +341,15 @@ class BookingService:
             )
             
             # Store in database
+            # Timestamps are stored as BSON dates; item dates and times are
+            # encoded to strings by the client's type registry
             booking_dict = booking.model_dump()
-            # Convert datetime fields to ISO strings
-            booking_dict['created_at'] = booking_dict['created_at'].isoformat()
-            booking_dict['updated_at'] = booking_dict['updated_at'].isoformat()
-            
-            # Convert dates and times in items
-            for item in booking_dict['items']:
-                if isinstance(item['date'], date):
-                    item['date'] = item['date'].isoformat()
-                if isinstance(item['time'], time):
-                    item['time'] = item['time'].strftime('%H:%M:%S')
-            
-            await db.bookings.insert_one(booking_dict)
+            try:
+                await db.bookings.insert_one(booking_dict)
+            except Exception:
+                await tee_time_inventory.release_all(db, reservations)
+                self.invalidate_availability(booking_data.items)
+                raise
             
             # Log booking creation
             await audit_logger.log_action(
@@ -340,6 +373,44 @@ class BookingService:
             logger.error(f"Error creating booking: {str(e)}")
             raise
     
+    async def _reservations(
+        self,
+        items: List[BookingItem],
+        db,
+        check_courses: bool = True
+    ) -> List[Tuple[str, str, date, time, int]]:
+        """
+        Tee-time reservations (destination, course, date, time, players) for booking items
+        
+        Course names must be courses of the destination; check_courses=False keeps
+        stored names as they are, to give back what a booking already holds.
+        """
+        
+        # One read for every destination in the request
+        destination_ids = list({item.destination_id for item in items})
+        destinations = {
+            destination['id']: destination
+            async for destination in db.destinations.find(
+                {"id": {"$in": destination_ids}},
+                {"_id": 0, "id": 1, "name": 1, **COURSES_PROJECTION}
+            )
+        }
+        for destination_id in destination_ids:
+            if destination_id not in destinations:
+                raise ValueError(f"Destination {destination_id} not found")
+        
+        return [
+            (
+                item.destination_id,
+                resolve_course_name(destinations[item.destination_id], item.course_name)
+                if check_courses else item.course_name or default_course_name(destinations[item.destination_id]),
+                item.date,
+                item.time,
+                len(item.players)
+            )
+            for item in items
+        ]
+    
     async def get_booking(self, booking_id: str, db = None) -> Optional[Booking]:
         """Get booking by ID"""
         if not db:
@@ -349,12 +420,6 @@ class BookingService:
         if not booking_data:
             return None
         
-        # Convert ISO strings back to datetime objects
-        if booking_data.get('created_at'):
-            booking_data['created_at'] = datetime.fromisoformat(booking_data['created_at'])
-        if booking_data.get('updated_at'):
-            booking_data['updated_at'] = datetime.fromisoformat(booking_data['updated_at'])
-        
         return Booking(**booking_data)
     
     async def update_booking(
@@ -371,16 +436,46 @@ class BookingService:
             k: v for k, v in update_data.model_dump().items() 
             if v is not None
         }
-        update_fields['updated_at'] = datetime.now(timezone.utc).isoformat()
-        
-        result = await db.bookings.update_one(
-            {"id": booking_id},
-            {"$set": update_fields}
-        )
+        update_fields['updated_at'] = datetime.now(timezone.utc)
+        
+        # Every write is conditional on the status it was planned from; if the
+        # status changes in between (a concurrent cancel or payment), plan again
+        for _ in range(STATUS_UPDATE_ATTEMPTS):
+            previous = await db.bookings.find_one({"id": booking_id}, {"_id": 0, "status": 1, "items": 1})
+            if previous is None:
+                return None
+            
+            # Cancelling gives the tee times back; reinstating takes them first
+            new_status = update_fields.get('status', previous['status'])
+            was_holding = previous['status'] in HOLDING_STATUSES
+            reservations = []
+            if was_holding != (new_status in HOLDING_STATUSES):
+                reservations = await self._reservations(
+                    [BookingItem(**item) for item in previous['items']], db, check_courses=not was_holding
+                )
+                if not was_holding and await tee_time_inventory.reserve_all(db, reservations) is not None:
+                    raise ValueError("Booked tee times are no longer available")
+            
+            result = await db.bookings.update_one(
+                {"id": booking_id, "status": previous['status']},
+                {"$set": update_fields}
+            )
+            if result.matched_count == 0:
+                if reservations and not was_holding:
+                    await tee_time_inventory.release_all(db, reservations)
+                    self.invalidate_availability(previous['items'])
+                continue
+            
+            if reservations and was_holding:
+                await tee_time_inventory.release_all(db, reservations)
+            
+            # After the inventory changed, so a load that starts before it can't be cached
+            self.invalidate_availability(previous['items'])
+            break
+        else:
+            raise ValueError(f"Booking {booking_id} is being changed concurrently, try again")
         
-        if result.modified_count > 0:
-            return await self.get_booking(booking_id, db)
-        return None
+        return await self.get_booking(booking_id, db)
     
     async def cancel_booking(
         self, 
@@ -404,9 +499,11 @@ class BookingService:
         self, 
         user_id: str,
         status: Optional[BookingStatus] = None,
-        db = None
-    ) -> List[Booking]:
-        """Get all bookings for a user"""
+        db = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of a user's bookings, newest first, and the next page cursor"""
         if not db:
             db = await get_database()
         
@@ -414,19 +511,12 @@ class BookingService:
         if status:
             query["status"] = status
         
-        bookings_data = await db.bookings.find(query, {"_id": 0}).to_list(None)
-        
-        bookings = []
-        for booking_data in bookings_data:
-            # Convert datetime fields
-            if booking_data.get('created_at'):
-                booking_data['created_at'] = datetime.fromisoformat(booking_data['created_at'])
-            if booking_data.get('updated_at'):
-                booking_data['updated_at'] = datetime.fromisoformat(booking_data['updated_at'])
-            
-            bookings.append(Booking(**booking_data))
+        bookings_data, next_cursor = await paginate(
+            db.bookings, query, [("created_at", -1), ("id", -1)], limit=limit, cursor=cursor
+        )
         
-        return bookings
+        # Trusted read: these documents were written through the Booking model
+        return construct_many(Booking, bookings_data), next_cursor
 
 # Global booking service instance
 booking_service = BookingService()
\ No newline at end of file
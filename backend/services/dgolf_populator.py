@@ -7,6 +7,10 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import logging
 from core.database import get_database
+from core.cache import catalog_cache
+from core.geo import with_geo_point
+from core.attributes import with_search_attributes
+from services.search_facets import search_facet_summary
 from ai_service import ai_service
 
 logger = logging.getLogger(__name__)
@@ -302,10 +306,13 @@ class DGolfDataPopulator:
                             "best_time_to_visit": "March to November" if country in ["spain", "portugal"] else "May to September",
                             "featured": dest_data.get("price_range", [0, 0])[1] > 3000,  # Premium destinations as featured
                             "published": True,
-                            "created_at": datetime.now(timezone.utc).isoformat(),
-                            "updated_at": datetime.now(timezone.utc).isoformat()
+                            "created_at": datetime.now(timezone.utc),
+                            "updated_at": datetime.now(timezone.utc)
                         }
                         
+                        with_geo_point(destination)
+                        with_search_attributes(destination)
+                        
                         # Check if destination exists
                         existing = await db.destinations.find_one({"slug": destination["slug"]})
                         
@@ -325,6 +332,10 @@ class DGolfDataPopulator:
                         logger.error(f"Error processing destination {dest_data['name']}: {str(e)}")
                         stats["errors"] += 1
             
+            if stats["created"] or stats["updated"]:
+                catalog_cache.bump("destinations")
+                await search_facet_summary.rebuild(db)
+            
             return stats
             
         except Exception as e:
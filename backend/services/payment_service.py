@@ -4,7 +4,7 @@ Handles golf booking payments with security and compliance
 """
 import os
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timezone
 from fastapi import HTTPException, Request
 from pydantic import BaseModel
@@ -12,7 +12,10 @@ from emergentintegrations.payments.stripe.checkout import (
     StripeCheckout, CheckoutSessionResponse, CheckoutStatusResponse, CheckoutSessionRequest
 )
 from core.database import get_database
+from core.pagination import paginate, DEFAULT_PAGE_SIZE
 from services.audit_service import audit_logger, AuditActionType
+from services.booking_service import booking_service
+from services.tee_time_inventory import HOLDING_STATUSES
 
 logger = logging.getLogger(__name__)
 
@@ -204,8 +207,6 @@ class PaymentService:
             
             # Store transaction in database
             transaction_dict = transaction.model_dump()
-            transaction_dict['created_at'] = transaction_dict['created_at'].isoformat()
-            transaction_dict['updated_at'] = transaction_dict['updated_at'].isoformat()
             
             await db.payment_transactions.insert_one(transaction_dict)
             
@@ -286,25 +287,34 @@ class PaymentService:
             update_data = {
                 "stripe_status": status.status,
                 "payment_status": status.payment_status,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "updated_at": datetime.now(timezone.utc)
             }
             
             # Mark as completed if payment successful
             if status.payment_status == 'paid':
-                update_data["completed_at"] = datetime.now(timezone.utc).isoformat()
+                update_data["completed_at"] = datetime.now(timezone.utc)
                 
                 # Update booking status if booking_id exists
                 booking_id = transaction.get('booking_id')
                 if booking_id:
-                    await db.bookings.update_one(
-                        {"id": booking_id},
-                        {"$set": {
-                            "payment_status": "captured",
-                            "status": "confirmed",
-                            "payment_id": session_id,
-                            "updated_at": datetime.now(timezone.utc).isoformat()
-                        }}
+                    payment_fields = {
+                        "payment_status": "captured",
+                        "payment_id": session_id,
+                        "updated_at": datetime.now(timezone.utc)
+                    }
+                    
+                    # Only a booking still holding its tee times is confirmed; one cancelled
+                    # meanwhile has given them back, so it just records the payment
+                    booking = await db.bookings.find_one_and_update(
+                        {"id": booking_id, "status": {"$in": HOLDING_STATUSES}},
+                        {"$set": {**payment_fields, "status": "confirmed"}},
+                        {"_id": 0, "items": 1}
                     )
+                    if booking:
+                        booking_service.invalidate_availability(booking.get('items', []))
+                    else:
+                        await db.bookings.update_one({"id": booking_id}, {"$set": payment_fields})
+                        logger.warning(f"Payment {session_id} captured for booking {booking_id}, which is no longer active")
                     
                     # Log booking confirmation
                     await audit_logger.log_action(
@@ -387,9 +397,11 @@ class PaymentService:
     async def get_user_transactions(
         self, 
         user_id: str,
-        status: Optional[str] = None
-    ) -> List[Dict]:
-        """Get user's payment transactions"""
+        status: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of user's payment transactions, newest first, and the next page cursor"""
         
         try:
             db = await get_database()
@@ -398,16 +410,51 @@ class PaymentService:
             if status:
                 query["payment_status"] = status
             
-            transactions = await db.payment_transactions.find(
-                query, 
-                {"_id": 0}
-            ).sort("created_at", -1).to_list(None)
-            
-            return transactions
+            return await paginate(
+                db.payment_transactions,
+                query,
+                [("created_at", -1), ("id", -1)],
+                limit=limit,
+                cursor=cursor
+            )
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error getting user transactions: {str(e)}")
-            return []
+            return [], None
+    
+    async def get_user_transaction_summary(self, user_id: str, status: Optional[str] = None) -> Dict[str, Any]:
+        """Get paid total, pending count and count of a user's transactions, optionally of one payment status"""
+        
+        try:
+            db = await get_database()
+            
+            query = {"user_id": user_id}
+            if status:
+                query["payment_status"] = status
+            
+            pipeline = [
+                {"$match": query},
+                {"$group": {
+                    "_id": None,
+                    "total_paid": {"$sum": {"$cond": [{"$eq": ["$payment_status", "paid"]}, "$amount", 0]}},
+                    "pending_payments": {"$sum": {"$cond": [{"$eq": ["$payment_status", "pending"]}, 1, 0]}},
+                    "total_count": {"$sum": 1}
+                }}
+            ]
+            result = await db.payment_transactions.aggregate(pipeline).to_list(1)
+            
+            if not result:
+                return {"total_paid": 0, "pending_payments": 0, "total_count": 0}
+            
+            summary = result[0]
+            summary.pop("_id", None)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Error getting transaction summary: {str(e)}")
+            return {"total_paid": 0, "pending_payments": 0, "total_count": 0}
 
 # Global payment service instance
 payment_service = PaymentService()
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Personalization engine
+Destinations encoded once as NumPy arrays so a user's preferences score a whole catalog in one vectorized expression
+"""
+import time
+from typing import Dict, List, Optional, Set
+import logging
+import numpy as np
+from services.search_index import DestinationIndex
+
+logger = logging.getLogger(__name__)
+
+# Preference boosts (added to the non-personalized relevance score)
+COUNTRY_BOOST = 30
+BUDGET_BOOST = 20
+PLAYING_LEVEL_BOOST = 15
+
+# Featured boost of the non-personalized relevance score, used as the base for recommendations
+FEATURED_BOOST = 25
+
+DEFAULT_BUDGET_MIN = 0
+DEFAULT_BUDGET_MAX = 100000
+DEFAULT_PLAYING_LEVEL = "Intermediate"
+
+# Playing levels (matched against destination highlights)
+PLAYING_LEVELS = ["Beginner", "Intermediate", "Advanced", "Professional"]
+
+class PreferenceVector:
+    """A user's preferences, normalized once for scoring"""
+    __slots__ = ("countries", "budget_min", "budget_max", "playing_level")
+
+    def __init__(self, prefs: Optional[Dict]):
+        prefs = prefs or {}
+        self.countries: Set[str] = set(prefs.get("preferred_countries") or [])
+        self.budget_min = prefs.get("budget_min", DEFAULT_BUDGET_MIN)
+        self.budget_max = prefs.get("budget_max", DEFAULT_BUDGET_MAX)
+        self.playing_level = prefs.get("playing_level", DEFAULT_PLAYING_LEVEL)
+
+class DestinationMatrix:
+    """
+    Column arrays for a fixed list of destinations
+
+    Countries are integer codes (a one-hot column per country, stored as the
+    index of its hot column) and highlights an inverted index of row numbers.
+    """
+
+    def __init__(self, docs: List[Dict]):
+        self.ids: List[str] = [doc["id"] for doc in docs]
+        self.rows: Dict[str, int] = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        size = len(docs)
+
+        price_from = np.fromiter(((doc.get("price_from") or 0) for doc in docs), dtype=np.float64, count=size)
+        price_to = np.fromiter(((doc.get("price_to") or 0) for doc in docs), dtype=np.float64, count=size)
+        self.price_avg = (price_from + price_to) / 2
+        self.featured = np.fromiter((bool(doc.get("featured")) for doc in docs), dtype=bool, count=size)
+
+        self.country_codes_by_name: Dict[str, int] = {}
+        self.country_codes = np.fromiter(
+            (self.country_codes_by_name.setdefault(doc.get("country"), len(self.country_codes_by_name)) for doc in docs),
+            dtype=np.int32,
+            count=size
+        )
+
+        highlight_rows: Dict[str, List[int]] = {}
+        for row, doc in enumerate(docs):
+            for highlight in set(doc.get("highlights") or []):
+                highlight_rows.setdefault(highlight, []).append(row)
+        self.highlight_rows = {highlight: np.array(rows, dtype=np.int64) for highlight, rows in highlight_rows.items()}
+
+        # Playing levels are checked on every personalized request, so keep them as dense masks
+        self.level_masks: Dict[str, np.ndarray] = {}
+        for level in PLAYING_LEVELS:
+            mask = np.zeros(size, dtype=bool)
+            if level in self.highlight_rows:
+                mask[self.highlight_rows[level]] = True
+            self.level_masks[level] = mask
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def boosts(self, prefs: PreferenceVector) -> np.ndarray:
+        """Preference boost of every destination (int16)"""
+        # Preferred countries: dot product of the one-hot country columns with the preference
+        # vector, i.e. an OR of code comparisons (a handful of countries is cheaper than a gather)
+        country = np.zeros(len(self), dtype=bool)
+        for name in prefs.countries:
+            code = self.country_codes_by_name.get(name)
+            if code is not None:
+                country |= self.country_codes == code
+
+        scores = country.astype(np.int16) * np.int16(COUNTRY_BOOST)
+        budget = (self.price_avg >= prefs.budget_min) & (self.price_avg <= prefs.budget_max)
+        scores += budget.astype(np.int16) * np.int16(BUDGET_BOOST)
+
+        # Playing level named in the highlights
+        level_mask = self.level_masks.get(prefs.playing_level)
+        if level_mask is not None:
+            scores += level_mask.astype(np.int16) * np.int16(PLAYING_LEVEL_BOOST)
+        elif prefs.playing_level in self.highlight_rows:
+            scores[self.highlight_rows[prefs.playing_level]] += np.int16(PLAYING_LEVEL_BOOST)
+
+        return scores
+
+    def top(self, prefs: PreferenceVector, k: int, base: Optional[np.ndarray] = None) -> List[str]:
+        """Ids of the k best-scoring destinations (base + boosts), best first"""
+        scores = self.boosts(prefs).astype(np.float64)
+        if base is not None:
+            scores += base
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self.ids[row] for row in ordered]
+
+class CatalogMatrix(DestinationIndex):
+    """
+    DestinationMatrix over every published destination, kept current like the search index
+
+    Documents are tracked incrementally; the arrays are rebuilt (one pass, no
+    queries) on the first use after a change.
+    """
+
+    fields = ["country", "price_from", "price_to", "highlights", "featured"]
+
+    def __init__(self):
+        super().__init__()
+        self._docs: Dict[str, Dict] = {}
+        self._matrix: Optional[DestinationMatrix] = None
+
+    def indexed_ids(self) -> Set[str]:
+        return set(self._docs)
+
+    def upsert(self, doc: Dict):
+        self._docs[doc["id"]] = doc
+        self._matrix = None
+
+    def remove(self, doc_id: str):
+        if self._docs.pop(doc_id, None) is not None:
+            self._matrix = None
+
+    def clear(self):
+        super().clear()
+        self._docs.clear()
+        self._matrix = None
+
+    @property
+    def matrix(self) -> DestinationMatrix:
+        if self._matrix is None:
+            started = time.perf_counter()
+            self._matrix = DestinationMatrix(list(self._docs.values()))
+            logger.info(
+                f"Personalization matrix built: {len(self._matrix)} destinations in "
+                f"{(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+        return self._matrix
+
+    def recommend(self, prefs: Optional[Dict], k: int) -> List[str]:
+        """Ids of the destinations that best match a user's preferences"""
+        matrix = self.matrix
+        if not len(matrix):
+            return []
+        return matrix.top(PreferenceVector(prefs), k, base=FEATURED_BOOST * matrix.featured.astype(np.float64))
+
+# Global personalization matrix over the published catalog
+catalog_matrix = CatalogMatrix()
@@ -0,0 +1,294 @@
+"""
+Search and view analytics
+Time-decayed heavy-hitter counters for popular searches and trending destinations, kept in memory with periodic snapshots
+"""
+import asyncio
+import heapq
+import math
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional
+import logging
+from core.database import get_database
+from services.search_index import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Distinct keys tracked per counter (space-saving keeps the heavy hitters among them)
+COUNTER_CAPACITY = 1000
+
+# Half-lives of the "now" and "baseline" counters; their ratio is the trend
+SHORT_HALF_LIFE_SECONDS = 6 * 3600
+LONG_HALF_LIFE_SECONDS = 3 * 24 * 3600
+
+# Rate ratio (short vs long) above/below which a key is trending up/down
+TREND_UP_RATIO = 1.25
+TREND_DOWN_RATIO = 0.8
+
+# Snapshot cadence; a snapshot is also written on shutdown
+FLUSH_INTERVAL_SECONDS = 300
+
+MAX_QUERY_LENGTH = 100
+
+# Snapshots of workers that stopped flushing this long ago are dropped (their counts have decayed to 1/16)
+SNAPSHOT_RETENTION_SECONDS = 4 * LONG_HALF_LIFE_SECONDS
+
+# Id of the single shared snapshot written before snapshots were kept per worker
+LEGACY_SNAPSHOT_ID = "search_analytics"
+
+class DecayedSpaceSaving:
+    """
+    Space-saving top-k counter with exponential time decay
+
+    Uses forward decay: an event at time t adds exp(rate * (t - landmark)), so
+    existing counts never need touching; reading multiplies by
+    exp(-rate * (now - landmark)). The landmark moves forward before the
+    weights get large. When full, a new key replaces the smallest counter and
+    inherits its count (the classic over-estimate, tracked as error).
+    """
+
+    # Renormalize before exp() grows past this exponent
+    MAX_EXPONENT = 40.0
+
+    def __init__(self, capacity: int, half_life_seconds: float):
+        self.capacity = capacity
+        self.rate = math.log(2) / half_life_seconds
+        self.landmark = time.time()
+        self.counts: Dict[str, float] = {}
+        self.errors: Dict[str, float] = {}
+
+    def _renormalize(self, now: float):
+        factor = math.exp(-self.rate * (now - self.landmark))
+        for key in self.counts:
+            self.counts[key] *= factor
+            self.errors[key] *= factor
+        self.landmark = now
+
+    def add(self, key: str, amount: float = 1.0, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        if self.rate * (now - self.landmark) > self.MAX_EXPONENT:
+            self._renormalize(now)
+        weight = amount * math.exp(self.rate * (now - self.landmark))
+
+        if key in self.counts:
+            self.counts[key] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = weight
+            self.errors[key] = 0.0
+        else:
+            victim = min(self.counts, key=self.counts.__getitem__)
+            floor = self.counts.pop(victim)
+            self.errors.pop(victim)
+            self.counts[key] = floor + weight
+            self.errors[key] = floor
+
+    def value(self, key: str, now: Optional[float] = None) -> float:
+        """Decayed count of a key (0 if not tracked)"""
+        now = time.time() if now is None else now
+        return self.counts.get(key, 0.0) * math.exp(-self.rate * (now - self.landmark))
+
+    def values(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Decayed counts of every tracked key"""
+        now = time.time() if now is None else now
+        decay = math.exp(-self.rate * (now - self.landmark))
+        return {key: count * decay for key, count in self.counts.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "landmark": self.landmark,
+            "counters": [[key, count, self.errors[key]] for key, count in self.counts.items()],
+        }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add a snapshot's counts (e.g. from before a restart) into this counter"""
+        now = time.time()
+        age = now - snapshot.get("landmark", now)
+        for key, count, _error in snapshot.get("counters", []):
+            self.add(key, count * math.exp(-self.rate * age), now)
+
+class TrendCounter:
+    """A short and a long half-life counter over the same keys"""
+
+    def __init__(self, capacity: int = COUNTER_CAPACITY):
+        self.short = DecayedSpaceSaving(capacity, SHORT_HALF_LIFE_SECONDS)
+        self.long = DecayedSpaceSaving(capacity, LONG_HALF_LIFE_SECONDS)
+
+    def add(self, key: str):
+        now = time.time()
+        self.short.add(key, now=now)
+        self.long.add(key, now=now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"short": self.short.snapshot(), "long": self.long.snapshot()}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        self.short.merge(snapshot.get("short", {}))
+        self.long.merge(snapshot.get("long", {}))
+
+def trend_ratio(short_count: float, long_count: float) -> float:
+    """Recent event rate relative to the baseline rate (1.0 = steady)"""
+    long_rate = long_count / LONG_HALF_LIFE_SECONDS
+    if long_rate <= 0:
+        return 1.0
+    return (short_count / SHORT_HALF_LIFE_SECONDS) / long_rate
+
+def combined_values(*counters: DecayedSpaceSaving, now: float) -> Dict[str, float]:
+    """Decayed counts summed over several counters"""
+    totals: Dict[str, float] = {}
+    for counter in counters:
+        for key, count in counter.values(now).items():
+            totals[key] = totals.get(key, 0.0) + count
+    return totals
+
+def trend_label(ratio: float) -> str:
+    if ratio >= TREND_UP_RATIO:
+        return "up"
+    if ratio <= TREND_DOWN_RATIO:
+        return "down"
+    return "steady"
+
+class SearchAnalytics:
+    """
+    In-memory popular searches and trending destinations
+
+    Fed by search requests and destination detail views. Each worker counts
+    its own traffic and snapshots it to its own document in search_analytics
+    every FLUSH_INTERVAL_SECONDS (and on shutdown); at each flush it also reads
+    the other workers' snapshots. Rankings are served from this worker's live
+    counters plus the others' last snapshots, so they cover all traffic. The
+    snapshots of a restarted worker keep counting (decayed) as history.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.queries = TrendCounter()
+        self.views = TrendCounter()
+        # Other workers' counts as of their last snapshots
+        self.other_queries = TrendCounter()
+        self.other_views = TrendCounter()
+        # Normalized query -> the most recent way a user typed it
+        self._query_text: Dict[str, str] = {}
+        self._other_query_text: Dict[str, str] = {}
+        self._loaded = False
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def record_search(self, query: Optional[str]):
+        """Count one search (call once per search, not per results page)"""
+        text = " ".join((query or "").split())[:MAX_QUERY_LENGTH]
+        key = normalize_query(text)
+        if not key:
+            return
+        self.queries.add(key)
+        self._query_text[key] = text
+        self._schedule_flush()
+
+    def record_view(self, slug: str):
+        """Count one destination detail view"""
+        self.views.add(slug)
+        self._schedule_flush()
+
+    def popular_searches(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most searched queries (baseline window) with their trend"""
+        now = time.time()
+        long = combined_values(self.queries.long, self.other_queries.long, now=now)
+        short = combined_values(self.queries.short, self.other_queries.short, now=now)
+        return [
+            {
+                "query": self._query_text.get(key) or self._other_query_text.get(key, key),
+                "count": round(count),
+                "trend": trend_label(trend_ratio(short.get(key, 0.0), count)),
+            }
+            for key, count in heapq.nlargest(limit, long.items(), key=lambda item: item[1])
+        ]
+
+    def trending_destinations(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most viewed destinations right now (short window)"""
+        now = time.time()
+        long = combined_values(self.views.long, self.other_views.long, now=now)
+        short = combined_values(self.views.short, self.other_views.short, now=now)
+        trending = []
+        for slug, views in heapq.nlargest(limit, short.items(), key=lambda item: item[1]):
+            ratio = trend_ratio(views, long.get(slug, 0.0))
+            trending.append({
+                "slug": slug,
+                "views": round(views, 1),
+                "trend": trend_label(ratio),
+                # 50 = steady, 100 = at least twice the usual rate
+                "trend_score": round(min(ratio, 2.0) * 50),
+            })
+        return trending
+
+    async def load(self, db):
+        """Read the other workers' snapshots (once per process; flushes re-read them)"""
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            try:
+                # The shared snapshot from before per-worker snapshots is adopted by one worker
+                legacy = await db.search_analytics.find_one_and_delete({"_id": LEGACY_SNAPSHOT_ID})
+                if legacy:
+                    self.queries.merge(legacy.get("queries", {}))
+                    self.views.merge(legacy.get("views", {}))
+                    for key, text in legacy.get("query_text", {}).items():
+                        self._query_text.setdefault(key, text)
+                await self._read_others(db)
+            except Exception as e:
+                logger.error(f"Error loading search analytics: {str(e)}")
+                return
+            self._loaded = True
+
+    async def _read_others(self, db):
+        queries, views, query_text = TrendCounter(), TrendCounter(), {}
+        async for snapshot in db.search_analytics.find({
+            "worker": {"$nin": [None, self.worker_id]},
+            "flushed_at": {"$gte": time.time() - SNAPSHOT_RETENTION_SECONDS}
+        }):
+            queries.merge(snapshot.get("queries", {}))
+            views.merge(snapshot.get("views", {}))
+            query_text.update(snapshot.get("query_text", {}))
+        self.other_queries, self.other_views, self._other_query_text = queries, views, query_text
+
+    async def flush(self, db):
+        """Write this worker's snapshot and pick up the other workers' latest ones"""
+        await self.load(db)
+        # Forget display texts of queries no longer tracked
+        tracked = set(self.queries.long.counts) | set(self.queries.short.counts)
+        self._query_text = {key: text for key, text in self._query_text.items() if key in tracked}
+        now = time.time()
+        try:
+            await db.search_analytics.replace_one(
+                {"_id": self.worker_id},
+                {
+                    "worker": self.worker_id,
+                    "queries": self.queries.snapshot(),
+                    "views": self.views.snapshot(),
+                    "query_text": self._query_text,
+                    "flushed_at": now,
+                },
+                upsert=True
+            )
+            await db.search_analytics.delete_many({"flushed_at": {"$lt": now - SNAPSHOT_RETENTION_SECONDS}})
+            await self._read_others(db)
+        except Exception as e:
+            logger.error(f"Error flushing search analytics: {str(e)}")
+        self._last_flush = time.monotonic()
+
+    def _schedule_flush(self):
+        if time.monotonic() - self._last_flush < FLUSH_INTERVAL_SECONDS:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._last_flush = time.monotonic()
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_in_background())
+
+    async def _flush_in_background(self):
+        db = await get_database()
+        await self.flush(db)
+
+# Global search analytics instance
+search_analytics = SearchAnalytics()
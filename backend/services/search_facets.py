@@ -0,0 +1,176 @@
+"""
+Search facets
+Facet count pipelines (disjunctive, per filtered result set) and the materialized catalog-wide facet summary
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+from core.attributes import ACCOMMODATION_TIER_FIELD, ACCOMMODATION_TIERS, AMENITY_TAGS_FIELD
+from core.cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
+# Filters that have a facet: each facet's counts ignore that facet's own filter
+FACET_FILTERS = {
+    "countries": "countries",
+    "difficulty_levels": "course_difficulty",
+    "course_types": "course_type",
+    "price_range": "price",
+    "amenities": "amenities",
+    "accommodation_tiers": "accommodation",
+}
+
+# Amenity tags listed in the facet (most common first)
+AMENITY_FACET_LIMIT = 30
+
+DEFAULT_PRICE_RANGE = {"min_price": 0, "max_price": 100000, "avg_price": 25000}
+
+# Other workers' writes don't bump this process's catalog version, so re-read the summary too
+REFRESH_INTERVAL_SECONDS = 60
+
+SUMMARY_ID = "destinations"
+
+def match_all(conditions: Dict[str, Dict], excluded: Optional[str] = None) -> List[Dict]:
+    """A $match stage for every condition except the excluded filter's (none if nothing to match)"""
+    selected = [condition for name, condition in conditions.items() if name != excluded]
+    return [{"$match": {"$and": selected}}] if selected else []
+
+def course_values_stages(field: str) -> List[Dict]:
+    """Count destinations (not courses) per distinct course field value"""
+    return [
+        {"$project": {"value": {"$setUnion": [{"$ifNull": [f"$courses.{field}", []]}, []]}}},
+        {"$unwind": "$value"},
+        {"$group": {"_id": "$value", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+
+# Stages counting each facet over the destinations matched before them
+FACET_STAGES: Dict[str, List[Dict]] = {
+    "countries": [
+        {"$group": {"_id": "$country", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ],
+    "difficulty_levels": course_values_stages("difficulty"),
+    "course_types": course_values_stages("course_type"),
+    "price_range": [
+        {"$group": {
+            "_id": None,
+            "min_price": {"$min": "$price_from"},
+            "max_price": {"$max": "$price_to"},
+            "avg_price": {"$avg": {"$avg": ["$price_from", "$price_to"]}},
+        }},
+    ],
+    "amenities": [
+        {"$unwind": f"${AMENITY_TAGS_FIELD}"},
+        {"$group": {"_id": f"${AMENITY_TAGS_FIELD}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": AMENITY_FACET_LIMIT},
+    ],
+    "accommodation_tiers": [
+        {"$group": {"_id": f"${ACCOMMODATION_TIER_FIELD}", "count": {"$sum": 1}}},
+    ],
+}
+
+def facet_branches(conditions: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    """
+    $facet branches counting each facet over the filtered destinations
+
+    conditions maps filter name -> match condition. Each facet applies every
+    condition except its own (disjunctive faceting), so the sidebar shows how
+    many results each option would give on top of the other active filters.
+    Stages inside $facet can't use indexes: searches run a facet whose own
+    filter is active as a separate query instead (see SearchService).
+    """
+    return {
+        facet: match_all(conditions, FACET_FILTERS[facet]) + stages
+        for facet, stages in FACET_STAGES.items()
+    }
+
+def format_facets(raw: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    """Shape raw $facet output for the API"""
+    def counts(items: List[Dict]) -> List[Dict[str, Any]]:
+        return [{"name": item["_id"], "count": item["count"]} for item in items if item.get("_id")]
+
+    price = (raw.get("price_range") or [{}])[0]
+    price_range = dict(DEFAULT_PRICE_RANGE)
+    if price.get("min_price") is not None:
+        price_range = {key: price.get(key) for key in DEFAULT_PRICE_RANGE}
+
+    tier_counts = {item["_id"]: item["count"] for item in raw.get("accommodation_tiers", [])}
+
+    return {
+        "countries": counts(raw.get("countries", [])),
+        "price_range": price_range,
+        "difficulty_levels": counts(raw.get("difficulty_levels", [])),
+        "course_types": counts(raw.get("course_types", [])),
+        "amenities": counts(raw.get("amenities", [])),
+        "accommodation_tiers": [{"name": tier, "count": tier_counts.get(tier, 0)} for tier in ACCOMMODATION_TIERS],
+    }
+
+class SearchFacetSummary:
+    """
+    Catalog-wide facet counts over published destinations, materialized in search_facets
+
+    Rebuilt with a single $facet aggregation when destinations are written (and
+    on populator runs) rather than on every /search/filters request, and served
+    from memory in between.
+    """
+
+    def __init__(self):
+        self._facets: Optional[Dict[str, Any]] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_current(self) -> bool:
+        return (
+            self._facets is not None
+            and self._version == catalog_cache.version("destinations")
+            and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS
+        )
+
+    async def rebuild(self, db) -> Optional[Dict[str, Any]]:
+        """Recompute the summary and store it (failures are logged, never raised to the writer)"""
+        version = catalog_cache.version("destinations")
+        try:
+            pipeline = [{"$match": {"published": True}}, {"$facet": facet_branches({})}]
+            raw = await db.destinations.aggregate(pipeline).to_list(1)
+            facets = format_facets(raw[0] if raw else {})
+            await db.search_facets.replace_one(
+                {"_id": SUMMARY_ID},
+                {"facets": facets, "generated_at": datetime.now(timezone.utc)},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error rebuilding search facets: {str(e)}")
+            return None
+
+        self._facets = facets
+        self._version = version
+        self._checked_at = time.monotonic()
+        return facets
+
+    async def get(self, db) -> Dict[str, Any]:
+        """Current facet summary, from memory when possible"""
+        if self._is_current():
+            return self._facets
+
+        async with self._lock:
+            if self._is_current():
+                return self._facets
+
+            # Writes in this process rebuild the summary; otherwise pick up another worker's
+            if self._version == catalog_cache.version("destinations"):
+                stored = await db.search_facets.find_one({"_id": SUMMARY_ID})
+                if stored:
+                    self._facets = stored["facets"]
+                    self._checked_at = time.monotonic()
+                    return self._facets
+
+            facets = await self.rebuild(db)
+            return facets if facets is not None else format_facets({})
+
+# Global search facet summary
+search_facet_summary = SearchFacetSummary()
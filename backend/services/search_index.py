@@ -0,0 +1,327 @@
+"""
+In-memory destination search index
+Tokenized inverted index over destination text fields with BM25F scoring, field boosts and phrase matching
+"""
+import asyncio
+import math
+import re
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+import logging
+from core.cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
+# Indexed fields and their boosts (name > highlights > short_desc > long_desc)
+FIELD_BOOSTS: Dict[str, float] = {
+    "name": 3.0,
+    "highlights": 2.0,
+    "short_desc": 1.5,
+    "long_desc": 1.0,
+}
+FIELDS = list(FIELD_BOOSTS)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Score multiplier when the whole query appears as a phrase in some field
+PHRASE_BOOST = 0.5
+
+# Position gap between list items (highlights) so phrases never span two items
+ITEM_POSITION_GAP = 100
+
+# Other workers' writes don't bump this process's catalog version, so poll too
+REFRESH_INTERVAL_SECONDS = 60
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into",
+    "is", "it", "of", "on", "or", "the", "to", "with",
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+def _strip_suffix(token: str) -> str:
+    """Strip one plural or -ing suffix, e.g. courses -> course"""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    if token.endswith("ing") and len(token) > 5:
+        return token[:-3]
+    return token
+
+def stem(token: str) -> str:
+    """
+    Light English stemming: suffixes are stripped until none is left
+
+    Stripping to a fixed point keeps stem() idempotent, so singular and plural
+    forms meet (bookings -> booking -> book, booking -> book).
+    """
+    stripped = _strip_suffix(token)
+    while stripped != token:
+        token, stripped = stripped, _strip_suffix(stripped)
+    return token
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents ("Málaga" -> "malaga")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized, stemmed terms (stopwords removed)"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(normalize_text(text)) if token not in STOPWORDS]
+
+def normalize_query(query: Optional[str]) -> str:
+    """Canonical form of a search query: normalized terms in order, then quoted phrases"""
+    if not query:
+        return ""
+    phrases = [" ".join(tokenize(phrase)) for phrase in PHRASE_PATTERN.findall(query)]
+    parts = tokenize(PHRASE_PATTERN.sub(" ", query)) + [f'"{phrase}"' for phrase in phrases if phrase]
+    return " ".join(parts)
+
+def field_values(doc: Dict, field: str) -> List[str]:
+    """Text values of a field (list fields such as highlights yield one value per item)"""
+    value = doc.get(field)
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)]
+
+class DestinationIndex(ABC):
+    """
+    Base for in-memory indexes over published destinations
+
+    Subclasses implement upsert/remove/clear and list the fields they need. The
+    index refreshes incrementally: on a catalog version bump (or every
+    REFRESH_INTERVAL_SECONDS) it re-reads only documents updated since the last
+    refresh, plus added or removed ids.
+    """
+
+    # Document fields read by upsert (besides id/published/updated_at)
+    fields: List[str] = []
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._watermark: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.indexed_ids())
+
+    @abstractmethod
+    def indexed_ids(self) -> Set[str]:
+        """Ids of the destinations currently indexed"""
+
+    @abstractmethod
+    def upsert(self, doc: Dict):
+        """Index (or re-index) one published destination"""
+
+    @abstractmethod
+    def remove(self, doc_id: str):
+        """Drop one destination from the index"""
+
+    def clear(self):
+        """Drop everything (the next refresh rebuilds from scratch)"""
+        self._version = None
+        self._watermark = None
+
+    async def _after_refresh(self, db):
+        """Hook for data that isn't on destination documents (runs on every refresh)"""
+
+    def _is_current(self) -> bool:
+        return (
+            self._version == catalog_cache.version("destinations")
+            and time.monotonic() - self._checked_at < REFRESH_INTERVAL_SECONDS
+        )
+
+    async def refresh(self, db):
+        """Bring the index up to date with the destinations collection"""
+        if self._is_current():
+            return
+
+        async with self._lock:
+            if self._is_current():
+                return
+
+            version = catalog_cache.version("destinations")
+            started = time.perf_counter()
+            projection = {"_id": 0, "id": 1, "published": 1, "updated_at": 1, **{field: 1 for field in self.fields}}
+            indexed = self.indexed_ids()
+
+            if self._version is None:
+                query = {"published": True}
+            else:
+                # Ids are cheap to list, so detect additions and removals exactly
+                live_ids = {doc["id"] async for doc in db.destinations.find({"published": True}, {"_id": 0, "id": 1})}
+                for doc_id in indexed - live_ids:
+                    self.remove(doc_id)
+
+                conditions = [{"id": {"$in": list(live_ids - indexed)}}]
+                if self._watermark is not None:
+                    conditions.append({"updated_at": {"$gte": self._watermark}})
+                query = {"$or": conditions}
+
+            changed = 0
+            async for doc in db.destinations.find(query, projection):
+                if doc.get("published"):
+                    self.upsert(doc)
+                else:
+                    self.remove(doc["id"])
+                changed += 1
+
+                updated_at = doc.get("updated_at")
+                if isinstance(updated_at, datetime) and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+
+            await self._after_refresh(db)
+
+            self._version = version
+            self._checked_at = time.monotonic()
+            if changed:
+                logger.info(
+                    f"{type(self).__name__} refreshed: {changed} destinations in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms ({self.size} indexed)"
+                )
+
+class DestinationSearchIndex(DestinationIndex):
+    """
+    Inverted index over published destinations
+
+    Postings map term -> doc id -> field -> positions, which is enough for BM25F
+    scoring and phrase checks.
+    """
+
+    fields = FIELDS
+
+    def __init__(self):
+        super().__init__()
+        self._postings: Dict[str, Dict[str, Dict[int, List[int]]]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._field_lengths: Dict[str, List[int]] = {}
+        self._total_lengths: List[int] = [0] * len(FIELDS)
+
+    def indexed_ids(self) -> Set[str]:
+        return set(self._doc_terms)
+
+    def upsert(self, doc: Dict):
+        """Index (or re-index) one destination"""
+        doc_id = doc["id"]
+        self.remove(doc_id)
+
+        terms: Set[str] = set()
+        lengths = [0] * len(FIELDS)
+        for field_index, field in enumerate(FIELDS):
+            position = 0
+            for value in field_values(doc, field):
+                tokens = tokenize(value)
+                for offset, term in enumerate(tokens):
+                    postings = self._postings[term].setdefault(doc_id, {})
+                    postings.setdefault(field_index, []).append(position + offset)
+                    terms.add(term)
+                lengths[field_index] += len(tokens)
+                position += len(tokens) + ITEM_POSITION_GAP
+
+        self._doc_terms[doc_id] = terms
+        self._field_lengths[doc_id] = lengths
+        for field_index, length in enumerate(lengths):
+            self._total_lengths[field_index] += length
+
+    def remove(self, doc_id: str):
+        """Drop a destination from the index"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+        for field_index, length in enumerate(self._field_lengths.pop(doc_id)):
+            self._total_lengths[field_index] -= length
+
+    def clear(self):
+        """Drop everything (the next refresh rebuilds from scratch)"""
+        super().clear()
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._field_lengths.clear()
+        self._total_lengths = [0] * len(FIELDS)
+
+    def _has_phrase(self, doc_id: str, terms: List[str]) -> bool:
+        """Check whether the terms appear consecutively in any single field"""
+        postings = [self._postings.get(term, {}).get(doc_id) for term in terms]
+        if any(field_postings is None for field_postings in postings):
+            return False
+
+        for field_index, starts in postings[0].items():
+            following = [set(field_postings.get(field_index, ())) for field_postings in postings[1:]]
+            for start in starts:
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following)):
+                    return True
+        return False
+
+    def search(self, query: str, candidates: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Score destinations against a query, returns {doc id: score} for every match
+
+        Terms are OR-ed like a Mongo $text search. Quoted phrases must match
+        exactly; an unquoted multi-word query that matches as a phrase scores higher.
+        """
+        required_phrases = [tokenize(phrase) for phrase in PHRASE_PATTERN.findall(query)]
+        required_phrases = [phrase for phrase in required_phrases if phrase]
+        query_terms = tokenize(PHRASE_PATTERN.sub(" ", query)) + [term for phrase in required_phrases for term in phrase]
+        if not query_terms:
+            return {}
+
+        allowed = set(candidates) if candidates is not None else None
+        doc_count = len(self._doc_terms)
+        average_lengths = [max(total / doc_count, 1.0) if doc_count else 1.0 for total in self._total_lengths]
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in dict.fromkeys(query_terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, fields in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+
+                lengths = self._field_lengths[doc_id]
+                weighted_tf = sum(
+                    FIELD_BOOSTS[FIELDS[field_index]] * len(positions)
+                    / (1 - BM25_B + BM25_B * lengths[field_index] / average_lengths[field_index])
+                    for field_index, positions in fields.items()
+                )
+                scores[doc_id] += idf * weighted_tf * (BM25_K1 + 1) / (BM25_K1 + weighted_tf)
+
+        for phrase in required_phrases:
+            scores = {doc_id: score for doc_id, score in scores.items() if self._has_phrase(doc_id, phrase)}
+
+        if len(query_terms) > 1 and not required_phrases:
+            for doc_id in scores:
+                if self._has_phrase(doc_id, query_terms):
+                    scores[doc_id] *= 1 + PHRASE_BOOST
+
+        return dict(scores)
+
+# Global destination search index
+destination_search_index = DestinationSearchIndex()
@@ -2,16 +2,71 @@
 Advanced Search and Filtering Service
 Implements intelligent search with AI-powered recommendations and filtering
 """
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import date, datetime, timezone
 import logging
+from core.attributes import (
+    ACCOMMODATION_TIER_FIELD, ACCOMMODATION_TIERS, AMENITY_TAGS_FIELD, accommodation_tier_name, amenity_tag
+)
+from core.cache import VersionedLRUCache
+from core.geo import GEO_FIELD
+from core.timing import StageLatency, StageTimer
 from core.database import get_database
+from services.personalization import (
+    BUDGET_BOOST, COUNTRY_BOOST, PLAYING_LEVEL_BOOST,
+    DestinationMatrix, PreferenceVector
+)
+from services.search_analytics import search_analytics
+from services.search_facets import (
+    FACET_FILTERS, FACET_STAGES, format_facets, search_facet_summary
+)
+from services.search_index import destination_search_index, normalize_query, normalize_text
+from services.suggest_index import destination_suggest_index
 from ai_service import ai_service
+import asyncio
+import heapq
 import json
 import math
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Weight of the search index (BM25) score in the overall relevance score
+TEXT_SCORE_WEIGHT = 10
+
+# Server-side sort per sort option (id last so pages never overlap)
+SEARCH_SORTS = {
+    'relevance': {"relevance_score": -1, "id": 1},
+    'price_asc': {"price_from": 1, "id": 1},
+    'price_desc': {"price_to": -1, "id": 1},
+    'name_asc': {"name": 1, "id": 1},
+    'newest': {"created_at": -1, "id": 1},
+    'distance': {"distance_km": 1, "id": 1},  # Needs lat/lng ($geoNear)
+}
+
+# Sort options ranked by relevance (and therefore by user preferences)
+RELEVANCE_SORTS = {'relevance'}
+
+# Candidates kept per cached result set; deeper pages query Mongo directly
+SEARCH_RANKING_WINDOW = 1000
+
+# Fields kept per candidate: enough to re-rank without loading documents
+RANKING_FIELDS = ['id', 'relevance_score', 'country', 'price_from', 'price_to', 'highlights', 'distance_km']
+
+# Editorial popular searches: shown until real searches are recorded, and describe matching queries
+CURATED_SEARCHES = [
+    {"query": "Scotland golf", "description": "Classic links courses and whisky"},
+    {"query": "Spain luxury resorts", "description": "Premium resorts with championship courses"},
+    {"query": "Portugal Algarve", "description": "Coastal golf with perfect weather"},
+    {"query": "Turkey all inclusive", "description": "Exceptional value luxury golf"},
+    {"query": "Ireland golf tours", "description": "Scenic golf with cultural experiences"},
+]
+CURATED_BY_KEY = {normalize_query(search["query"]): search for search in CURATED_SEARCHES}
+
+def relevance_order(row: Dict) -> Tuple:
+    """Sort key matching the relevance sort: score descending, then id"""
+    return (-row['relevance_score'], row['id'])
+
 class SearchFilters:
     """Search and filter configuration"""
     
@@ -23,7 +78,7 @@ class SearchFilters:
         ]
         
         self.DIFFICULTY_LEVELS = ['Easy', 'Medium', 'Hard', 'Championship']
-        self.ACCOMMODATION_TYPES = ['Luxury', 'Mid-range', 'Budget']
+        self.ACCOMMODATION_TYPES = ACCOMMODATION_TIERS
         self.COURSE_TYPES = ['Links', 'Parkland', 'Desert', 'Mountain', 'Coastal', 'Highland']
         
         self.SORT_OPTIONS = {
@@ -31,8 +86,8 @@ class SearchFilters:
             'price_asc': 'Price: Low to High',
             'price_desc': 'Price: High to Low',
             'name_asc': 'Name: A to Z',
-            'rating_desc': 'Highest Rated',
-            'newest': 'Newest First'
+            'newest': 'Newest First',
+            'distance': 'Distance'
         }
 
 class SearchRequest:
@@ -78,61 +133,110 @@ class SearchRequest:
         self.lng = lng
         self.radius_km = radius_km
 
+class SearchResultSet:
+    """Ranked, non-personalized candidates for one normalized search request"""
+    
+    def __init__(
+        self,
+        rows: List[Dict],
+        total: int,
+        version: Tuple[int, ...],
+        facets: Optional[Dict[str, Any]] = None
+    ):
+        self.rows: Dict[str, Dict] = {row['id']: row for row in rows}
+        self.ranking: List[str] = [row['id'] for row in rows]
+        self.total = total
+        self.version = version
+        # Disjunctive facet counts for the filtered destinations
+        self.facets = facets or {}
+        # Built on first personalized use (see matrix)
+        self._matrix: Optional[DestinationMatrix] = None
+        self.base_scores: Optional[np.ndarray] = None
+        self.id_order: Optional[np.ndarray] = None
+    
+    @property
+    def matrix(self) -> DestinationMatrix:
+        """Candidates encoded for vectorized personalization (rows in ranking order)"""
+        if self._matrix is None:
+            candidates = [self.rows[doc_id] for doc_id in self.ranking]
+            self._matrix = DestinationMatrix(candidates)
+            self.base_scores = np.array([row['relevance_score'] for row in candidates], dtype=np.float64)
+            self.id_order = np.argsort(np.argsort(np.array(self.ranking)))
+        return self._matrix
+
 class SearchService:
     """Advanced search service with AI integration"""
     
     def __init__(self):
         self.filters = SearchFilters()
-        self.search_cache = {}  # Cache search results
+        # Non-personalized result sets, shared by every user
+        self.search_cache = VersionedLRUCache(["destinations"], max_entries=500, ttl_seconds=300)
+        # Per-user re-rankings of those result sets
+        self.ranking_cache = VersionedLRUCache(["destinations"], max_entries=2000, ttl_seconds=300)
+        # Per-stage latency of search_destinations across requests
+        self.stage_latency = StageLatency()
         
     async def search_destinations(
         self, 
         search_request: SearchRequest,
-        user_profile: Optional[Dict] = None
+        user_profile: Optional[Dict] = None,
+        timer: Optional[StageTimer] = None
     ) -> Dict[str, Any]:
         """
         Advanced destination search with filtering and AI recommendations
+        
+        Stage durations are recorded on the timer (pass one in to read them
+        afterwards, e.g. for a Server-Timing header); callers record the timer
+        in stage_latency once their own stages are done.
         """
         
+        timer = timer or StageTimer()
         try:
             db = await get_database()
             
-            # Build MongoDB query
-            query = await self._build_search_query(search_request)
-            
-            # Execute search
-            destinations = await db.destinations.find(
-                query, 
-                {"_id": 0}
-            ).to_list(1000)  # Get more for better sorting
-            
-            # Apply post-query filtering
-            filtered_destinations = self._apply_post_filters(destinations, search_request)
-            
-            # Calculate relevance scores
-            scored_destinations = await self._calculate_relevance_scores(
-                filtered_destinations, 
-                search_request,
-                user_profile
-            )
-            
-            # Sort results
-            sorted_destinations = self._sort_destinations(scored_destinations, search_request.sort_by)
-            
-            # Paginate results
-            total_count = len(sorted_destinations)
-            start_idx = (search_request.page - 1) * search_request.limit
-            end_idx = start_idx + search_request.limit
-            paginated_results = sorted_destinations[start_idx:end_idx]
+            # Shared, non-personalized ranking for this normalized request (all pages)
+            cache_key = self._normalize_request(search_request)
+            result_set = self.search_cache.get(cache_key)
+            cache_status = "hit"
+            if result_set is None:
+                cache_status = "miss"
+                version = self.search_cache.current_version()
+                result_set = await self._load_result_set(db, search_request, version, timer)
+                self.search_cache.set(cache_key, result_set, version)
+            
+            # Cheap per-user layer: re-rank the shared candidates with preference boosts
+            prefs = user_profile.get('preferences', {}) if user_profile else None
+            ranking = result_set.ranking
+            if prefs is not None and search_request.sort_by in RELEVANCE_SORTS:
+                ranking_key = (cache_key, user_profile.get('user_id'), self._preferences_signature(prefs))
+                ranking = self.ranking_cache.get(ranking_key)
+                if ranking is None:
+                    with timer.stage("rerank"):
+                        ranking = self._rerank(result_set, prefs)
+                    self.ranking_cache.set(ranking_key, ranking, result_set.version)
+            
+            total_count = result_set.total
+            skip = max(search_request.page - 1, 0) * search_request.limit
+            with timer.stage("page"):
+                if skip + search_request.limit <= len(ranking) or len(ranking) == total_count:
+                    page_ids = ranking[skip:skip + search_request.limit]
+                    paginated_results = await self._page_documents(db, result_set, page_ids, prefs)
+                else:
+                    # Deep pages past the cached window go straight to Mongo
+                    paginated_results, total_count = await self._search_page(db, search_request, user_profile)
             
             # Generate AI insights if user profile available
             ai_insights = None
             if user_profile and search_request.query:
-                ai_insights = await self._generate_search_insights(
-                    search_request, 
-                    paginated_results,
-                    user_profile
-                )
+                with timer.stage("insights"):
+                    ai_insights = await self._generate_search_insights(
+                        search_request, 
+                        paginated_results,
+                        user_profile
+                    )
+            
+            with timer.stage("suggestions"):
+                search_suggestions = await self._generate_search_suggestions(search_request)
             
             return {
                 "destinations": paginated_results,
@@ -140,12 +244,14 @@ class SearchService:
                 "page": search_request.page,
                 "total_pages": math.ceil(total_count / search_request.limit),
                 "filters_applied": self._get_applied_filters(search_request),
+                "facets": result_set.facets,
                 "ai_insights": ai_insights,
-                "search_suggestions": await self._generate_search_suggestions(search_request),
+                "search_suggestions": search_suggestions,
                 "search_stats": {
                     "query": search_request.query,
-                    "execution_time_ms": 0,  # TODO: Implement timing
-                    "result_count": total_count
+                    "execution_time_ms": round(timer.total_ms, 2),
+                    "result_count": total_count,
+                    "cache": cache_status
                 }
             }
             
@@ -153,18 +259,257 @@ class SearchService:
             logger.error(f"Search error: {str(e)}")
             raise
     
-    async def _build_search_query(self, search_request: SearchRequest) -> Dict:
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the shared and per-user search caches"""
+        return {
+            "results": self.search_cache.stats(),
+            "rankings": self.ranking_cache.stats()
+        }
+    
+    def _normalize_request(self, search_request: SearchRequest) -> Tuple:
+        """
+        Canonical cache key for the result set of a request
+        
+        Lists are de-duplicated and sorted, and the query is normalized like the
+        search index does (lowercased, stemmed). Page and limit are left out
+        because every page is served from the same cached ranking.
+        """
+        def canonical(values: List[str], lowercase: bool = True) -> Tuple[str, ...]:
+            cleaned = (value.strip().lower() if lowercase else value.strip() for value in values)
+            return tuple(sorted({value for value in cleaned if value}))
+        
+        return (
+            normalize_query(search_request.query),
+            canonical(search_request.countries, lowercase=False),  # Matched exactly
+            search_request.price_min,
+            search_request.price_max,
+            canonical(search_request.accommodation),
+            canonical(search_request.course_difficulty, lowercase=False),
+            canonical(search_request.course_type, lowercase=False),
+            canonical([amenity_tag(amenity) for amenity in search_request.amenities]),
+            search_request.featured_only,
+            search_request.sort_by,
+            search_request.lat,
+            search_request.lng,
+            search_request.radius_km,
+        )
+    
+    def _preferences_signature(self, prefs: Dict) -> Tuple:
+        """The preference values that affect ranking"""
+        return (
+            tuple(sorted(prefs.get('preferred_countries') or [])),
+            prefs.get('budget_min', 0),
+            prefs.get('budget_max', 100000),
+            prefs.get('playing_level', 'Intermediate'),
+        )
+    
+    async def _text_scores(self, db, query: str) -> Dict[str, float]:
+        """
+        Search index scores for a text query
+
+        The index tokenizes and stems the query itself: pass it as typed, not
+        normalize_query()'d, which is only for cache keys.
+        """
+        await destination_search_index.refresh(db)
+        return destination_search_index.search(query)
+    
+    async def _load_result_set(
+        self,
+        db,
+        search_request: SearchRequest,
+        version: Tuple[int, ...],
+        timer: StageTimer
+    ) -> "SearchResultSet":
+        """Run the non-personalized search and keep the ranked candidate rows"""
+        
+        # Match and score the text query in memory instead of a Mongo $text search
+        text_scores = None
+        if search_request.query:
+            with timer.stage("text_match"):
+                text_scores = await self._text_scores(db, search_request.query)
+        
+        with timer.stage("query_build"):
+            # Every filter goes in the leading (indexable) $match of the results and the total
+            conditions = self._filter_conditions(search_request, text_scores)
+            sort = self._search_sort(search_request)
+            query = self._query_from(conditions)
+            
+            # The text score is joined in after the fetch, so a text query ranked by
+            # relevance brings back every match's ranking fields and is cut to the window here
+            ranked_by_text = bool(text_scores) and self._relevance_ordered(search_request)
+            ranked = [{"$addFields": {"relevance_score": self._relevance_score_expression()}}]
+            if not ranked_by_text:
+                ranked += [{"$sort": sort}, {"$limit": SEARCH_RANKING_WINDOW}]
+            ranked.append({"$project": {"_id": 0, **{field: 1 for field in RANKING_FIELDS}}})
+            
+            # Disjunctive facets: a facet whose own filter is active counts over the
+            # other filters only, in its own query; the rest count over the results
+            active_facets = {
+                facet: name for facet, name in FACET_FILTERS.items() if name in conditions
+            }
+            pipeline = self._match_stages(query, search_request) + [
+                {"$facet": {
+                    "total": [{"$count": "count"}],
+                    "ranked": ranked,
+                    **{facet: stages for facet, stages in FACET_STAGES.items() if facet not in active_facets}
+                }}
+            ]
+            facet_pipelines = {
+                facet: self._match_stages(
+                    self._query_from({key: value for key, value in conditions.items() if key != name}),
+                    search_request
+                ) + FACET_STAGES[facet]
+                for facet, name in active_facets.items()
+            }
+        
+        # Results, total and the unfiltered facets in one aggregation, the other facets alongside it
+        with timer.stage("fetch"):
+            facets, *facet_counts = await asyncio.gather(
+                db.destinations.aggregate(pipeline).to_list(1),
+                *(db.destinations.aggregate(stages).to_list(None) for stages in facet_pipelines.values())
+            )
+        facet = facets[0] if facets else {}
+        facet.update(zip(facet_pipelines, facet_counts))
+        
+        total = facet["total"][0]["count"] if facet.get("total") else 0
+        rows = self._with_text_scores(facet.get("ranked", []), text_scores)
+        if ranked_by_text:
+            rows = heapq.nsmallest(SEARCH_RANKING_WINDOW, rows, key=relevance_order)
+        return SearchResultSet(rows, total, version, format_facets(facet))
+    
+    def _rerank(self, result_set: "SearchResultSet", prefs: Dict) -> List[str]:
+        """Order the shared candidates by relevance including the user's preference boosts"""
+        matrix = result_set.matrix
+        scores = result_set.base_scores + matrix.boosts(PreferenceVector(prefs))
+        # Same order as the server-side sort: score descending, then id
+        order = np.lexsort((result_set.id_order, -scores))
+        return [result_set.ranking[row] for row in order]
+    
+    async def _page_documents(
+        self,
+        db,
+        result_set: "SearchResultSet",
+        page_ids: List[str],
+        prefs: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Full documents for one page (one indexed read by id)
+        
+        Result sets keep only ids and ranking fields, so cached searches cost
+        memory per candidate row rather than per full document.
+        """
+        docs = {doc["id"]: doc async for doc in db.destinations.find({"id": {"$in": page_ids}}, {"_id": 0})}
+        
+        boosts = result_set.matrix.boosts(PreferenceVector(prefs)) if prefs is not None else None
+        
+        page = []
+        for doc_id in page_ids:
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
+            row = result_set.rows[doc_id]
+            score = row['relevance_score']
+            if boosts is not None:
+                score += int(boosts[result_set.matrix.rows[doc_id]])
+            result = {**doc, "relevance_score": score}
+            if 'distance_km' in row:
+                result['distance_km'] = row['distance_km']
+            page.append(result)
+        return page
+    
+    async def _search_page(
+        self,
+        db,
+        search_request: SearchRequest,
+        user_profile: Optional[Dict] = None
+    ) -> Tuple[List[Dict], int]:
+        """Fetch one page directly with a single $facet aggregation (uncached)"""
+        text_scores = None
+        if search_request.query:
+            text_scores = await self._text_scores(db, search_request.query)
+        
+        query = await self._build_search_query(search_request, text_scores)
+        if text_scores and self._relevance_ordered(search_request):
+            return await self._text_ranked_page(db, query, search_request, user_profile, text_scores)
+        
+        pipeline = self._build_search_pipeline(query, search_request, user_profile)
+        facets = await db.destinations.aggregate(pipeline).to_list(1)
+        facet = facets[0] if facets else {}
+        
+        total_count = facet["total"][0]["count"] if facet.get("total") else 0
+        return self._with_text_scores(facet.get("page", []), text_scores), total_count
+    
+    async def _text_ranked_page(
+        self,
+        db,
+        query: Dict,
+        search_request: SearchRequest,
+        user_profile: Optional[Dict],
+        text_scores: Dict[str, float]
+    ) -> Tuple[List[Dict], int]:
+        """One page of a text query ranked by relevance: scored on the server, text score joined here"""
+        rows = await db.destinations.aggregate(self._scored_stages(query, search_request, user_profile) + [
+            {"$project": {"_id": 0, **{field: 1 for field in RANKING_FIELDS}}}
+        ]).to_list(None)
+        self._with_text_scores(rows, text_scores)
+        
+        skip = max(search_request.page - 1, 0) * search_request.limit
+        page_rows = heapq.nsmallest(skip + search_request.limit, rows, key=relevance_order)[skip:]
+        docs = {
+            doc["id"]: doc
+            async for doc in db.destinations.find({"id": {"$in": [row["id"] for row in page_rows]}}, {"_id": 0})
+        }
+        
+        page = []
+        for row in page_rows:
+            doc = docs.get(row["id"])
+            if doc is not None:
+                page.append({**doc, **{field: row[field] for field in ("relevance_score", "distance_km") if field in row}})
+        return page, len(rows)
+    
+    def _relevance_ordered(self, search_request: SearchRequest) -> bool:
+        """Whether results are sorted by relevance score (which includes the text score)"""
+        return self._search_sort(search_request) is SEARCH_SORTS['relevance']
+    
+    def _with_text_scores(self, rows: List[Dict], text_scores: Optional[Dict[str, float]]) -> List[Dict]:
+        """Add the text relevance (BM25 from the search index) to the scores computed on the server"""
+        if text_scores:
+            for row in rows:
+                row['relevance_score'] = row.get('relevance_score', 0) + text_scores.get(row['id'], 0) * TEXT_SCORE_WEIGHT
+        return rows
+    
+    async def _build_search_query(
+        self,
+        search_request: SearchRequest,
+        text_scores: Optional[Dict[str, float]] = None
+    ) -> Dict:
         """Build MongoDB query from search parameters"""
         
+        return self._query_from(self._filter_conditions(search_request, text_scores))
+    
+    def _query_from(self, conditions: Dict[str, Dict]) -> Dict:
+        """Query matching published destinations that meet every condition"""
         query = {"published": True}  # Only published destinations
+        if conditions:
+            query["$and"] = list(conditions.values())
+        return query
+    
+    def _filter_conditions(
+        self,
+        search_request: SearchRequest,
+        text_scores: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Dict]:
+        """Match condition per active filter, keyed by filter name (for disjunctive facets)"""
         
-        # Text search
-        if search_request.query:
-            query["$text"] = {"$search": search_request.query}
+        conditions = {}
+        
+        # Text search (already resolved against the search index)
+        if text_scores is not None:
+            conditions["query"] = {"id": {"$in": list(text_scores)}}
         
         # Country filter
         if search_request.countries:
-            query["country"] = {"$in": search_request.countries}
+            conditions["countries"] = {"country": {"$in": search_request.countries}}
         
         # Price range filter
         price_filter = {}
@@ -175,147 +520,141 @@ class SearchService:
         
         if price_filter:
             # Use $or to match either price_from or price_to in range
-            query["$or"] = [
+            conditions["price"] = {"$or": [
                 {"price_from": price_filter},
                 {"price_to": price_filter}
-            ]
+            ]}
         
         # Featured filter
         if search_request.featured_only:
-            query["featured"] = True
+            conditions["featured_only"] = {"featured": True}
         
         # Course difficulty filter
         if search_request.course_difficulty:
-            query["courses.difficulty"] = {"$in": search_request.course_difficulty}
+            conditions["course_difficulty"] = {"courses.difficulty": {"$in": search_request.course_difficulty}}
         
         # Course type filter
         if search_request.course_type:
-            query["courses.course_type"] = {"$in": search_request.course_type}
-        
-        # Location-based search (if coordinates provided)
-        if search_request.lat and search_request.lng and search_request.radius_km:
-            query["location_coordinates"] = {
-                "$geoWithin": {
-                    "$centerSphere": [
-                        [search_request.lng, search_request.lat],
-                        search_request.radius_km / 6378.1  # Earth's radius in km
-                    ]
-                }
-            }
+            conditions["course_type"] = {"courses.course_type": {"$in": search_request.course_type}}
         
-        return query
+        # Amenities and accommodation (any listed value matches the stored, indexed attributes)
+        tags = sorted({amenity_tag(amenity) for amenity in search_request.amenities} - {""})
+        if tags:
+            conditions["amenities"] = {AMENITY_TAGS_FIELD: {"$in": tags}}
+        
+        if search_request.accommodation:
+            tiers = sorted({accommodation_tier_name(acc) for acc in search_request.accommodation} - {None})
+            # Unknown tiers match nothing rather than being ignored
+            conditions["accommodation"] = {ACCOMMODATION_TIER_FIELD: {"$in": tiers}}
+        
+        return conditions
+    
+    def _has_location(self, search_request: SearchRequest) -> bool:
+        return search_request.lat is not None and search_request.lng is not None
     
-    def _apply_post_filters(self, destinations: List[Dict], search_request: SearchRequest) -> List[Dict]:
-        """Apply filters that can't be done in MongoDB query"""
+    def _search_sort(self, search_request: SearchRequest) -> Dict:
+        """Server-side sort for the request (distance needs a location, else relevance)"""
+        if search_request.sort_by == 'distance' and not self._has_location(search_request):
+            return SEARCH_SORTS['relevance']
+        return SEARCH_SORTS.get(search_request.sort_by, SEARCH_SORTS['relevance'])
+    
+    def _match_stages(self, query: Dict, search_request: SearchRequest) -> List[Dict]:
+        """
+        First stages of every search pipeline
         
-        filtered = destinations[:]
+        With a location this is an indexed $geoNear on the 2dsphere GeoJSON field,
+        which applies the query, the optional radius and adds distance_km.
+        """
+        if not self._has_location(search_request):
+            return [{"$match": query}]
+        
+        geo_near = {
+            "near": {"type": "Point", "coordinates": [search_request.lng, search_request.lat]},
+            "key": GEO_FIELD,
+            "distanceField": "distance_km",
+            "distanceMultiplier": 0.001,  # Metres to km
+            "spherical": True,
+            "query": query
+        }
+        if search_request.radius_km:
+            geo_near["maxDistance"] = search_request.radius_km * 1000
         
-        # Amenities filter
-        if search_request.amenities:
-            filtered = [
-                dest for dest in filtered
-                if dest.get('amenities') and any(
-                    amenity.lower() in str(dest['amenities']).lower()
-                    for amenity in search_request.amenities
-                )
-            ]
+        return [
+            {"$geoNear": geo_near},
+            {"$addFields": {"distance_km": {"$round": ["$distance_km", 2]}}}
+        ]
+    
+    def _relevance_score_expression(self, user_profile: Optional[Dict] = None) -> Dict:
+        """Relevance formula as an aggregation expression (without the text score, joined in after the fetch)"""
         
-        # Accommodation filter
-        if search_request.accommodation:
-            # This would filter based on available packages/hotels
-            # For now, we'll use a simple keyword match
-            filtered = [
-                dest for dest in filtered
-                if any(
-                    acc.lower() in dest.get('long_desc', '').lower()
-                    for acc in search_request.accommodation
-                )
-            ]
+        boosts: List[Any] = [
+            # Featured destinations boost
+            {"$cond": [{"$eq": ["$featured", True]}, 25, 0]},
+            # Quality indicators
+            {"$cond": [{"$gt": [{"$size": {"$ifNull": ["$images", []]}}, 3]}, 5, 0]},
+            {"$cond": [{"$gt": [{"$size": {"$ifNull": ["$packages", []]}}, 0]}, 10, 0]},
+        ]
         
-        return filtered
+        # User preference matching
+        if user_profile:
+            prefs = user_profile.get('preferences', {})
+            
+            # Country preference
+            boosts.append({"$cond": [{"$in": ["$country", prefs.get('preferred_countries', [])]}, COUNTRY_BOOST, 0]})
+            
+            # Budget matching
+            budget_min = prefs.get('budget_min', 0)
+            budget_max = prefs.get('budget_max', 100000)
+            price_avg = {"$avg": [{"$ifNull": ["$price_from", 0]}, {"$ifNull": ["$price_to", 0]}]}
+            boosts.append({"$cond": [
+                {"$and": [{"$gte": [price_avg, budget_min]}, {"$lte": [price_avg, budget_max]}]},
+                BUDGET_BOOST,
+                0
+            ]})
+            
+            # Playing level matching
+            playing_level = prefs.get('playing_level', 'Intermediate')
+            boosts.append({"$cond": [
+                {"$in": [playing_level, {"$ifNull": ["$highlights", []]}]},
+                PLAYING_LEVEL_BOOST,
+                0
+            ]})
+        
+        return {"$add": boosts}
     
-    async def _calculate_relevance_scores(
-        self, 
-        destinations: List[Dict],
+    def _scored_stages(
+        self,
+        query: Dict,
         search_request: SearchRequest,
         user_profile: Optional[Dict] = None
     ) -> List[Dict]:
-        """Calculate relevance scores for search results"""
-        
-        scored_destinations = []
-        
-        for dest in destinations:
-            score = 0
-            
-            # Text relevance score
-            if search_request.query:
-                query_words = search_request.query.lower().split()
-                text_content = f"{dest.get('name', '')} {dest.get('short_desc', '')} {dest.get('long_desc', '')}".lower()
-                
-                for word in query_words:
-                    if word in text_content:
-                        score += 10
-                    
-                # Boost score for exact matches in name
-                if search_request.query.lower() in dest.get('name', '').lower():
-                    score += 50
-            
-            # User preference matching
-            if user_profile:
-                prefs = user_profile.get('preferences', {})
-                
-                # Country preference
-                if dest.get('country') in prefs.get('preferred_countries', []):
-                    score += 30
-                
-                # Budget matching
-                budget_min = prefs.get('budget_min', 0)
-                budget_max = prefs.get('budget_max', 100000)
-                dest_price_avg = (dest.get('price_from', 0) + dest.get('price_to', 0)) / 2
-                
-                if budget_min <= dest_price_avg <= budget_max:
-                    score += 20
-                
-                # Playing level matching
-                playing_level = prefs.get('playing_level', 'Intermediate')
-                if playing_level in dest.get('highlights', []):
-                    score += 15
-            
-            # Featured destinations boost
-            if dest.get('featured'):
-                score += 25
-            
-            # Quality indicators
-            if dest.get('images') and len(dest['images']) > 3:
-                score += 5
-            
-            if dest.get('packages') and len(dest['packages']) > 0:
-                score += 10
-            
-            # Add score to destination
-            dest['relevance_score'] = score
-            scored_destinations.append(dest)
-        
-        return scored_destinations
-    
-    def _sort_destinations(self, destinations: List[Dict], sort_by: str) -> List[Dict]:
-        """Sort destinations based on sort criteria"""
-        
-        if sort_by == 'relevance':
-            return sorted(destinations, key=lambda x: x.get('relevance_score', 0), reverse=True)
-        elif sort_by == 'price_asc':
-            return sorted(destinations, key=lambda x: x.get('price_from', 0))
-        elif sort_by == 'price_desc':
-            return sorted(destinations, key=lambda x: x.get('price_to', 0), reverse=True)
-        elif sort_by == 'name_asc':
-            return sorted(destinations, key=lambda x: x.get('name', ''))
-        elif sort_by == 'rating_desc':
-            # TODO: Implement rating system
-            return destinations
-        elif sort_by == 'newest':
-            return sorted(destinations, key=lambda x: x.get('created_at', ''), reverse=True)
-        else:
-            return destinations
+        """Match stage(s) plus the relevance score"""
+        return self._match_stages(query, search_request) + [
+            {"$addFields": {"relevance_score": self._relevance_score_expression(user_profile)}}
+        ]
+    
+    def _build_search_pipeline(
+        self,
+        query: Dict,
+        search_request: SearchRequest,
+        user_profile: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Build the aggregation that scores, sorts and pages search results in one round trip"""
+        
+        skip = max(search_request.page - 1, 0) * search_request.limit
+        sort = self._search_sort(search_request)
+        
+        return self._scored_stages(query, search_request, user_profile) + [
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "page": [
+                    {"$sort": sort},
+                    {"$skip": skip},
+                    {"$limit": search_request.limit},
+                    {"$project": {"_id": 0}}
+                ]
+            }}
+        ]
     
     def _get_applied_filters(self, search_request: SearchRequest) -> Dict[str, Any]:
         """Get summary of applied filters"""
@@ -345,6 +684,13 @@ class SearchService:
             
         if search_request.featured_only:
             applied['featured_only'] = True
+        
+        if self._has_location(search_request):
+            applied['location'] = {
+                'lat': search_request.lat,
+                'lng': search_request.lng,
+                'radius_km': search_request.radius_km
+            }
             
         return applied
     
@@ -397,28 +743,17 @@ class SearchService:
                 "golf with spa"
             ]
         else:
-            # Generate suggestions based on current query
-            query_lower = search_request.query.lower()
+            # Related phrases from the catalog (typo-tolerant, most popular first)
+            db = await get_database()
+            await destination_suggest_index.refresh(db)
+            typed = normalize_text(search_request.query).strip()
+            suggestions = [
+                suggestion["text"]
+                for suggestion in destination_suggest_index.suggest(search_request.query, 6)
+                if normalize_text(suggestion["text"]) != typed
+            ]
             
-            if 'spain' in query_lower:
-                suggestions.extend([
-                    "Spain Costa del Sol",
-                    "Spain Mallorca golf",
-                    "Spain luxury resorts"
-                ])
-            elif 'scotland' in query_lower:
-                suggestions.extend([
-                    "Scotland St Andrews",
-                    "Scotland links courses",
-                    "Scotland Highlands golf"
-                ])
-            elif 'luxury' in query_lower:
-                suggestions.extend([
-                    "luxury golf spa resorts",
-                    "5-star golf hotels",
-                    "premium golf packages"
-                ])
-            else:
+            if not suggestions:
                 # Generic suggestions
                 suggestions = [
                     f"{search_request.query} packages",
@@ -433,52 +768,18 @@ class SearchService:
         
         try:
             db = await get_database()
+            facets = await search_facet_summary.get(db)
             
-            # Get country counts
-            country_pipeline = [
-                {"$match": {"published": True}},
-                {"$group": {"_id": "$country", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
-            country_counts = await db.destinations.aggregate(country_pipeline).to_list(None)
-            
-            # Get price ranges
-            price_pipeline = [
-                {"$match": {"published": True}},
-                {"$group": {
-                    "_id": None,
-                    "min_price": {"$min": "$price_from"},
-                    "max_price": {"$max": "$price_to"},
-                    "avg_price": {"$avg": {"$avg": ["$price_from", "$price_to"]}}
-                }}
-            ]
-            price_stats = await db.destinations.aggregate(price_pipeline).to_list(1)
-            
-            # Get course difficulty counts
-            difficulty_pipeline = [
-                {"$match": {"published": True}},
-                {"$unwind": "$courses"},
-                {"$group": {"_id": "$courses.difficulty", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
-            difficulty_counts = await db.destinations.aggregate(difficulty_pipeline).to_list(None)
+            # Known course types first (flagged if any destination has them), then any others found
+            type_counts = {item["name"].lower(): item for item in facets.get("course_types", [])}
+            course_types = [
+                type_counts.pop(course_type.lower(), {"name": course_type, "count": 0})
+                for course_type in self.filters.COURSE_TYPES
+            ] + list(type_counts.values())
             
             return {
-                "countries": [
-                    {"name": item["_id"], "count": item["count"]} 
-                    for item in country_counts
-                ],
-                "price_range": price_stats[0] if price_stats else {
-                    "min_price": 0, "max_price": 100000, "avg_price": 25000
-                },
-                "difficulty_levels": [
-                    {"name": item["_id"], "count": item["count"]} 
-                    for item in difficulty_counts if item["_id"]
-                ],
-                "course_types": [
-                    {"name": course_type, "available": True} 
-                    for course_type in self.filters.COURSE_TYPES
-                ],
+                **facets,
+                "course_types": [{**item, "available": item["count"] > 0} for item in course_types],
                 "sort_options": self.filters.SORT_OPTIONS
             }
             
@@ -505,65 +806,58 @@ class SearchService:
         
         return c * r
     
-    async def get_popular_searches(self) -> List[Dict]:
-        """Get popular search terms and destinations"""
+    async def get_popular_searches(self, limit: int = 5) -> List[Dict]:
+        """Get the most searched queries (from the in-memory search analytics)"""
         
-        # In real implementation, this would analyze search logs
-        # For now, return curated popular searches
-        return [
-            {
-                "query": "Scotland golf",
-                "count": 156,
-                "trend": "up",
-                "description": "Classic links courses and whisky"
-            },
-            {
-                "query": "Spain luxury resorts",
-                "count": 134,
-                "trend": "up", 
-                "description": "Premium resorts with championship courses"
-            },
-            {
-                "query": "Portugal Algarve",
-                "count": 89,
-                "trend": "steady",
-                "description": "Coastal golf with perfect weather"
-            },
-            {
-                "query": "Turkey all inclusive",
-                "count": 67,
-                "trend": "up",
-                "description": "Exceptional value luxury golf"
-            },
-            {
-                "query": "Ireland golf tours",
-                "count": 45,
-                "trend": "down",
-                "description": "Scenic golf with cultural experiences"
-            }
-        ]
+        db = await get_database()
+        await search_analytics.load(db)
+        
+        popular = search_analytics.popular_searches(limit)
+        if not popular:
+            # No search traffic recorded yet: fall back to the editorial picks
+            return [dict(search, count=0, trend="steady") for search in CURATED_SEARCHES[:limit]]
+        
+        for search in popular:
+            curated = CURATED_BY_KEY.get(normalize_query(search["query"]))
+            search.update(curated or {"description": ""})
+        return popular
     
-    async def get_trending_destinations(self) -> List[Dict]:
-        """Get trending golf destinations"""
+    async def get_trending_destinations(self, limit: int = 10) -> List[Dict]:
+        """Get the most viewed destinations right now (from the in-memory search analytics)"""
         
         try:
             db = await get_database()
-            
-            # Get recently added or updated destinations
-            recent_destinations = await db.destinations.find(
-                {"published": True},
-                {"_id": 0}
-            ).sort("updated_at", -1).limit(10).to_list(None)
+            await search_analytics.load(db)
+            
+            # Extra candidates in case some viewed slugs are unpublished or gone
+            trending_views = search_analytics.trending_destinations(limit * 2)
+            if trending_views:
+                slugs = [item["slug"] for item in trending_views]
+                destinations = await db.destinations.find(
+                    {"slug": {"$in": slugs}, "published": True},
+                    {"_id": 0, "id": 1, "slug": 1, "name": 1, "country": 1, "price_from": 1, "images": {"$slice": 1}}
+                ).to_list(None)
+                by_slug = {dest["slug"]: dest for dest in destinations}
+                ranked = [(by_slug[item["slug"]], item) for item in trending_views if item["slug"] in by_slug][:limit]
+            else:
+                # No views recorded yet: recently added or updated destinations
+                recent_destinations = await db.destinations.find(
+                    {"published": True},
+                    {"_id": 0}
+                ).sort("updated_at", -1).limit(limit).to_list(None)
+                ranked = [(dest, {"views": 0, "trend": "steady", "trend_score": 0}) for dest in recent_destinations]
             
             trending = []
-            for dest in recent_destinations:
+            for dest, views in ranked:
                 trending.append({
                     "id": dest["id"],
                     "name": dest["name"],
                     "country": dest["country"],
                     "price_from": dest.get("price_from", 0),
                     "image": dest.get("images", [""])[0] if dest.get("images") else "",
-                    "trend_score": 85  # Mock trend score
+                    "views": views["views"],
+                    "trend": views["trend"],
+                    "trend_score": views["trend_score"]
                 })
             
             return trending
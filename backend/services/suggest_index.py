@@ -0,0 +1,335 @@
+"""
+Search-as-you-type suggestions
+Typo-tolerant prefix matching over destination names, regions, countries, course designers and highlights
+"""
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+from services.search_index import TOKEN_PATTERN, DestinationIndex, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Suggestion kinds and the weight a destination contributes to each
+KIND_WEIGHTS: Dict[str, float] = {
+    "destination": 1.0,
+    "region": 0.8,
+    "country": 0.8,
+    "designer": 0.5,
+    "highlight": 0.3,
+}
+
+# Popularity of a destination: base + featured bonus + log-scaled inquiry count
+FEATURED_POPULARITY = 2.0
+
+# Score multiplier per edit (typo) between the query and a suggestion
+EDIT_PENALTY = 0.4
+
+# Score multiplier when the suggestion starts with the query as typed
+LEADING_MATCH_BOOST = 1.5
+
+DEFAULT_SUGGESTIONS = 8
+
+def words(text: str) -> List[str]:
+    """Lowercased, accent-folded words (no stemming or stopwords: users type prefixes)"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+def max_edits(term: str) -> int:
+    """Typos tolerated for a term of this length ("algrave" -> "algarve" is one transposition)"""
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 7:
+        return 1
+    return 2
+
+class Suggestion:
+    """One suggestable phrase and the popularity of the destinations behind it"""
+    __slots__ = ("text", "kind", "slug", "key", "words", "weight", "sources")
+
+    def __init__(self, text: str, kind: str, slug: Optional[str] = None):
+        self.text = text
+        self.kind = kind
+        self.slug = slug
+        self.words = words(text)
+        self.key = " ".join(self.words)
+        self.weight = 0.0
+        self.sources = 0
+
+    def to_dict(self, score: float) -> Dict[str, Any]:
+        result = {"text": self.text, "type": self.kind, "score": round(score, 3)}
+        if self.slug:
+            result["slug"] = self.slug
+        else:
+            result["destinations"] = self.sources
+        return result
+
+class TrieNode:
+    __slots__ = ("children", "word")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.word: Optional[str] = None
+
+class DestinationSuggestIndex(DestinationIndex):
+    """
+    Prefix trie over the words of every suggestable phrase
+
+    Lookups walk the trie with a bounded Damerau-Levenshtein row, so typos cost
+    a few extra nodes rather than a scan of the vocabulary. Destinations are
+    added and removed one at a time as the catalog changes; shared phrases
+    (countries, regions...) keep the summed popularity of their destinations.
+    """
+
+    fields = ["name", "slug", "region", "country", "courses", "highlights", "featured"]
+
+    def __init__(self):
+        super().__init__()
+        self._root = TrieNode()
+        self._entries: Dict[Tuple[str, str], Suggestion] = {}
+        self._word_entries: Dict[str, Set[Tuple[str, str]]] = {}
+        self._doc_entries: Dict[str, List[Tuple[Tuple[str, str], float]]] = {}
+        self._docs: Dict[str, Dict] = {}
+        self._inquiries: Dict[str, int] = {}
+
+    def indexed_ids(self) -> Set[str]:
+        return set(self._doc_entries)
+
+    def _popularity(self, doc: Dict) -> float:
+        return 1.0 + (FEATURED_POPULARITY if doc.get("featured") else 0.0) + math.log1p(self._inquiries.get(doc["id"], 0))
+
+    def _phrases(self, doc: Dict) -> List[Suggestion]:
+        phrases = []
+        if doc.get("name"):
+            phrases.append(Suggestion(doc["name"], "destination", doc.get("slug")))
+        for kind in ("region", "country"):
+            if doc.get(kind):
+                phrases.append(Suggestion(doc[kind], kind))
+        for course in doc.get("courses") or []:
+            if isinstance(course, dict) and course.get("designer"):
+                phrases.append(Suggestion(course["designer"], "designer"))
+        for highlight in doc.get("highlights") or []:
+            phrases.append(Suggestion(highlight, "highlight"))
+        return [phrase for phrase in phrases if phrase.key]
+
+    def upsert(self, doc: Dict):
+        """Add (or re-add) the phrases of one destination"""
+        doc_id = doc["id"]
+        self.remove(doc_id)
+        self._docs[doc_id] = doc
+
+        popularity = self._popularity(doc)
+        contributions = []
+        seen = set()
+        for phrase in self._phrases(doc):
+            # Destinations are suggested individually; other phrases are shared
+            entry_id = (phrase.kind, doc_id if phrase.kind == "destination" else phrase.key)
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                entry = self._entries[entry_id] = phrase
+                for word in entry.words:
+                    self._add_word(word, entry_id)
+            weight = popularity * KIND_WEIGHTS[phrase.kind]
+            entry.weight += weight
+            entry.sources += 1
+            contributions.append((entry_id, weight))
+
+        self._doc_entries[doc_id] = contributions
+
+    def remove(self, doc_id: str):
+        """Withdraw one destination's contribution to its phrases"""
+        contributions = self._doc_entries.pop(doc_id, None)
+        self._docs.pop(doc_id, None)
+        if contributions is None:
+            return
+
+        for entry_id, weight in contributions:
+            entry = self._entries[entry_id]
+            entry.weight -= weight
+            entry.sources -= 1
+            if entry.sources <= 0:
+                del self._entries[entry_id]
+                for word in entry.words:
+                    self._remove_word(word, entry_id)
+
+    def clear(self):
+        """Drop everything (the next refresh rebuilds from scratch)"""
+        super().clear()
+        self._root = TrieNode()
+        self._entries.clear()
+        self._word_entries.clear()
+        self._doc_entries.clear()
+        self._docs.clear()
+
+    def _add_word(self, word: str, entry_id: Tuple[str, str]):
+        entries = self._word_entries.get(word)
+        if entries is None:
+            entries = self._word_entries[word] = set()
+            node = self._root
+            for char in word:
+                node = node.children.setdefault(char, TrieNode())
+            node.word = word
+        entries.add(entry_id)
+
+    def _remove_word(self, word: str, entry_id: Tuple[str, str]):
+        entries = self._word_entries.get(word)
+        if entries is None:
+            return
+        entries.discard(entry_id)
+        if entries:
+            return
+
+        del self._word_entries[word]
+        # Unlink the word and prune branches left empty
+        path = [self._root]
+        for char in word:
+            path.append(path[-1].children[char])
+        path[-1].word = None
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            if node.children or node.word:
+                break
+            del path[depth - 1].children[word[depth - 1]]
+
+    async def _after_refresh(self, db):
+        """Reload inquiry counts (popularity) and re-weigh destinations whose count changed"""
+        counts: Dict[str, int] = {}
+        pipeline = [
+            {"$match": {"destination_id": {"$ne": None}}},
+            {"$group": {"_id": "$destination_id", "count": {"$sum": 1}}}
+        ]
+        async for row in db.inquiries.aggregate(pipeline):
+            counts[row["_id"]] = row["count"]
+
+        changed = [doc_id for doc_id in self._docs if counts.get(doc_id, 0) != self._inquiries.get(doc_id, 0)]
+        self._inquiries = counts
+        for doc_id in changed:
+            self.upsert(self._docs[doc_id])
+
+    def _match_words(self, term: str, prefix: bool, limit: int) -> Dict[str, int]:
+        """Indexed words within `limit` edits of the term (of a prefix of the word, if prefix) -> edits"""
+        matches: Dict[str, int] = {}
+        length = len(term)
+
+        def collect(node: TrieNode, edits: int):
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current.word is not None and edits < matches.get(current.word, limit + 1):
+                    matches[current.word] = edits
+                stack.extend(current.children.values())
+
+        # Cells farther than `limit` from the diagonal can't lead to a match (Ukkonen's band)
+        too_far = limit + 1
+
+        def walk(
+            node: TrieNode,
+            char: str,
+            prev_char: Optional[str],
+            row: List[int],
+            prev_row: Optional[List[int]],
+            depth: int,
+            collected: int
+        ):
+            current = [too_far] * (length + 1)
+            current[0] = depth if depth <= limit else too_far
+            lowest = current[0]
+            for j in range(max(1, depth - limit), min(length, depth + limit) + 1):
+                value = row[j - 1] if term[j - 1] == char else row[j - 1] + 1
+                if row[j] + 1 < value:
+                    value = row[j] + 1
+                if current[j - 1] + 1 < value:
+                    value = current[j - 1] + 1
+                # Adjacent transposition counts as one edit
+                if prev_row is not None and j > 1 and char == term[j - 2] and prev_char == term[j - 1]:
+                    if prev_row[j - 2] + 1 < value:
+                        value = prev_row[j - 2] + 1
+                if value > too_far:
+                    value = too_far
+                current[j] = value
+                if value < lowest:
+                    lowest = value
+
+            edits = current[length]
+            if prefix:
+                # A subtree is collected once, unless a deeper prefix matches with fewer edits
+                if edits < collected:
+                    collect(node, edits)
+                    collected = edits
+                if collected == 0:
+                    return
+            elif edits <= limit and node.word is not None:
+                matches[node.word] = min(edits, matches.get(node.word, edits))
+
+            if lowest < (collected if prefix else too_far):
+                for next_char, child in node.children.items():
+                    walk(child, next_char, char, current, row, depth + 1, collected)
+
+        first_row = [min(j, too_far) for j in range(length + 1)]
+        for char, child in self._root.children.items():
+            walk(child, char, None, first_row, None, 1, too_far)
+        return matches
+
+    def _candidates(self, terms: List[str], last_is_prefix: bool, allowed: int) -> Dict[Tuple[str, str], int]:
+        """Entries matching every term with at most `allowed` edits per term -> total edits"""
+        candidates: Optional[Dict[Tuple[str, str], int]] = None
+        for position, term in enumerate(terms):
+            prefix = last_is_prefix and position == len(terms) - 1
+            edits_by_entry: Dict[Tuple[str, str], int] = {}
+            for word, edits in self._match_words(term, prefix, min(allowed, max_edits(term))).items():
+                for entry_id in self._word_entries.get(word, ()):
+                    if edits < edits_by_entry.get(entry_id, edits + 1):
+                        edits_by_entry[entry_id] = edits
+
+            if candidates is None:
+                candidates = edits_by_entry
+            else:
+                candidates = {
+                    entry_id: edits + edits_by_entry[entry_id]
+                    for entry_id, edits in candidates.items()
+                    if entry_id in edits_by_entry
+                }
+            if not candidates:
+                return {}
+        return candidates or {}
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Dict[str, Any]]:
+        """
+        Best suggestions for a partially typed query
+
+        Every typed word must match a word of the suggestion (the last one as a
+        prefix, unless followed by a space), allowing for typos. Ranked by
+        popularity, discounted per typo.
+        """
+        terms = words(query)
+        if not terms:
+            return []
+
+        # Exact matching first; typo tolerance only kicks in when that finds nothing,
+        # which keeps the common keystroke to a single cheap trie descent
+        last_is_prefix = not query[-1:].isspace()
+        candidates: Dict[Tuple[str, str], int] = {}
+        for allowed in range(max(max_edits(term) for term in terms) + 1):
+            candidates = self._candidates(terms, last_is_prefix, allowed)
+            if candidates:
+                break
+        if not candidates:
+            return []
+
+        typed = " ".join(terms)
+
+        def score(entry_id: Tuple[str, str]) -> float:
+            entry = self._entries[entry_id]
+            value = entry.weight * EDIT_PENALTY ** candidates[entry_id]
+            if entry.key.startswith(typed):
+                value *= LEADING_MATCH_BOOST
+            return value
+
+        best = heapq.nlargest(limit, candidates, key=score)
+        return [self._entries[entry_id].to_dict(score(entry_id)) for entry_id in best]
+
+# Global destination suggest index
+destination_suggest_index = DestinationSuggestIndex()
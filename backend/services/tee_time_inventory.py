@@ -0,0 +1,270 @@
+"""
+Tee-time inventory
+Remaining capacity per tee time, one document per destination, course and day, reserved with atomic conditional updates
+"""
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone, date, time, timedelta
+import logging
+from pymongo.errors import DuplicateKeyError
+from models.booking_models import BookingStatus
+
+logger = logging.getLogger(__name__)
+
+# Tee sheet: every 15 minutes from 07:00, last tee time 17:45, a foursome each
+FIRST_TEE_TIME = time(7, 0)
+LAST_TEE_END = time(18, 0)
+SLOT_MINUTES = 15
+SLOT_CAPACITY = 4
+SLOT_COUNT = (
+    (LAST_TEE_END.hour * 60 + LAST_TEE_END.minute) - (FIRST_TEE_TIME.hour * 60 + FIRST_TEE_TIME.minute)
+) // SLOT_MINUTES
+
+# Booking statuses that hold tee-time capacity
+HOLDING_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.PENDING]
+
+def slot_index(tee_time: time) -> Optional[int]:
+    """Position of a tee time on the sheet, None if it isn't one"""
+    minutes = (tee_time.hour * 60 + tee_time.minute) - (FIRST_TEE_TIME.hour * 60 + FIRST_TEE_TIME.minute)
+    if tee_time.second or tee_time.microsecond or minutes < 0 or minutes % SLOT_MINUTES:
+        return None
+    index = minutes // SLOT_MINUTES
+    return index if index < SLOT_COUNT else None
+
+def slot_time(index: int) -> time:
+    """Tee time at a position on the sheet"""
+    return (datetime.combine(date.min, FIRST_TEE_TIME) + timedelta(minutes=index * SLOT_MINUTES)).time()
+
+# Destination fields course names are resolved from
+COURSES_PROJECTION = {"courses.course_name": 1}
+
+def course_names(destination: Dict) -> List[str]:
+    """Bookable courses of a destination, main course first"""
+    courses = destination.get('courses') or []
+    names = [course['course_name'] for course in courses if isinstance(course, dict) and course.get('course_name')]
+    return names or ['Main Course' if courses else 'Golf Course']
+
+def default_course_name(destination: Dict) -> str:
+    """Course name used when a booking or request doesn't name one"""
+    return course_names(destination)[0]
+
+def resolve_course_name(destination: Dict, course_name: Optional[str]) -> str:
+    """The requested course (the main course if none); ValueError if the destination doesn't have it"""
+    if not course_name:
+        return default_course_name(destination)
+    if course_name not in course_names(destination):
+        raise ValueError(f"Course {course_name} not found at {destination.get('name') or destination.get('id')}")
+    return course_name
+
+def inventory_id(destination_id: str, course_name: str, day: date) -> str:
+    return f"{destination_id}|{course_name}|{day.isoformat()}"
+
+class TeeTimeInventory:
+    """
+    Remaining players per tee time in tee_time_inventory
+
+    Each document holds a `remaining` array (one entry per slot on the sheet).
+    Reading availability is a point read by _id; a reservation is a single
+    update that decrements a slot only if it still has room, so concurrent
+    bookings can't oversell it. Documents are created on first use, seeded
+    from any bookings made before the inventory existed.
+    """
+
+    async def get_or_create(self, db, destination_id: str, course_name: str, day: date) -> Dict:
+        """The inventory document for a destination, course and day"""
+        doc_id = inventory_id(destination_id, course_name, day)
+        doc = await db.tee_time_inventory.find_one({"_id": doc_id})
+        if doc:
+            return doc
+
+        booked = await self._booked_players(db, destination_id, course_name, day, day)
+        remaining = self._seed_remaining(booked.get(day.isoformat(), {}))
+
+        doc = {
+            "_id": doc_id,
+            "destination_id": destination_id,
+            "course_name": course_name,
+            "date": day.isoformat(),
+            "remaining": remaining,
+            "updated_at": datetime.now(timezone.utc)
+        }
+        try:
+            await db.tee_time_inventory.insert_one(doc)
+        except DuplicateKeyError:
+            # Created concurrently: the stored document wins
+            doc = await db.tee_time_inventory.find_one({"_id": doc_id})
+        return doc
+
+    async def remaining_by_day(
+        self,
+        db,
+        destination_id: str,
+        course_name: str,
+        first_day: date,
+        last_day: date
+    ) -> Dict[str, List[int]]:
+        """
+        Remaining capacity per day (ISO date -> per-slot list) over a date range
+
+        One range read of the inventory; days without a document yet are worked
+        out from one range read of the bookings, without creating documents.
+        """
+        remaining: Dict[str, List[int]] = {}
+        async for doc in db.tee_time_inventory.find(
+            {
+                "destination_id": destination_id,
+                "course_name": course_name,
+                "date": {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()}
+            },
+            {"_id": 0, "date": 1, "remaining": 1}
+        ):
+            remaining[doc["date"]] = doc["remaining"]
+
+        days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+        if any(day.isoformat() not in remaining for day in days):
+            booked = await self._booked_players(db, destination_id, course_name, first_day, last_day)
+            for day in days:
+                if day.isoformat() not in remaining:
+                    remaining[day.isoformat()] = self._seed_remaining(booked.get(day.isoformat(), {}))
+        return remaining
+
+    def _seed_remaining(self, booked: Dict[int, int]) -> List[int]:
+        remaining = [SLOT_CAPACITY] * SLOT_COUNT
+        for index, players in booked.items():
+            remaining[index] = max(0, remaining[index] - players)
+        return remaining
+
+    async def _booked_players(
+        self,
+        db,
+        destination_id: str,
+        course_name: str,
+        first_day: date,
+        last_day: date
+    ) -> Dict[str, Dict[int, int]]:
+        """Players per day and slot in existing bookings (for days without an inventory document)"""
+        date_range = {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()}
+        bookings = await db.bookings.find({
+            "items": {"$elemMatch": {"destination_id": destination_id, "date": date_range}},
+            "status": {"$in": HOLDING_STATUSES}
+        }, {"_id": 0, "items": 1}).to_list(None)
+
+        destination = await db.destinations.find_one({"id": destination_id}, {"_id": 0, **COURSES_PROJECTION})
+        default_course = default_course_name(destination or {})
+
+        booked: Dict[str, Dict[int, int]] = {}
+        for booking in bookings:
+            for item in booking.get('items', []):
+                if item['destination_id'] != destination_id:
+                    continue
+                if not date_range["$gte"] <= item['date'] <= date_range["$lte"]:
+                    continue
+                if (item.get('course_name') or default_course) != course_name:
+                    continue
+                index = slot_index(time.fromisoformat(item['time']))
+                if index is not None:
+                    day = booked.setdefault(item['date'], {})
+                    day[index] = day.get(index, 0) + len(item.get('players', []))
+        return booked
+
+    async def reserve_day(self, db, destination_id: str, course_name: str, day: date, slots: Dict[int, int]) -> bool:
+        """
+        Take places at several tee times of one day (slot index -> players) in one update
+
+        The update only matches if every slot still has room, so it takes all
+        of them or none.
+        """
+        await self.get_or_create(db, destination_id, course_name, day)
+        conditions = {f"remaining.{index}": {"$gte": players} for index, players in slots.items()}
+        result = await db.tee_time_inventory.update_one(
+            {"_id": inventory_id(destination_id, course_name, day), **conditions},
+            {
+                "$inc": {f"remaining.{index}": -players for index, players in slots.items()},
+                "$set": {"updated_at": datetime.now(timezone.utc)}
+            }
+        )
+        return result.modified_count == 1
+
+    async def release_day(self, db, destination_id: str, course_name: str, day: date, slots: Dict[int, int]):
+        """Give back places taken by reserve_day()"""
+        await db.tee_time_inventory.update_one(
+            {"_id": inventory_id(destination_id, course_name, day)},
+            {
+                "$inc": {f"remaining.{index}": players for index, players in slots.items()},
+                "$set": {"updated_at": datetime.now(timezone.utc)}
+            }
+        )
+
+    def _group_by_day(
+        self,
+        reservations: Sequence[Tuple[str, str, date, time, int]],
+        skip_invalid: bool = False
+    ) -> Tuple[Dict[Tuple[str, str, date], Dict[int, int]], Dict[Tuple[str, str, date], int], Optional[int]]:
+        """
+        Players per slot for each (destination, course, day), the position of each
+        day's first reservation, and the position of the first invalid one (if any)
+
+        Grouping stops at the first invalid reservation (off the tee sheet or
+        without players) unless skip_invalid is set, in which case those are
+        left out and the rest are still grouped.
+        """
+        days: Dict[Tuple[str, str, date], Dict[int, int]] = {}
+        first_positions: Dict[Tuple[str, str, date], int] = {}
+        for position, (destination_id, course_name, day, tee_time, players) in enumerate(reservations):
+            index = slot_index(tee_time)
+            if index is None or players <= 0:
+                if skip_invalid:
+                    continue
+                return days, first_positions, position
+            key = (destination_id, course_name, day)
+            slots = days.setdefault(key, {})
+            slots[index] = slots.get(index, 0) + players
+            first_positions.setdefault(key, position)
+        return days, first_positions, None
+
+    async def reserve_all(self, db, reservations: Sequence[Tuple[str, str, date, time, int]]) -> Optional[int]:
+        """
+        Reserve several tee times (destination, course, date, time, players), all or nothing
+
+        Reservations are grouped per inventory document: each day is one atomic
+        update, and the days are reserved concurrently. Returns None on success,
+        or the position of a reservation that had no room (after giving back the
+        days already taken).
+        """
+        days, first_positions, invalid = self._group_by_day(reservations)
+        if invalid is not None:
+            return invalid
+
+        keys = list(days)
+        taken = await asyncio.gather(*(self.reserve_day(db, *key, days[key]) for key in keys))
+        if all(taken):
+            return None
+
+        await asyncio.gather(*(self.release_day(db, *key, days[key]) for key, ok in zip(keys, taken) if ok))
+        failed = min((key for key, ok in zip(keys, taken) if not ok), key=first_positions.get)
+        return await self._short_position(db, reservations, failed, days[failed], first_positions[failed])
+
+    async def _short_position(
+        self,
+        db,
+        reservations: Sequence[Tuple[str, str, date, time, int]],
+        key: Tuple[str, str, date],
+        slots: Dict[int, int],
+        default: int
+    ) -> int:
+        """Position of the first reservation of a failed day whose tee time has no room left"""
+        doc = await db.tee_time_inventory.find_one({"_id": inventory_id(*key)}, {"_id": 0, "remaining": 1})
+        remaining = (doc or {}).get("remaining") or []
+        for position, (destination_id, course_name, day, tee_time, _) in enumerate(reservations):
+            index = slot_index(tee_time)
+            if (destination_id, course_name, day) == key and index < len(remaining) and remaining[index] < slots[index]:
+                return position
+        return default
+
+    async def release_all(self, db, reservations: Sequence[Tuple[str, str, date, time, int]]):
+        """Give back tee times taken by reserve_all(), skipping reservations it could not have taken"""
+        days, _, _ = self._group_by_day(reservations, skip_invalid=True)
+        await asyncio.gather(*(self.release_day(db, *key, slots) for key, slots in days.items()))
+
+# Global tee-time inventory
+tee_time_inventory = TeeTimeInventory()
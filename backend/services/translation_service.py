@@ -2,6 +2,7 @@
 Internationalization (i18n) Service
 Handles Swedish language support and localization
 """
+import hashlib
 import json
 from typing import Dict, Any, Optional
 from enum import Enum
@@ -17,6 +18,10 @@ class TranslationService:
     def __init__(self):
         self.translations = self._load_translations()
         self.default_language = Language.ENGLISH
+        # Changes only when a deploy changes the tables, for ETags of translation responses
+        self.content_hash = hashlib.sha1(
+            json.dumps(self.translations, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
         
     def _load_translations(self) -> Dict[str, Dict[str, str]]:
         """Load translation dictionaries"""
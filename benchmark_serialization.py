@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-item cost of serializing a 1000-destination list
+
+Compares the validated path (response_model style: build each model, dump it,
+encode with json) against the trusted-read path used by the catalog endpoints
+(model_construct + cached TypeAdapter dump straight to JSON bytes).
+
+Usage: python benchmark_serialization.py [--items 1000] [--rounds 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+
+from server import Destination  # noqa: E402
+from core.serialization import dump_trusted_list  # noqa: E402
+
+def make_destination(index: int) -> dict:
+    """Build a destination document as the API stores it (dumped through the model)"""
+    now = datetime.now(timezone.utc)
+    doc = {
+        "id": str(uuid.uuid4()),
+        "name": f"Golf Resort {index}",
+        "slug": f"golf-resort-{index}",
+        "country": ["Spain", "Portugal", "Scotland", "Ireland"][index % 4],
+        "region": "Costa del Sol",
+        "short_desc": "Championship golf with sea views and year-round sunshine.",
+        "long_desc": "A long description of the resort, its courses and its surroundings. " * 20,
+        "destination_type": "golf_resort",
+        "price_from": 8995 + index,
+        "price_to": 15995 + index,
+        "currency": "SEK",
+        "images": [f"https://images.example.com/resort-{index}-{n}.jpg" for n in range(6)],
+        "highlights": ["18-hole championship course", "Spa", "Beach access", "Driving range"],
+        "courses": [
+            {"par": 72, "holes": 18, "length_meters": 6200, "difficulty": "Hard", "designer": "Robert Trent Jones"}
+            for _ in range(2)
+        ],
+        "amenities": {"spa": True, "restaurants": 3, "pools": 2, "gym": True, "additional": ["Padel", "Tennis"]},
+        "packages": [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"{nights} nights with unlimited golf",
+                "duration_nights": nights,
+                "duration_days": nights + 1,
+                "price": 8995 + nights * 1000,
+                "inclusions": ["Flights", "Hotel", "Green fees", "Transfers"],
+            }
+            for nights in (3, 5, 7)
+        ],
+        "location_coordinates": {"lat": 36.5 + index / 1000, "lng": -4.9},
+        "climate": "Mediterranean climate with over 300 sunny days per year",
+        "best_time_to_visit": "March to November",
+        "featured": index % 10 == 0,
+        "published": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+    return Destination(**doc).model_dump()
+
+def validated_path(docs: list) -> bytes:
+    """What a response_model route does: validate every document, dump and encode"""
+    content = [Destination(**doc).model_dump(mode="json") for doc in docs]
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def trusted_path(docs: list) -> bytes:
+    """Trusted read: construct without validation and dump to bytes in one pass"""
+    return dump_trusted_list(Destination, docs)
+
+def measure(label: str, func, docs: list, rounds: int) -> float:
+    func(docs)  # Warm up (builds and caches the TypeAdapter)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        body = func(docs)
+    elapsed = (time.perf_counter() - start) / rounds
+    per_item = elapsed / len(docs) * 1_000_000
+    print(f"  {label:<28} {elapsed * 1000:8.2f} ms/list  {per_item:7.2f} µs/item  {len(body) / 1024:7.1f} KiB")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = [make_destination(i) for i in range(args.items)]
+
+    # Both paths must produce the same JSON
+    assert json.loads(validated_path(docs)) == json.loads(trusted_path(docs))
+
+    print(f"⏱️  Serializing {args.items} destinations ({args.rounds} rounds):")
+    before = measure("validated (response_model)", validated_path, docs, args.rounds)
+    after = measure("trusted (construct + dump)", trusted_path, docs, args.rounds)
+    print(f"🚀 Speedup: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main()
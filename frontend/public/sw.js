@@ -2,6 +2,7 @@
 // Enhanced for browser compatibility (Vivaldi, Samsung Internet, Chrome, Safari)
 
 const CACHE_NAME = 'golf-guy-v2.1.0';
+const API_CACHE_NAME = 'golf-guy-api-v1';
 const OFFLINE_URL = '/offline.html';
 
 // Critical assets for PWA functionality
@@ -59,7 +60,7 @@ self.addEventListener('activate', (event) => {
     caches.keys().then((cacheNames) => {
       return Promise.all(
         cacheNames
-          .filter((name) => name !== CACHE_NAME)
+          .filter((name) => name !== CACHE_NAME && name !== API_CACHE_NAME)
           .map((name) => {
             console.log('[Golf Guy SW] Deleting old cache:', name);
             return caches.delete(name);
@@ -86,6 +87,11 @@ self.addEventListener('fetch', (event) => {
 async function handleRequest(request) {
   const url = new URL(request.url);
   
+  // Public API reads are revalidated with their ETag instead of served cache-first
+  if (url.pathname.startsWith('/api/') && !request.headers.has('Authorization')) {
+    return revalidateApiRequest(request);
+  }
+  
   // For navigation requests, try network first, then cache, then offline page
   if (request.mode === 'navigate') {
     try {
@@ -132,6 +138,34 @@ async function handleRequest(request) {
   }
 }
 
+// Conditional GET against the API: a 304 reuses the cached body, offline falls back to it
+async function revalidateApiRequest(request) {
+  const cache = await caches.open(API_CACHE_NAME);
+  const cachedResponse = await cache.match(request);
+  const etag = cachedResponse && cachedResponse.headers.get('ETag');
+  
+  const headers = new Headers(request.headers);
+  if (etag) {
+    headers.set('If-None-Match', etag);
+  }
+  
+  try {
+    const response = await fetch(new Request(request, { headers }));
+    if (response.status === 304 && cachedResponse) {
+      return cachedResponse;
+    }
+    if (response.status === 200 && response.headers.get('ETag')) {
+      await cache.put(request, response.clone());
+    }
+    return response;
+  } catch (error) {
+    if (cachedResponse) {
+      return cachedResponse;
+    }
+    return new Response('Offline', { status: 503 });
+  }
+}
+
 // Enhanced PWA install criteria checking
 self.addEventListener('message', (event) => {
   console.log('[Golf Guy SW] Received message:', event.data);
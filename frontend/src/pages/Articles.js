@@ -28,7 +28,7 @@ export default function Articles() {
 
   const loadArticles = async () => {
     try {
-      const response = await axios.get(`${API}/articles?published=true`);
+      const response = await axios.get(`${API}/articles?published=true&fields=card`);
       setArticles(response.data);
       
       // Extract unique categories
@@ -43,8 +43,8 @@ export default function Destinations() {
       const countryParam = searchParams.get('country');
       
       const url = countryParam 
-        ? `${API}/destinations?country=${countryParam}&published=true`
-        : `${API}/destinations?published=true`;
+        ? `${API}/destinations?country=${countryParam}&published=true&fields=card`
+        : `${API}/destinations?published=true&fields=card`;
       
       const response = await axios.get(url);
       setDestinations(response.data);
@@ -61,7 +61,7 @@ export default function Destinations() {
         setCountries(uniqueCountries);
       } else {
         // Still need to fetch country list for dropdown
-        const allResponse = await axios.get(`${API}/destinations?published=true`);
+        const allResponse = await axios.get(`${API}/destinations?published=true&fields=country`);
         const uniqueCountries = [...new Set(allResponse.data.map(d => d.country))];
         setCountries(uniqueCountries);
       }
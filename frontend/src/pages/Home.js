@@ -37,20 +37,16 @@ export default function Home() {
 
   const loadHomeData = async () => {
     try {
-      const [heroRes, destRes, articlesRes, partnersRes, testimonialsRes, instagramRes] = await Promise.all([
-        axios.get(`${API}/hero`),
-        axios.get(`${API}/destinations?featured=true&published=true`),
-        axios.get(`${API}/articles?featured=true&published=true`),
-        axios.get(`${API}/partners?active=true`),
-        axios.get(`${API}/testimonials?published=true`),
+      const [homeRes, instagramRes] = await Promise.all([
+        axios.get(`${API}/home`),
         axios.get(`${API}/instagram/latest`)
       ]);
 
-      setHeroSlides(heroRes.data);
-      setFeaturedDestinations(destRes.data.slice(0, 4));
-      setFeaturedArticles(articlesRes.data.slice(0, 3));
-      setPartners(partnersRes.data);
-      setTestimonials(testimonialsRes.data.slice(0, 3));
+      setHeroSlides(homeRes.data.hero);
+      setFeaturedDestinations(homeRes.data.featured_destinations);
+      setFeaturedArticles(homeRes.data.featured_articles);
+      setPartners(homeRes.data.partners);
+      setTestimonials(homeRes.data.testimonials);
       setInstagram(instagramRes.data);
     } catch (error) {
       console.error('Error loading home data:', error);
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+One-shot migration: convert ISO-8601 string timestamps to native BSON dates
+
+The backend now stores timestamps as BSON dates and reads them back as
+timezone-aware datetimes, so documents written before that change must be
+converted once. Safe to re-run - only string values are touched.
+
+Usage: python migrate_datetimes.py [--dry-run]
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+load_dotenv('backend/.env')
+
+BATCH_SIZE = 500
+
+# Collection -> top-level timestamp fields
+DATETIME_FIELDS = {
+    "destinations": ["created_at", "updated_at"],
+    "articles": ["publish_date", "featured_until", "created_at", "updated_at"],
+    "hero_carousel": ["created_at"],
+    "testimonials": ["created_at"],
+    "inquiries": ["created_at", "updated_at"],
+    "users": ["created_at", "last_login", "deleted_at"],
+    "user_profiles": ["created_at", "updated_at"],
+    "privacy_settings": ["updated_at"],
+    "consent_logs": ["timestamp"],
+    "data_export_requests": ["requested_at", "completed_at"],
+    "data_deletion_requests": ["requested_at", "completed_at"],
+    "bookings": ["booking_date", "created_at", "updated_at"],
+    "payment_transactions": ["created_at", "updated_at", "completed_at"],
+    "password_reset_tokens": ["created_at"],
+}
+
+# Collection -> array fields whose items carry a created_at timestamp
+NESTED_DATETIME_ARRAYS = {
+    "inquiries": ["notes"],
+}
+
+def parse_timestamp(value: str):
+    """Parse an ISO-8601 string into a UTC datetime, or None if it isn't one"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+    # Naive values were always written as UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def convert_document(doc: dict, fields: list, arrays: list) -> dict:
+    """Build the $set for one document"""
+    updates = {}
+    for field in fields:
+        value = doc.get(field)
+        if isinstance(value, str):
+            parsed = parse_timestamp(value)
+            if parsed:
+                updates[field] = parsed
+
+    for array_field in arrays:
+        items = doc.get(array_field)
+        if not isinstance(items, list):
+            continue
+        changed = False
+        converted = []
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("created_at"), str):
+                parsed = parse_timestamp(item["created_at"])
+                if parsed:
+                    item = {**item, "created_at": parsed}
+                    changed = True
+            converted.append(item)
+        if changed:
+            updates[array_field] = converted
+
+    return updates
+
+async def migrate_collection(db, name: str, dry_run: bool) -> int:
+    """Convert string timestamps in one collection, returns documents updated"""
+    fields = DATETIME_FIELDS.get(name, [])
+    arrays = NESTED_DATETIME_ARRAYS.get(name, [])
+
+    # Only fetch documents that still hold a string somewhere we care about
+    conditions = [{field: {"$type": "string"}} for field in fields]
+    conditions += [{f"{array_field}.created_at": {"$type": "string"}} for array_field in arrays]
+    projection = {field: 1 for field in fields + arrays}
+
+    operations = []
+    updated = 0
+    async for doc in db[name].find({"$or": conditions}, projection):
+        updates = convert_document(doc, fields, arrays)
+        if not updates:
+            continue
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+
+        if len(operations) >= BATCH_SIZE:
+            updated += await flush(db, name, operations, dry_run)
+            operations = []
+
+    if operations:
+        updated += await flush(db, name, operations, dry_run)
+
+    return updated
+
+async def flush(db, name: str, operations: list, dry_run: bool) -> int:
+    """Write one batch of updates (or just count them on a dry run)"""
+    if dry_run:
+        return len(operations)
+    result = await db[name].bulk_write(operations, ordered=False)
+    return result.modified_count
+
+async def migrate_datetimes(dry_run: bool = False):
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME', 'golf_guy_platform')
+
+    client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+    db = client[db_name]
+
+    print(f"🕒 Converting string timestamps to BSON dates{' (dry run)' if dry_run else ''}...")
+
+    total = 0
+    for name in DATETIME_FIELDS:
+        updated = await migrate_collection(db, name, dry_run)
+        total += updated
+        print(f"  {'🔍' if dry_run else '✅'} {name}: {updated} documents")
+
+    print(f"📦 Total documents {'to convert' if dry_run else 'converted'}: {total}")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_datetimes(dry_run="--dry-run" in sys.argv))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+One-shot migration: add GeoJSON points to destinations for 2dsphere search
+
+Destinations keep their {lat, lng} location_coordinates for the API; location
+search now runs $geoNear against a GeoJSON Point in the 2dsphere-indexed
+"location" field. This fills that field for documents written before (or by
+scripts that don't set it) and creates the index. Safe to re-run.
+
+Usage: python migrate_geo_points.py [--dry-run]
+"""
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+load_dotenv('backend/.env')
+
+from core.geo import GEO_FIELD, geo_point  # noqa: E402
+
+BATCH_SIZE = 500
+
+async def flush(db, operations: list, dry_run: bool) -> int:
+    """Write one batch of updates (or just count them on a dry run)"""
+    if dry_run:
+        return len(operations)
+    result = await db.destinations.bulk_write(operations, ordered=False)
+    return result.modified_count
+
+async def migrate_geo_points(dry_run: bool = False):
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME', 'golf_guy_platform')
+
+    client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+    db = client[db_name]
+
+    print(f"🌍 Adding GeoJSON points to destinations{' (dry run)' if dry_run else ''}...")
+
+    operations = []
+    updated = 0
+    skipped = 0
+    projection = {"location_coordinates": 1, GEO_FIELD: 1, "name": 1}
+    async for doc in db.destinations.find({}, projection):
+        point = geo_point(doc.get("location_coordinates"))
+        if point is None:
+            # No (valid) coordinates: drop any stale point so $geoNear can't match it
+            if doc.get(GEO_FIELD) is not None:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$unset": {GEO_FIELD: ""}}))
+            else:
+                skipped += 1
+        elif doc.get(GEO_FIELD) != point:
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {GEO_FIELD: point}}))
+
+        if len(operations) >= BATCH_SIZE:
+            updated += await flush(db, operations, dry_run)
+            operations = []
+
+    if operations:
+        updated += await flush(db, operations, dry_run)
+
+    print(f"  {'🔍' if dry_run else '✅'} destinations: {updated} documents {'to update' if dry_run else 'updated'}")
+    print(f"  ⚠️  {skipped} destinations have no valid location_coordinates")
+
+    if not dry_run:
+        await db.destinations.create_index([(GEO_FIELD, "2dsphere")])
+        print(f"📍 2dsphere index on destinations.{GEO_FIELD} ready")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_geo_points(dry_run="--dry-run" in sys.argv))
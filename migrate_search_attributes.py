@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+One-shot migration: add amenity tags and accommodation tiers to destinations
+
+The amenities and accommodation search filters now match the indexed
+amenity_tags and accommodation_tier fields instead of scanning the amenities
+object and long_desc. Writes through the API and the populator keep them
+current; this fills them for existing documents and creates the indexes. Safe
+to re-run.
+
+Usage: python migrate_search_attributes.py [--dry-run]
+"""
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+load_dotenv('backend/.env')
+
+from core.attributes import (  # noqa: E402
+    ACCOMMODATION_TIER_FIELD, ACCOMMODATION_TIERS, AMENITY_TAGS_FIELD, SOURCE_FIELDS, search_attributes
+)
+
+BATCH_SIZE = 500
+
+async def flush(db, operations: list, dry_run: bool) -> int:
+    """Write one batch of updates (or just count them on a dry run)"""
+    if dry_run:
+        return len(operations)
+    result = await db.destinations.bulk_write(operations, ordered=False)
+    return result.modified_count
+
+async def migrate_search_attributes(dry_run: bool = False):
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME', 'golf_guy_platform')
+
+    client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+    db = client[db_name]
+
+    print(f"🏷️  Adding search attributes to destinations{' (dry run)' if dry_run else ''}...")
+
+    operations = []
+    updated = 0
+    tiers = {tier: 0 for tier in ACCOMMODATION_TIERS}
+    projection = {field: 1 for field in SOURCE_FIELDS + [AMENITY_TAGS_FIELD, ACCOMMODATION_TIER_FIELD]}
+    async for doc in db.destinations.find({}, projection):
+        attributes = search_attributes(doc)
+        tiers[attributes[ACCOMMODATION_TIER_FIELD]] += 1
+        if any(doc.get(field) != value for field, value in attributes.items()):
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": attributes}))
+
+        if len(operations) >= BATCH_SIZE:
+            updated += await flush(db, operations, dry_run)
+            operations = []
+
+    if operations:
+        updated += await flush(db, operations, dry_run)
+
+    print(f"  {'🔍' if dry_run else '✅'} destinations: {updated} documents {'to update' if dry_run else 'updated'}")
+    print("  🛏️  " + ", ".join(f"{tier}: {count}" for tier, count in tiers.items()))
+
+    if not dry_run:
+        await db.destinations.create_index(AMENITY_TAGS_FIELD)
+        await db.destinations.create_index(ACCOMMODATION_TIER_FIELD)
+        print(f"📇 Indexes on destinations.{AMENITY_TAGS_FIELD} and destinations.{ACCOMMODATION_TIER_FIELD} ready")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_search_attributes(dry_run="--dry-run" in sys.argv))
@@ -0,0 +1,82 @@
+"""
+Catalog cache
+Concurrent misses for one key share a single load
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from core.cache import CatalogCache  # noqa: E402
+
+CALLERS = 10
+
+def counting_loader(result=None, error=None):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if error is not None:
+            raise error
+        return result
+
+    return calls, load
+
+def test_concurrent_misses_load_once():
+    cache = CatalogCache(ttl_seconds=60, enabled=True)
+    calls, load = counting_loader(result=["Algarve"])
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load("destinations", "list", load) for _ in range(CALLERS)))
+
+    results = asyncio.run(scenario())
+    assert results == [["Algarve"]] * CALLERS
+    assert len(calls) == 1
+    assert cache.get("destinations", "list") == ["Algarve"]
+
+def test_failed_load_is_shared_and_not_cached():
+    cache = CatalogCache(ttl_seconds=60, enabled=True)
+    calls, load = counting_loader(error=RuntimeError("database unavailable"))
+
+    async def scenario():
+        return await asyncio.gather(
+            *(cache.get_or_load("destinations", "list", load) for _ in range(CALLERS)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get("destinations", "list") is None
+
+def test_load_after_failure_runs_again():
+    cache = CatalogCache(ttl_seconds=60, enabled=True)
+    failed_calls, failing = counting_loader(error=RuntimeError("database unavailable"))
+    calls, load = counting_loader(result=["Algarve"])
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("destinations", "list", failing)
+        return await cache.get_or_load("destinations", "list", load)
+
+    assert asyncio.run(scenario()) == ["Algarve"]
+    assert len(failed_calls) == 1
+    assert len(calls) == 1
+
+def test_cancelled_caller_does_not_cancel_shared_load():
+    cache = CatalogCache(ttl_seconds=60, enabled=True)
+    calls, load = counting_loader(result=["Algarve"])
+
+    async def scenario():
+        first = asyncio.ensure_future(cache.get_or_load("destinations", "list", load))
+        second = asyncio.ensure_future(cache.get_or_load("destinations", "list", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ["Algarve"]
+    assert len(calls) == 1
@@ -0,0 +1,142 @@
+"""
+Idempotency-Key handling
+Retries replay the first response; different requests under one key are rejected
+"""
+import asyncio
+import copy
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException, Response
+from pymongo.errors import DuplicateKeyError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from core.idempotency import REPLAYED_HEADER, IdempotencyStore, request_fingerprint  # noqa: E402
+from models.booking_models import BookingCreate  # noqa: E402
+
+BOOKING = {
+    "customer_name": "Anna Svensson",
+    "customer_email": "anna@example.com",
+    "customer_phone": "+46701234567",
+    "items": [{
+        "destination_id": "dest-1",
+        "destination_name": "La Manga",
+        "booking_type": "round",
+        "date": "2026-11-07",
+        "time": "10:00:00",
+        "players": [{"name": "Anna Svensson"}],
+        "price_per_player": 950,
+        "total_price": 950
+    }]
+}
+
+class IdempotencyKeys:
+    """The idempotency_keys collection, in memory"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate key")
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return copy.deepcopy(doc) if doc else None
+
+    def _matches(self, query):
+        doc = self.docs.get(query["_id"])
+        return doc is not None and all(doc.get(field) == value for field, value in query.items())
+
+    async def update_one(self, query, update):
+        if self._matches(query):
+            self.docs[query["_id"]].update(update["$set"])
+
+    async def find_one_and_update(self, query, update):
+        if self._matches(query):
+            before = copy.deepcopy(self.docs[query["_id"]])
+            self.docs[query["_id"]].update(update["$set"])
+            return before
+        return None
+
+    async def delete_one(self, query):
+        if self._matches(query):
+            del self.docs[query["_id"]]
+
+class Database:
+    def __init__(self):
+        self.idempotency_keys = IdempotencyKeys()
+
+def create_booking_counter():
+    calls = []
+
+    async def create():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": f"booking-{len(calls)}"}
+
+    return calls, create
+
+def test_identical_booking_bodies_fingerprint_alike():
+    # Item ids default to a new uuid4 on every parse
+    assert request_fingerprint(BookingCreate(**BOOKING)) == request_fingerprint(BookingCreate(**BOOKING))
+
+def test_identical_retry_replays_first_response():
+    db, store = Database(), IdempotencyStore()
+    calls, create = create_booking_counter()
+
+    async def scenario():
+        first = await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), create)
+        retry = await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), create)
+        return first, retry
+
+    first, retry = asyncio.run(scenario())
+    assert first == {"id": "booking-1"}
+    assert isinstance(retry, Response)
+    assert retry.body == b'{"id":"booking-1"}'
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert len(calls) == 1
+
+def test_concurrent_duplicates_run_once():
+    db, store = Database(), IdempotencyStore()
+    calls, create = create_booking_counter()
+
+    async def scenario():
+        return await asyncio.gather(*(
+            store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), create) for _ in range(5)
+        ))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sum(isinstance(result, Response) for result in results) == 4
+
+def test_key_reused_for_different_request_is_rejected():
+    db, store = Database(), IdempotencyStore()
+    _, create = create_booking_counter()
+    changed = {**BOOKING, "customer_phone": "+46700000000"}
+
+    async def scenario():
+        await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), create)
+        await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**changed), create)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 422
+
+def test_failed_request_can_be_retried():
+    db, store = Database(), IdempotencyStore()
+    calls, create = create_booking_counter()
+
+    async def failing():
+        raise HTTPException(status_code=500, detail="Booking creation failed")
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), failing)
+        return await store.run(db, "bookings", "key-1", "user-1", BookingCreate(**BOOKING), create)
+
+    assert asyncio.run(scenario()) == {"id": "booking-1"}
+    assert len(calls) == 1
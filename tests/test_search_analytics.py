@@ -0,0 +1,122 @@
+"""
+Search analytics
+Per-worker snapshots merged into one ranking
+"""
+import asyncio
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.search_analytics import (  # noqa: E402
+    LEGACY_SNAPSHOT_ID, SNAPSHOT_RETENTION_SECONDS, SearchAnalytics, TrendCounter
+)
+from tests.test_search_index import Cursor  # noqa: E402
+
+class Snapshots:
+    """The search_analytics collection, in memory"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_delete(self, query):
+        return self.docs.pop(query["_id"], None)
+
+    def find(self, query):
+        excluded = query["worker"]["$nin"]
+        oldest = query["flushed_at"]["$gte"]
+        return Cursor([
+            copy.deepcopy(doc) for doc in self.docs.values()
+            if doc.get("worker") not in excluded and doc["flushed_at"] >= oldest
+        ])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **copy.deepcopy(doc)}
+
+    async def delete_many(self, query):
+        oldest = query["flushed_at"]["$lt"]
+        self.docs = {doc_id: doc for doc_id, doc in self.docs.items() if doc["flushed_at"] >= oldest}
+
+class Database:
+    def __init__(self):
+        self.search_analytics = Snapshots()
+
+def worker(worker_id):
+    analytics = SearchAnalytics()
+    analytics.worker_id = worker_id
+    return analytics
+
+def counts(analytics):
+    return {search["query"]: search["count"] for search in analytics.popular_searches(10)}
+
+def test_rankings_cover_every_worker():
+    db, first, second = Database(), worker("web-1"), worker("web-2")
+    for _ in range(3):
+        first.record_search("Algarve")
+    for _ in range(2):
+        second.record_search("algarve")
+    second.record_search("Costa del Sol")
+    for _ in range(4):
+        second.record_view("valderrama")
+
+    async def scenario():
+        await first.flush(db)
+        await second.flush(db)
+        await first.flush(db)
+
+    asyncio.run(scenario())
+    assert counts(first)["Algarve"] == 5
+    assert counts(first)["Costa del Sol"] == 1
+    assert counts(second)["algarve"] == 5
+    assert first.trending_destinations(1)[0]["slug"] == "valderrama"
+    assert len(db.search_analytics.docs) == 2
+
+def test_repeated_flushes_do_not_double_count():
+    db, analytics = Database(), worker("web-1")
+    analytics.record_search("Algarve")
+
+    async def scenario():
+        for _ in range(3):
+            await analytics.flush(db)
+
+    asyncio.run(scenario())
+    assert counts(analytics) == {"Algarve": 1}
+
+def test_legacy_snapshot_is_adopted_once():
+    db = Database()
+    legacy = TrendCounter()
+    for _ in range(4):
+        legacy.add("algarve")
+    db.search_analytics.docs[LEGACY_SNAPSHOT_ID] = {
+        "_id": LEGACY_SNAPSHOT_ID,
+        "queries": legacy.snapshot(),
+        "views": TrendCounter().snapshot(),
+        "query_text": {"algarve": "Algarve"},
+        "flushed_at": time.time(),
+    }
+    first, second = worker("web-1"), worker("web-2")
+
+    async def scenario():
+        await first.load(db)
+        await second.load(db)
+        await first.flush(db)
+        await second.flush(db)
+
+    asyncio.run(scenario())
+    assert counts(first) == {"Algarve": 4}
+    assert counts(second) == {"Algarve": 4}
+
+def test_stale_worker_snapshots_are_dropped():
+    db = Database()
+    db.search_analytics.docs["web-old"] = {
+        "_id": "web-old",
+        "worker": "web-old",
+        "queries": TrendCounter().snapshot(),
+        "views": TrendCounter().snapshot(),
+        "query_text": {},
+        "flushed_at": time.time() - SNAPSHOT_RETENTION_SECONDS - 60,
+    }
+    asyncio.run(worker("web-1").flush(db))
+    assert set(db.search_analytics.docs) == {"web-1"}
@@ -0,0 +1,159 @@
+"""
+Destination search index
+Tokenizing, stemming, BM25F search and incremental refresh
+"""
+import asyncio
+import copy
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from core.cache import catalog_cache  # noqa: E402
+from services.search_index import DestinationSearchIndex, normalize_query, stem, tokenize  # noqa: E402
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+DESTINATIONS = [
+    {
+        "id": "la-manga",
+        "name": "La Manga Club",
+        "short_desc": "Three championship courses by the sea",
+        "long_desc": "Golf bookings for groups, with tee times on every course.",
+        "highlights": ["Sea views", "Golf academy"],
+        "published": True,
+        "updated_at": NOW - timedelta(days=2),
+    },
+    {
+        "id": "valderrama",
+        "name": "Valderrama",
+        "short_desc": "Host of the Ryder Cup",
+        "long_desc": "A demanding course among cork oaks near Sotogrande.",
+        "highlights": ["Ryder Cup venue"],
+        "published": True,
+        "updated_at": NOW - timedelta(days=2),
+    },
+    {
+        "id": "malaga",
+        "name": "Málaga Golf",
+        "short_desc": "City golf on the Costa del Sol",
+        "long_desc": "Short transfers from the airport.",
+        "highlights": [],
+        "published": True,
+        "updated_at": NOW,
+    },
+]
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gte" in condition and (value is None or value < condition["$gte"]):
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+class Destinations:
+    """The destinations collection, in memory"""
+
+    def __init__(self, docs):
+        self.docs = {doc["id"]: copy.deepcopy(doc) for doc in docs}
+        self.reads = 0
+
+    def find(self, query, projection=None):
+        found = [copy.deepcopy(doc) for doc in self.docs.values() if matches(doc, query)]
+        if projection and set(projection) != {"_id", "id"}:
+            self.reads += len(found)
+        return Cursor(found)
+
+class Database:
+    def __init__(self, docs):
+        self.destinations = Destinations(docs)
+
+def build_index(docs=DESTINATIONS):
+    index, db = DestinationSearchIndex(), Database(docs)
+    asyncio.run(index.refresh(db))
+    return index, db
+
+def test_tokenize_normalizes_accents_and_drops_stopwords():
+    assert tokenize("The Courses of Málaga") == ["course", "malaga"]
+
+def test_stem_is_idempotent():
+    for word in ["bookings", "booking", "courses", "classes", "cities", "stringing", "greens", "golfing"]:
+        assert stem(stem(word)) == stem(word)
+
+def test_singular_and_plural_forms_stem_alike():
+    assert stem("bookings") == stem("booking") == stem("book")
+    assert stem("courses") == stem("course")
+    assert stem("cities") == stem("city")
+
+def test_normalize_query_orders_terms_then_phrases():
+    assert normalize_query('"Ryder Cup" Courses') == 'course "ryder cup"'
+
+def test_search_matches_singular_and_plural():
+    index, _ = build_index()
+    for query in ["bookings", "booking", "book", "BOOKINGS"]:
+        assert set(index.search(query)) == {"la-manga"}
+
+def test_search_ors_terms_and_boosts_names():
+    index, _ = build_index()
+    scores = index.search("valderrama course")
+    assert set(scores) == {"la-manga", "valderrama"}
+    assert scores["valderrama"] > scores["la-manga"]
+
+def test_quoted_phrases_must_match_exactly():
+    index, _ = build_index()
+    assert set(index.search('"ryder cup"')) == {"valderrama"}
+    assert index.search('"cup ryder"') == {}
+
+def test_search_is_limited_to_candidates():
+    index, _ = build_index()
+    assert set(index.search("golf", candidates=["malaga"])) == {"malaga"}
+
+def test_refresh_reads_only_changed_destinations():
+    index, db = build_index()
+    assert index.size == 3
+
+    db.destinations.docs["malaga"].update(name="Marbella Golf", updated_at=NOW + timedelta(hours=1))
+    db.destinations.docs["valderrama"]["published"] = False
+    db.destinations.docs["sotogrande"] = {
+        "id": "sotogrande",
+        "name": "Sotogrande",
+        "short_desc": "Polo and golf",
+        "published": True,
+        "updated_at": NOW - timedelta(days=1),
+    }
+    db.destinations.reads = 0
+    catalog_cache.bump("destinations")
+    asyncio.run(index.refresh(db))
+
+    assert index.indexed_ids() == {"la-manga", "malaga", "sotogrande"}
+    assert db.destinations.reads == 2
+    assert set(index.search("marbella")) == {"malaga"}
+    assert index.search("malaga") == {}
+    assert set(index.search("polo")) == {"sotogrande"}
+    assert index.search("ryder") == {}
+
+def test_refresh_is_skipped_while_current():
+    index, db = build_index()
+    db.destinations.reads = 0
+    asyncio.run(index.refresh(db))
+    assert db.destinations.reads == 0
@@ -0,0 +1,35 @@
+"""
+Destination search service
+Text queries reach the search index as typed; cache keys use the normalized query
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+pytest.importorskip("emergentintegrations")  # Imported by ai_service
+
+from services import search_service as search_module  # noqa: E402
+from services.search_index import DestinationSearchIndex  # noqa: E402
+from services.search_service import SearchRequest, search_service  # noqa: E402
+from tests.test_search_index import DESTINATIONS, Database  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def search_index(monkeypatch):
+    index = DestinationSearchIndex()
+    monkeypatch.setattr(search_module, "destination_search_index", index)
+    return index
+
+def test_text_scores_match_plural_forms():
+    db = Database(DESTINATIONS)
+    for query in ["bookings", "Bookings", "booking"]:
+        assert set(asyncio.run(search_service._text_scores(db, query))) == {"la-manga"}
+
+def test_equivalent_queries_share_a_cache_key():
+    assert (
+        search_service._normalize_request(SearchRequest(query="Golf bookings"))
+        == search_service._normalize_request(SearchRequest(query="golf booking"))
+    )
@@ -0,0 +1,112 @@
+"""
+Search-as-you-type suggestions
+Prefix and typo-tolerant matching, shared phrases and popularity
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.suggest_index import DestinationSuggestIndex  # noqa: E402
+from tests.test_search_index import Cursor, Destinations  # noqa: E402
+
+DESTINATIONS = [
+    {
+        "id": "quinta",
+        "name": "Quinta do Lago",
+        "slug": "quinta-do-lago",
+        "region": "Algarve",
+        "country": "Portugal",
+        "courses": [{"course_name": "South", "designer": "William Mitchell"}],
+        "highlights": ["Lakeside fairways"],
+        "featured": True,
+        "published": True,
+    },
+    {
+        "id": "vilamoura",
+        "name": "Vilamoura",
+        "slug": "vilamoura",
+        "region": "Algarve",
+        "country": "Portugal",
+        "courses": [{"course_name": "Old Course", "designer": "Frank Pennink"}],
+        "highlights": [],
+        "featured": False,
+        "published": True,
+    },
+    {
+        "id": "valderrama",
+        "name": "Valderrama",
+        "slug": "valderrama",
+        "region": "Andalusia",
+        "country": "Spain",
+        "courses": [{"course_name": "Valderrama", "designer": "Robert Trent Jones"}],
+        "highlights": ["Ryder Cup venue"],
+        "featured": False,
+        "published": True,
+    },
+]
+
+class Inquiries:
+    def __init__(self, counts):
+        self.counts = counts
+
+    def aggregate(self, pipeline):
+        return Cursor([{"_id": doc_id, "count": count} for doc_id, count in self.counts.items()])
+
+class Database:
+    def __init__(self, docs, inquiries=None):
+        self.destinations = Destinations(docs)
+        self.inquiries = Inquiries(inquiries or {})
+
+def build_index():
+    index = DestinationSuggestIndex()
+    for doc in DESTINATIONS:
+        index.upsert(doc)
+    return index
+
+def texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+def test_prefix_matches_every_kind():
+    index = build_index()
+    assert texts(index.suggest("val")) == ["Valderrama"]
+    assert "Robert Trent Jones" in texts(index.suggest("trent jo"))
+    assert "Ryder Cup venue" in texts(index.suggest("ryder"))
+
+def test_typos_are_tolerated():
+    index = build_index()
+    assert texts(index.suggest("algrave"))[0] == "Algarve"
+    assert texts(index.suggest("vilamora")) == ["Vilamoura"]
+
+def test_exact_matches_win_over_typo_matches():
+    index = build_index()
+    assert texts(index.suggest("spain")) == ["Spain"]
+
+def test_short_terms_need_an_exact_prefix():
+    index = build_index()
+    assert index.suggest("xyz") == []
+
+def test_shared_phrases_sum_their_destinations():
+    index = build_index()
+    algarve = next(s for s in index.suggest("algarve") if s["type"] == "region")
+    assert algarve["destinations"] == 2
+
+def test_featured_destinations_rank_first():
+    index = DestinationSuggestIndex()
+    index.upsert({"id": "alpha", "name": "Golf Alpha", "slug": "golf-alpha", "featured": False})
+    index.upsert({"id": "beta", "name": "Golf Beta", "slug": "golf-beta", "featured": True})
+    assert texts(index.suggest("golf")) == ["Golf Beta", "Golf Alpha"]
+
+def test_removing_a_destination_withdraws_its_phrases():
+    index = build_index()
+    index.remove("valderrama")
+    assert index.suggest("valder") == []
+    assert index.suggest("spain") == []
+    assert texts(index.suggest("algarve"))[0] == "Algarve"
+
+def test_inquiries_raise_popularity():
+    index = DestinationSuggestIndex()
+    db = Database(DESTINATIONS[1:], inquiries={"valderrama": 40})
+    asyncio.run(index.refresh(db))
+    assert [s["slug"] for s in index.suggest("v") if s["type"] == "destination"] == ["valderrama", "vilamoura"]
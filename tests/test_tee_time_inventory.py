@@ -0,0 +1,159 @@
+"""
+Tee-time inventory
+Slot arithmetic, course resolution and all-or-nothing reservations that never oversell
+"""
+import asyncio
+import copy
+import os
+import sys
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from services.tee_time_inventory import (  # noqa: E402
+    SLOT_CAPACITY, SLOT_COUNT, TeeTimeInventory, inventory_id, resolve_course_name, slot_index, slot_time
+)
+
+DAY = date(2026, 11, 7)
+NEXT_DAY = date(2026, 11, 8)
+
+DESTINATION = {"id": "la-manga", "name": "La Manga Club", "courses": [{"course_name": "North"}, {"course_name": "South"}]}
+
+class Inventory:
+    """The tee_time_inventory collection, in memory"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        doc = self.docs.get(query["_id"])
+        return copy.deepcopy(doc) if doc else None
+
+    async def insert_one(self, doc):
+        await asyncio.sleep(0)
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate key")
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    async def update_one(self, query, update):
+        await asyncio.sleep(0)
+        doc = self.docs.get(query["_id"])
+        conditions = {field: condition for field, condition in query.items() if field != "_id"}
+        if doc is None or any(
+            doc["remaining"][int(field.split(".")[1])] < condition["$gte"] for field, condition in conditions.items()
+        ):
+            return SimpleNamespace(modified_count=0)
+
+        for field, amount in update["$inc"].items():
+            doc["remaining"][int(field.split(".")[1])] += amount
+        doc.update(update["$set"])
+        return SimpleNamespace(modified_count=1)
+
+class Bookings:
+    def __init__(self, bookings):
+        self.bookings = bookings
+
+    def find(self, query, projection=None):
+        statuses = query["status"]["$in"]
+        found = [copy.deepcopy(booking) for booking in self.bookings if booking["status"] in statuses]
+        return SimpleNamespace(to_list=lambda length: asyncio.sleep(0, result=found))
+
+class Destinations:
+    async def find_one(self, query, projection=None):
+        return copy.deepcopy(DESTINATION) if query["id"] == DESTINATION["id"] else None
+
+class Database:
+    def __init__(self, bookings=()):
+        self.tee_time_inventory = Inventory()
+        self.bookings = Bookings(list(bookings))
+        self.destinations = Destinations()
+
+    def remaining(self, course_name, day, tee_time):
+        return self.tee_time_inventory.docs[inventory_id("la-manga", course_name, day)]["remaining"][slot_index(tee_time)]
+
+def test_slots_follow_the_tee_sheet():
+    assert slot_index(time(7, 0)) == 0
+    assert slot_index(time(10, 15)) == 13
+    assert slot_time(13) == time(10, 15)
+    assert slot_time(SLOT_COUNT - 1) == time(17, 45)
+    for off_sheet in (time(6, 45), time(10, 5), time(18, 0), time(10, 15, 30)):
+        assert slot_index(off_sheet) is None
+
+def test_course_names_resolve_against_the_destination():
+    assert resolve_course_name(DESTINATION, None) == "North"
+    assert resolve_course_name(DESTINATION, "South") == "South"
+    with pytest.raises(ValueError):
+        resolve_course_name(DESTINATION, "West")
+    assert resolve_course_name({"id": "plain"}, None) == "Golf Course"
+
+def test_inventory_is_seeded_from_existing_bookings():
+    db = Database(bookings=[
+        {"status": "confirmed", "items": [
+            {"destination_id": "la-manga", "date": DAY.isoformat(), "time": "10:00:00", "players": [{}, {}, {}]}
+        ]},
+        {"status": "cancelled", "items": [
+            {"destination_id": "la-manga", "date": DAY.isoformat(), "time": "10:00:00", "players": [{}]}
+        ]},
+    ])
+    doc = asyncio.run(TeeTimeInventory().get_or_create(db, "la-manga", "North", DAY))
+    assert doc["remaining"][slot_index(time(10, 0))] == SLOT_CAPACITY - 3
+    assert doc["remaining"][slot_index(time(10, 15))] == SLOT_CAPACITY
+
+def test_concurrent_reservations_never_oversell():
+    db, inventory = Database(), TeeTimeInventory()
+
+    async def scenario():
+        return await asyncio.gather(*(
+            inventory.reserve_all(db, [("la-manga", "North", DAY, time(9, 0), 1)]) for _ in range(SLOT_CAPACITY + 3)
+        ))
+
+    results = asyncio.run(scenario())
+    assert results.count(None) == SLOT_CAPACITY
+    assert db.remaining("North", DAY, time(9, 0)) == 0
+
+def test_reservations_are_all_or_nothing():
+    db, inventory = Database(), TeeTimeInventory()
+    asyncio.run(inventory.reserve_all(db, [("la-manga", "North", NEXT_DAY, time(9, 0), 3)]))
+
+    failed = asyncio.run(inventory.reserve_all(db, [
+        ("la-manga", "North", DAY, time(9, 0), 2),
+        ("la-manga", "South", DAY, time(9, 0), 2),
+        ("la-manga", "North", NEXT_DAY, time(8, 0), 1),
+        ("la-manga", "North", NEXT_DAY, time(9, 0), 2),
+    ]))
+
+    assert failed == 3
+    assert db.remaining("North", DAY, time(9, 0)) == SLOT_CAPACITY
+    assert db.remaining("South", DAY, time(9, 0)) == SLOT_CAPACITY
+    assert db.remaining("North", NEXT_DAY, time(8, 0)) == SLOT_CAPACITY
+    assert db.remaining("North", NEXT_DAY, time(9, 0)) == SLOT_CAPACITY - 3
+
+def test_invalid_reservations_are_rejected_before_reserving():
+    db, inventory = Database(), TeeTimeInventory()
+    failed = asyncio.run(inventory.reserve_all(db, [
+        ("la-manga", "North", DAY, time(9, 0), 2),
+        ("la-manga", "North", DAY, time(9, 5), 2),
+    ]))
+    assert failed == 1
+    assert db.tee_time_inventory.docs == {}
+
+def test_release_skips_invalid_items_and_frees_the_rest():
+    db, inventory = Database(), TeeTimeInventory()
+    asyncio.run(inventory.reserve_all(db, [
+        ("la-manga", "North", DAY, time(9, 0), 2),
+        ("la-manga", "North", DAY, time(9, 15), 1),
+    ]))
+
+    asyncio.run(inventory.release_all(db, [
+        ("la-manga", "North", DAY, time(9, 5), 2),
+        ("la-manga", "North", DAY, time(9, 0), 2),
+        ("la-manga", "North", DAY, time(9, 15), 1),
+    ]))
+
+    assert db.remaining("North", DAY, time(9, 0)) == SLOT_CAPACITY
+    assert db.remaining("North", DAY, time(9, 15)) == SLOT_CAPACITY